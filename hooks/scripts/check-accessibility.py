@@ -6,11 +6,16 @@ Advisory only (exit 0 with systemMessage), never blocks.
 Session-aware dedup.
 """
 
-import json
 import os
 import re
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from claudia_checks import EDIT_TOOLS, NO_FINDINGS, advisory, file_view, run
+from claudia_scan import RuleSet
+
+STATE_NAME = "a11y"
+
 # Accessibility patterns to check
 # (pattern_regex, negative_pattern, description, advice, pattern_id)
 # negative_pattern: if this matches, skip the warning (false positive prevention)
@@ -73,96 +78,64 @@ A11Y_PATTERNS = [
     ),
 ]
 
+# Negative patterns are scanned with the rest, as "<pattern_id>:not"; on a
+# rewrite they still look at the whole file
+A11Y_RULES = RuleSet(
+    [(entry[4], entry[0]) for entry in A11Y_PATTERNS]
+    + [(f"{entry[4]}:not", entry[1]) for entry in A11Y_PATTERNS if entry[1]],
+    re.IGNORECASE,
+    file_rules=[f"{entry[4]}:not" for entry in A11Y_PATTERNS if entry[1]],
+)
+
 # File extensions to check
 A11Y_EXTENSIONS = {'.html', '.htm', '.jsx', '.tsx', '.vue', '.svelte', '.astro'}
 
 
-def get_state_file(session_id):
-    return os.path.expanduser(f"~/.claude/claudia_a11y_state_{session_id}.json")
-
-
-def load_state(session_id):
-    state_file = get_state_file(session_id)
-    if os.path.exists(state_file):
-        try:
-            with open(state_file) as f:
-                return set(json.load(f))
-        except (json.JSONDecodeError, IOError):
-            return set()
-    return set()
-
-
-def save_state(session_id, shown):
-    state_file = get_state_file(session_id)
-    try:
-        os.makedirs(os.path.dirname(state_file), exist_ok=True)
-        with open(state_file, "w") as f:
-            json.dump(list(shown), f)
-    except IOError:
-        pass
-
-
-def extract_content(tool_name, tool_input):
-    if tool_name == "Write":
-        return tool_input.get("content", "")
-    elif tool_name == "Edit":
-        return tool_input.get("new_string", "")
-    elif tool_name == "MultiEdit":
-        edits = tool_input.get("edits", [])
-        return " ".join(e.get("new_string", "") for e in edits)
-    return ""
-
-
-def main():
-    try:
-        input_data = json.loads(sys.stdin.read())
-    except json.JSONDecodeError:
-        sys.exit(0)
-
-    session_id = input_data.get("session_id", "default")
-    tool_name = input_data.get("tool_name", "")
-    tool_input = input_data.get("tool_input", {})
+def check(payload, state):
+    """Return advisory Findings for accessibility issues in HTML/JSX-like files."""
+    tool_name = payload.get("tool_name", "")
+    tool_input = payload.get("tool_input", {})
     file_path = tool_input.get("file_path", "")
 
-    if tool_name not in ("Edit", "Write", "MultiEdit"):
-        sys.exit(0)
+    if tool_name not in EDIT_TOOLS:
+        return NO_FINDINGS
 
     # Only check HTML/JSX/Vue/Svelte files
     _, ext = os.path.splitext(file_path)
     if ext.lower() not in A11Y_EXTENSIONS:
-        sys.exit(0)
+        return NO_FINDINGS
 
-    content = extract_content(tool_name, tool_input)
-    if not content:
-        sys.exit(0)
+    view = file_view(payload)
+    if not view:
+        return NO_FINDINGS
 
     # Skip test files
     if any(x in file_path for x in ['.test.', '.spec.', '/test/', '/tests/', 'fixture', 'mock', '__test__']):
-        sys.exit(0)
+        return NO_FINDINGS
 
-    shown = load_state(session_id)
+    shown = set()
     warnings = []
 
+    hits = view.scan(A11Y_RULES)
+
     for entry in A11Y_PATTERNS:
-        pattern, negative, description, advice, pattern_id = entry
+        _, negative, description, advice, pattern_id = entry
 
-        if re.search(pattern, content, re.IGNORECASE):
-            # If there's a negative pattern and it matches, skip
-            if negative and re.search(negative, content, re.IGNORECASE):
+        if pattern_id in hits:
+            # If there's a negative pattern and it matches (or ran out of time), skip
+            if negative and (f"{pattern_id}:not" in hits or f"{pattern_id}:not" in hits.skipped):
                 continue
 
             warning_key = f"{file_path}-{pattern_id}"
-            if warning_key not in shown:
+            if warning_key not in state and warning_key not in shown:
                 shown.add(warning_key)
                 warnings.append(f"- {description}: {advice}")
 
-    if warnings:
-        save_state(session_id, shown)
-        message = "Claudia noticed some accessibility concerns:\n" + "\n".join(warnings)
-        output = json.dumps({"systemMessage": f"\033[38;5;160m{message}\033[0m"})
-        print(output)
+    return advisory("Claudia noticed some accessibility concerns:", warnings, shown, hits.skipped)
+
 
-    sys.exit(0)
+def main():
+    run(check, STATE_NAME)
 
 
 if __name__ == "__main__":
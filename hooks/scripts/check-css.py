@@ -7,11 +7,16 @@ Session-aware dedup to avoid repeating warnings.
 Only fires on CSS/SCSS/style files and inline styles.
 """
 
-import json
 import os
 import re
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from claudia_checks import EDIT_TOOLS, NO_FINDINGS, advisory, file_view, run
+from claudia_scan import RuleSet
+
+STATE_NAME = "css"
+
 # CSS anti-patterns to detect
 # Each: (pattern_regex, description, advice, pattern_id)
 CSS_ANTI_PATTERNS = [
@@ -65,6 +70,14 @@ CSS_ANTI_PATTERNS = [
     ),
 ]
 
+# Rules whose ".*" pairs declarations anywhere in the file look at all of it
+# on a rewrite
+CSS_RULES = RuleSet(
+    [(pattern_id, pattern) for pattern, _, _, pattern_id in CSS_ANTI_PATTERNS],
+    re.DOTALL,
+    file_rules=("fixed_dimensions", "manual_centering"),
+)
+
 # File extensions where CSS anti-patterns are relevant
 CSS_EXTENSIONS = {'.css', '.scss', '.sass', '.less', '.styl', '.pcss'}
 STYLE_FILE_PATTERNS = ['style', 'global', 'theme', 'tailwind']
@@ -84,95 +97,52 @@ def is_css_file(file_path):
     return False
 
 
-def get_state_file(session_id):
-    return os.path.expanduser(f"~/.claude/claudia_css_state_{session_id}.json")
-
-
-def load_state(session_id):
-    state_file = get_state_file(session_id)
-    if os.path.exists(state_file):
-        try:
-            with open(state_file) as f:
-                return set(json.load(f))
-        except (json.JSONDecodeError, IOError):
-            return set()
-    return set()
-
-
-def save_state(session_id, shown):
-    state_file = get_state_file(session_id)
-    try:
-        os.makedirs(os.path.dirname(state_file), exist_ok=True)
-        with open(state_file, "w") as f:
-            json.dump(list(shown), f)
-    except IOError:
-        pass
-
-
-def extract_content(tool_name, tool_input):
-    if tool_name == "Write":
-        return tool_input.get("content", "")
-    elif tool_name == "Edit":
-        return tool_input.get("new_string", "")
-    elif tool_name == "MultiEdit":
-        edits = tool_input.get("edits", [])
-        return " ".join(e.get("new_string", "") for e in edits)
-    return ""
-
-
-def main():
-    try:
-        input_data = json.loads(sys.stdin.read())
-    except json.JSONDecodeError:
-        sys.exit(0)
-
-    session_id = input_data.get("session_id", "default")
-    tool_name = input_data.get("tool_name", "")
-    tool_input = input_data.get("tool_input", {})
+def check(payload, state):
+    """Return advisory Findings for CSS anti-patterns in style files and components."""
+    tool_name = payload.get("tool_name", "")
+    tool_input = payload.get("tool_input", {})
     file_path = tool_input.get("file_path", "")
 
-    if tool_name not in ("Edit", "Write", "MultiEdit"):
-        sys.exit(0)
+    if tool_name not in EDIT_TOOLS:
+        return NO_FINDINGS
 
     if not is_css_file(file_path):
-        sys.exit(0)
+        return NO_FINDINGS
 
-    content = extract_content(tool_name, tool_input)
-    if not content:
-        sys.exit(0)
+    view = file_view(payload)
+    if not view:
+        return NO_FINDINGS
 
     # For non-CSS files, only check if content contains style-related code
     _, ext = os.path.splitext(file_path)
     if ext.lower() not in CSS_EXTENSIONS:
-        has_styles = bool(re.search(r'(?:styled|css`|className=|class=|<style)', content))
+        has_styles = view.search(r'(?:styled|css`|className=|class=|<style)')
         if not has_styles:
-            sys.exit(0)
+            return NO_FINDINGS
 
     # Is this a theme/token file where hardcoded colors are expected?
     basename = os.path.basename(file_path).lower()
     is_theme_file = any(p in basename for p in COLOR_EXCEPTION_PATTERNS)
 
-    shown = load_state(session_id)
+    shown = set()
     warnings = []
 
-    for pattern, description, advice, pattern_id in CSS_ANTI_PATTERNS:
-        # Skip hardcoded color warning in theme/token files
-        if pattern_id == "hardcoded_color" and is_theme_file:
-            continue
+    # Skip hardcoded color warning in theme/token files
+    rule_ids = [r for r in CSS_RULES.ids if r != "hardcoded_color"] if is_theme_file else None
+    hits = view.scan(CSS_RULES, rule_ids)
 
-        if re.search(pattern, content, re.DOTALL):
+    for _, description, advice, pattern_id in CSS_ANTI_PATTERNS:
+        if pattern_id in hits:
             warning_key = f"{file_path}-{pattern_id}"
-            if warning_key not in shown:
+            if warning_key not in state and warning_key not in shown:
                 shown.add(warning_key)
                 warnings.append(f"- {description}: {advice}")
 
-    if warnings:
-        save_state(session_id, shown)
-        message = "Claudia noticed some CSS patterns worth reviewing:\n" + "\n".join(warnings)
-        output = json.dumps({"systemMessage": f"\033[38;5;160m{message}\033[0m"})
-        print(output)
+    return advisory("Claudia noticed some CSS patterns worth reviewing:", warnings, shown, hits.skipped)
+
 
-    sys.exit(0)
+def main():
+    run(check, STATE_NAME)
 
 
 if __name__ == "__main__":
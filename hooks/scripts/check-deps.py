@@ -1,16 +1,34 @@
 #!/usr/bin/env python3
 """
 Claudia: check-deps.py
-PreToolUse hook that warns on problematic dependencies in package.json writes.
+PreToolUse hook that warns on problematic dependencies in package.json and
+lockfile writes.
 Advisory only (exit 0 with systemMessage), never blocks.
 Session-aware dedup to avoid repeating warnings.
+Only real dependency entries count (claudia_packages), not names mentioned
+in scripts, keywords or descriptions, and only those the write adds. A
+lockfile write warns about the packages it newly locks, transitive ones too.
+Known vulnerabilities come from the offline advisory index
+(claudia_advisories), by version: a lockfile's locked versions, or a
+package.json entry pinned to an exact version. A package.json range that
+admits affected versions gets a softer note: a fresh install gets its
+newest match, which may be fixed, so it asks for the lockfile to be checked
+rather than for an upgrade. Ranges without a floor ("*", "<2") are left to
+the lockfile.
 """
 
-import json
 import os
-import re
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from claudia_advisories import range_vulnerabilities, vulnerabilities
+from claudia_checks import EDIT_TOOLS, NO_FINDINGS, advisory, run
+from claudia_lockfiles import lockfile_kind
+from claudia_packages import added_dependency_specs, added_locked_packages
+from claudia_semver import MIN_KEY, parse_range, version_key
+
+STATE_NAME = "deps"
+
 # Known problematic or deprecated packages
 # (package_name, reason, alternative, pattern_id)
 PROBLEMATIC_PACKAGES = [
@@ -32,87 +50,80 @@ PROBLEMATIC_PACKAGES = [
     ("grunt", "Legacy build tool", "Use `Vite`, `esbuild`, or npm scripts", "dep_grunt"),
     ("bower", "Deprecated package manager", "Use npm or pnpm", "dep_bower"),
     ("tslint", "Deprecated in favor of ESLint", "Use `eslint` with `@typescript-eslint`", "dep_tslint"),
-    ("protobufjs", "Known prototype pollution vulnerabilities", "Update to latest version or use `@bufbuild/protobuf`", "dep_protobufjs"),
 ]
 
+# package_name -> position in PROBLEMATIC_PACKAGES
+PROBLEMATIC_INDEX = {entry[0]: i for i, entry in enumerate(PROBLEMATIC_PACKAGES)}
 
-def get_state_file(session_id):
-    return os.path.expanduser(f"~/.claude/claudia_deps_state_{session_id}.json")
-
-
-def load_state(session_id):
-    state_file = get_state_file(session_id)
-    if os.path.exists(state_file):
-        try:
-            with open(state_file) as f:
-                return set(json.load(f))
-        except (json.JSONDecodeError, IOError):
-            return set()
-    return set()
 
+def has_floor(spec):
+    """Whether a version range has a lowest version ("^1.2.0" does, "*" doesn't)."""
+    intervals = parse_range(spec) if spec else None
+    return bool(intervals) and min(intervals)[0] != MIN_KEY
 
-def save_state(session_id, shown):
-    state_file = get_state_file(session_id)
-    try:
-        os.makedirs(os.path.dirname(state_file), exist_ok=True)
-        with open(state_file, "w") as f:
-            json.dump(list(shown), f)
-    except IOError:
-        pass
 
-
-def extract_content(tool_name, tool_input):
-    if tool_name == "Write":
-        return tool_input.get("content", "")
-    elif tool_name == "Edit":
-        return tool_input.get("new_string", "")
-    elif tool_name == "MultiEdit":
-        edits = tool_input.get("edits", [])
-        return " ".join(e.get("new_string", "") for e in edits)
-    return ""
-
-
-def main():
-    try:
-        input_data = json.loads(sys.stdin.read())
-    except json.JSONDecodeError:
-        sys.exit(0)
-
-    session_id = input_data.get("session_id", "default")
-    tool_name = input_data.get("tool_name", "")
-    tool_input = input_data.get("tool_input", {})
+def check(payload, state):
+    """Return advisory Findings for problematic dependencies in a package.json or lockfile write."""
+    tool_name = payload.get("tool_name", "")
+    tool_input = payload.get("tool_input", {})
     file_path = tool_input.get("file_path", "")
 
-    if tool_name not in ("Edit", "Write", "MultiEdit"):
-        sys.exit(0)
-
-    # Only check package.json files
-    if not file_path.endswith("package.json"):
-        sys.exit(0)
-
-    content = extract_content(tool_name, tool_input)
-    if not content:
-        sys.exit(0)
-
-    shown = load_state(session_id)
+    if tool_name not in EDIT_TOOLS:
+        return NO_FINDINGS
+
+    # Only check package.json files and lockfiles. versions: (name, version
+    # to look up, how to show it) for each added package with one; ranges:
+    # the same for package.json ranges with a floor
+    ranges = []
+    if file_path.endswith("package.json"):
+        specs = added_dependency_specs(payload)
+        names = set(specs)
+        versions = []
+        for name, spec in sorted(specs.items()):
+            if version_key(spec) is not None:
+                versions.append((name, spec, f"{name}@{spec}"))
+            elif has_floor(spec):
+                ranges.append((name, spec, f"{name}@{spec}"))
+    elif lockfile_kind(file_path):
+        locked = added_locked_packages(payload)
+        names = {name for name, _ in locked}
+        versions = [(name, version, f"{name}@{version}") for name, version in sorted(locked) if version]
+    else:
+        return NO_FINDINGS
+
+    shown = set()
     warnings = []
 
-    for pkg_name, reason, alternative, pattern_id in PROBLEMATIC_PACKAGES:
-        # Check if the package name appears as a dependency
-        pattern = rf'["\']({re.escape(pkg_name)})["\']'
-        if re.search(pattern, content):
-            warning_key = f"{file_path}-{pattern_id}"
-            if warning_key not in shown:
+    # One lookup per dependency, reported in table order
+    for i in sorted(PROBLEMATIC_INDEX[name] for name in names if name in PROBLEMATIC_INDEX):
+        pkg_name, reason, alternative, pattern_id = PROBLEMATIC_PACKAGES[i]
+        warning_key = f"{file_path}-{pattern_id}"
+        if warning_key not in state and warning_key not in shown:
+            shown.add(warning_key)
+            warnings.append(f"- **{pkg_name}**: {reason}. {alternative}")
+
+    for name, version, shown_as in versions:
+        for advisory_id, summary in vulnerabilities(name, version):
+            warning_key = f"{file_path}-{advisory_id}-{name}"
+            if warning_key not in state and warning_key not in shown:
                 shown.add(warning_key)
-                warnings.append(f"- **{pkg_name}**: {reason}. {alternative}")
+                warnings.append(f"- **{shown_as}**: {summary} ({advisory_id}). Upgrade to a fixed version.")
 
-    if warnings:
-        save_state(session_id, shown)
-        message = "Claudia noticed some dependency concerns:\n" + "\n".join(warnings)
-        output = json.dumps({"systemMessage": f"\033[38;5;160m{message}\033[0m"})
-        print(output)
+    for name, spec, shown_as in ranges:
+        for advisory_id, summary in range_vulnerabilities(name, spec):
+            warning_key = f"{file_path}-{advisory_id}-{name}"
+            if warning_key not in state and warning_key not in shown:
+                shown.add(warning_key)
+                warnings.append(
+                    f"- **{shown_as}**: the range admits versions affected by {summary} ({advisory_id}). "
+                    "Check that the lockfile resolves to a fixed version, or raise the range's floor."
+                )
 
-    sys.exit(0)
+    return advisory("Claudia noticed some dependency concerns:", warnings, shown)
+
+
+def main():
+    run(check, STATE_NAME)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Claudia: check-dispatch.py
+Single dispatcher for all PreToolUse file checks. Runs secrets, practices,
+deps, dockerfile, git-hygiene, accessibility, license, and css in one
+process instead of 8 subprocesses.
+The payload is parsed once and planned: routing (claudia_routing) picks the
+checks that can fire for the file, then the user's config drops checks in
+suppress_hooks and checks with no rule tier enabled at their proactivity
+level (low runs only the blocking rules). Only planned checks are imported;
+each gets the payload through its pure check() API.
+Any blocking check (exit 2) blocks the write. Advisory systemMessages are merged.
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from claudia_checks import (
+    EDIT_TOOLS, colored, file_view, load_state, save_state, skipped_note, use_verdict_cache,
+)
+from claudia_config import load_suppress_hooks, load_user_config
+from claudia_registry import REGISTRY
+from claudia_routing import ROUTES, route, tiers_for
+
+# Check execution order (matches original hooks.json order)
+CHECK_MODULES = [
+    "check-secrets",
+    "check-practices",
+    "check-deps",
+    "check-dockerfile",
+    "check-git-hygiene",
+    "check-accessibility",
+    "check-license",
+    "check-css",
+]
+
+
+def select_checks(payload):
+    """Checks the routing table says can fire for this payload, in check order."""
+    tool_input = payload.get("tool_input", {})
+    # The checks will scan the same view; routing on it costs nothing extra.
+    # Segments aren't one text: content-dependent routes then always match.
+    view = file_view(payload)
+    routed = set(route(tool_input.get("file_path", ""), view.text if view.segments is None else None))
+    return [name for name in CHECK_MODULES if name in routed]
+
+
+def plan_checks(names, tiers, suppress_hooks=()):
+    """Drop suppressed checks and checks with no rule tier in tiers.
+
+    suppress_hooks uses short names ("css" for check-css).
+    """
+    return [
+        name for name in names
+        if name[len("check-"):] not in suppress_hooks and ROUTES[name]["tiers"] & tiers
+    ]
+
+
+def load_plan_config():
+    """(tiers, suppress_hooks) from the user's config, read once per dispatch."""
+    proactivity, _ = load_user_config()
+    return tiers_for(proactivity), load_suppress_hooks()
+
+
+def run_checks(payload, names=CHECK_MODULES, tiers=None):
+    """Run each check's check() on the payload, loading and saving dedup state.
+
+    Args:
+        tiers: rule tiers to run, or None for all. Checks holding a tier
+            outside it get it as check(..., tiers=tiers) to skip those rules.
+
+    Returns:
+        list of Findings, in check order.
+    """
+    session_id = payload.get("session_id", "default")
+    results = []
+    for name in names:
+        mod = REGISTRY.load(name)
+        if mod is None:
+            continue
+        shown = load_state(mod.STATE_NAME, session_id)
+        try:
+            if tiers is not None and not ROUTES[name]["tiers"] <= tiers:
+                findings = mod.check(payload, shown, tiers=tiers)
+            else:
+                findings = mod.check(payload, shown)
+        except Exception as e:
+            # Don't let one broken check kill the others
+            REGISTRY.report(name, f"check() raised {type(e).__name__}: {e}")
+            continue
+        if findings.shown - shown:
+            save_state(mod.STATE_NAME, session_id, shown | findings.shown)
+        if findings.skipped:
+            REGISTRY.report(name, skipped_note(findings.skipped))
+        results.append(findings)
+    return results
+
+
+def merge_results(results):
+    """Merge per-check Findings into a single hook response.
+
+    Returns:
+        (exit_code, stdout, stderr) for the dispatcher as a whole.
+    """
+    blocks = [f.block for f in results if f.block]
+    messages = [colored(f.message) for f in results if f.message]
+
+    if blocks:
+        # stdout is ignored on exit 2, so advisory notes ride along on stderr
+        return 2, "", "\n\n".join(blocks + messages) + "\n"
+    if messages:
+        return 0, json.dumps({"systemMessage": "\n\n".join(messages)}) + "\n", ""
+    return 0, "", ""
+
+
+def main():
+    try:
+        payload = json.loads(sys.stdin.read())
+    except json.JSONDecodeError:
+        sys.exit(0)
+
+    if payload.get("tool_name", "") not in EDIT_TOOLS:
+        sys.exit(0)
+
+    tiers, suppress_hooks = load_plan_config()
+    names = plan_checks(select_checks(payload), tiers, suppress_hooks)
+    use_verdict_cache()
+    code, out, err = merge_results(run_checks(payload, names, tiers))
+    if out:
+        sys.stdout.write(out)
+    if err:
+        sys.stderr.write(err)
+    if code == 2:
+        # On a block, stderr goes to Claude; keep diagnostics out of it
+        REGISTRY.diagnostics = []
+    else:
+        REGISTRY.emit_diagnostics()
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
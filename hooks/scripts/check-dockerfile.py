@@ -6,11 +6,16 @@ Advisory only (exit 0 with systemMessage), never blocks.
 Session-aware dedup.
 """
 
-import json
 import os
 import re
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from claudia_checks import EDIT_TOOLS, NO_FINDINGS, advisory, file_view, run
+from claudia_scan import RuleSet
+
+STATE_NAME = "dockerfile"
+
 # Dockerfile anti-patterns
 # (pattern_regex, description, advice, pattern_id)
 DOCKERFILE_PATTERNS = [
@@ -84,92 +89,63 @@ MULTISTAGE_CHECK = (
     "docker_no_multistage",
 )
 
-
-def get_state_file(session_id):
-    return os.path.expanduser(f"~/.claude/claudia_dockerfile_state_{session_id}.json")
-
-
-def load_state(session_id):
-    state_file = get_state_file(session_id)
-    if os.path.exists(state_file):
-        try:
-            with open(state_file) as f:
-                return set(json.load(f))
-        except (json.JSONDecodeError, IOError):
-            return set()
-    return set()
-
-
-def save_state(session_id, shown):
-    state_file = get_state_file(session_id)
-    try:
-        os.makedirs(os.path.dirname(state_file), exist_ok=True)
-        with open(state_file, "w") as f:
-            json.dump(list(shown), f)
-    except IOError:
-        pass
-
-
-def extract_content(tool_name, tool_input):
-    if tool_name == "Write":
-        return tool_input.get("content", "")
-    elif tool_name == "Edit":
-        return tool_input.get("new_string", "")
-    elif tool_name == "MultiEdit":
-        edits = tool_input.get("edits", [])
-        return " ".join(e.get("new_string", "") for e in edits)
-    return ""
+# The multi-stage check is scanned with the rest; it warns when it doesn't match.
+# It and the two-line apt-get rule look at the whole file on a rewrite.
+DOCKERFILE_RULES = RuleSet(
+    [(pattern_id, pattern) for pattern, _, _, pattern_id in DOCKERFILE_PATTERNS]
+    + [(MULTISTAGE_CHECK[3], MULTISTAGE_CHECK[0], re.IGNORECASE)],
+    re.MULTILINE | re.IGNORECASE,
+    file_rules=("docker_apt_separate", MULTISTAGE_CHECK[3]),
+)
 
 
-def main():
-    try:
-        input_data = json.loads(sys.stdin.read())
-    except json.JSONDecodeError:
-        sys.exit(0)
-
-    session_id = input_data.get("session_id", "default")
-    tool_name = input_data.get("tool_name", "")
-    tool_input = input_data.get("tool_input", {})
+def check(payload, state):
+    """Return advisory Findings for Dockerfile anti-patterns."""
+    tool_name = payload.get("tool_name", "")
+    tool_input = payload.get("tool_input", {})
     file_path = tool_input.get("file_path", "")
 
-    if tool_name not in ("Edit", "Write", "MultiEdit"):
-        sys.exit(0)
+    if tool_name not in EDIT_TOOLS:
+        return NO_FINDINGS
 
     # Only check Dockerfiles
     basename = os.path.basename(file_path)
     if not (basename == "Dockerfile" or basename.startswith("Dockerfile.") or basename.endswith(".dockerfile")):
-        sys.exit(0)
+        return NO_FINDINGS
 
-    content = extract_content(tool_name, tool_input)
-    if not content:
-        sys.exit(0)
+    view = file_view(payload)
+    if not view:
+        return NO_FINDINGS
 
-    shown = load_state(session_id)
+    # Check for missing multi-stage build (only when content is the whole file)
+    check_multistage = view.whole_file and len(view.text) > 200
+    rule_ids = None if check_multistage else DOCKERFILE_RULES.ids[:-1]
+    hits = view.scan(DOCKERFILE_RULES, rule_ids)
+
+    shown = set()
     warnings = []
 
-    for pattern, description, advice, pattern_id in DOCKERFILE_PATTERNS:
-        if re.search(pattern, content, re.MULTILINE | re.IGNORECASE):
+    for _, description, advice, pattern_id in DOCKERFILE_PATTERNS:
+        if pattern_id in hits:
             warning_key = f"{file_path}-{pattern_id}"
-            if warning_key not in shown:
+            if warning_key not in state and warning_key not in shown:
                 shown.add(warning_key)
                 warnings.append(f"- {description}: {advice}")
 
-    # Check for missing multi-stage build (only for full Dockerfile writes)
-    if tool_name == "Write" and len(content) > 200:
-        ms_pattern, ms_desc, ms_advice, ms_id = MULTISTAGE_CHECK
-        if not re.search(ms_pattern, content, re.IGNORECASE):
+    if check_multistage:
+        _, ms_desc, ms_advice, ms_id = MULTISTAGE_CHECK
+        # A skipped check proves nothing either way
+        if ms_id not in hits and ms_id not in hits.skipped:
             warning_key = f"{file_path}-{ms_id}"
-            if warning_key not in shown:
+            if warning_key not in state and warning_key not in shown:
                 shown.add(warning_key)
                 warnings.append(f"- {ms_desc}: {ms_advice}")
 
-    if warnings:
-        save_state(session_id, shown)
-        message = "Claudia noticed some Dockerfile patterns worth reviewing:\n" + "\n".join(warnings)
-        output = json.dumps({"systemMessage": f"\033[38;5;160m{message}\033[0m"})
-        print(output)
+    return advisory("Claudia noticed some Dockerfile patterns worth reviewing:", warnings, shown, hits.skipped)
+
 
-    sys.exit(0)
+def main():
+    run(check, STATE_NAME)
 
 
 if __name__ == "__main__":
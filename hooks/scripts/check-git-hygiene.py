@@ -8,11 +8,16 @@ PreToolUse hook that catches git hygiene issues in file writes.
 Session-aware dedup.
 """
 
-import json
 import os
 import re
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from claudia_checks import EDIT_TOOLS, NO_FINDINGS, Findings, advisory, file_view, run
+from claudia_scan import RuleSet
+
+STATE_NAME = "git"
+
 # File extensions that are likely binary/large and shouldn't be in repos
 BINARY_EXTENSIONS = {
     '.zip', '.tar', '.gz', '.bz2', '.7z', '.rar',
@@ -29,60 +34,42 @@ BINARY_EXTENSIONS = {
 
 # Merge conflict markers
 CONFLICT_PATTERN = r'^(<{7}\s|={7}\s*$|>{7}\s)'
+# Unbudgeted: the pattern is anchored and linear, and a rule skipped for time
+# under load would let conflict markers through
+CONFLICT_RULES = RuleSet([("conflict", CONFLICT_PATTERN, re.MULTILINE)], budgeted=False)
 
 
-def get_state_file(session_id):
-    return os.path.expanduser(f"~/.claude/claudia_git_state_{session_id}.json")
-
+ENV_FILE_BLOCK = """Claudia: Writing directly to .env file detected.
 
-def load_state(session_id):
-    state_file = get_state_file(session_id)
-    if os.path.exists(state_file):
-        try:
-            with open(state_file) as f:
-                return set(json.load(f))
-        except (json.JSONDecodeError, IOError):
-            return set()
-    return set()
+.env files should be gitignored and managed locally. Instead:
+  - Create a .env.example with placeholder values
+  - Add .env to .gitignore
+  - Document required variables in README
 
+If this is intentional for local development, rename to .env.example or .env.template."""
 
-def save_state(session_id, shown):
-    state_file = get_state_file(session_id)
-    try:
-        os.makedirs(os.path.dirname(state_file), exist_ok=True)
-        with open(state_file, "w") as f:
-            json.dump(list(shown), f)
-    except IOError:
-        pass
+CONFLICT_BLOCK = """Claudia: Merge conflict markers detected in code.
 
+Found <<<<<<< / ======= / >>>>>>> markers. These indicate an unresolved merge conflict.
+Resolve the conflict before writing the file."""
 
-def extract_content(tool_name, tool_input):
-    if tool_name == "Write":
-        return tool_input.get("content", "")
-    elif tool_name == "Edit":
-        return tool_input.get("new_string", "")
-    elif tool_name == "MultiEdit":
-        edits = tool_input.get("edits", [])
-        return " ".join(e.get("new_string", "") for e in edits)
-    return ""
 
+def check(payload, state, tiers=None):
+    """Return Findings for git hygiene issues: blocks .env writes and conflict markers.
 
-def main():
-    try:
-        input_data = json.loads(sys.stdin.read())
-    except json.JSONDecodeError:
-        sys.exit(0)
-
-    session_id = input_data.get("session_id", "default")
-    tool_name = input_data.get("tool_name", "")
-    tool_input = input_data.get("tool_input", {})
+    Args:
+        tiers: rule tiers to run (see claudia_routing); without "advise" the
+            binary-file advisory is skipped. None runs everything.
+    """
+    tool_name = payload.get("tool_name", "")
+    tool_input = payload.get("tool_input", {})
     file_path = tool_input.get("file_path", "")
 
-    if tool_name not in ("Edit", "Write", "MultiEdit"):
-        sys.exit(0)
+    if tool_name not in EDIT_TOOLS:
+        return NO_FINDINGS
 
     if not file_path:
-        sys.exit(0)
+        return NO_FINDINGS
 
     basename = os.path.basename(file_path)
     _, ext = os.path.splitext(file_path)
@@ -92,52 +79,36 @@ def main():
             not any(x in basename for x in ["example", "sample", "template", "test"])):
         # Check if it's inside a test directory
         if not any(d in file_path for d in ['/test/', '/tests/', '/fixtures/', '/mock/']):
-            shown = load_state(session_id)
-            warning_key = f"{file_path}-env_file"
-            if warning_key not in shown:
-                shown.add(warning_key)
-                save_state(session_id, shown)
-            print("Claudia: Writing directly to .env file detected.", file=sys.stderr)
-            print("", file=sys.stderr)
-            print(".env files should be gitignored and managed locally. Instead:", file=sys.stderr)
-            print("  - Create a .env.example with placeholder values", file=sys.stderr)
-            print("  - Add .env to .gitignore", file=sys.stderr)
-            print("  - Document required variables in README", file=sys.stderr)
-            print("", file=sys.stderr)
-            print("If this is intentional for local development, rename to .env.example or .env.template.", file=sys.stderr)
-            sys.exit(2)
-
-    content = extract_content(tool_name, tool_input)
-    if not content:
-        sys.exit(0)
-
-    # BLOCK: Merge conflict markers in code
-    if re.search(CONFLICT_PATTERN, content, re.MULTILINE):
+            return Findings(block=ENV_FILE_BLOCK, shown={f"{file_path}-env_file"})
+
+    view = file_view(payload)
+    if not view:
+        return NO_FINDINGS
+
+    # BLOCK: Merge conflict markers in the code this write adds
+    if "conflict" in view.scan(CONFLICT_RULES):
         # Skip markdown files where these characters might be legitimate
         if ext not in ('.md', '.mdx', '.txt', '.rst'):
-            print("Claudia: Merge conflict markers detected in code.", file=sys.stderr)
-            print("", file=sys.stderr)
-            print("Found <<<<<<< / ======= / >>>>>>> markers. These indicate an unresolved merge conflict.", file=sys.stderr)
-            print("Resolve the conflict before writing the file.", file=sys.stderr)
-            sys.exit(2)
+            return Findings(block=CONFLICT_BLOCK)
+
+    if tiers is not None and "advise" not in tiers:
+        return NO_FINDINGS
 
     # ADVISORY: Large binary files
-    shown = load_state(session_id)
+    shown = set()
     warnings = []
 
     if ext.lower() in BINARY_EXTENSIONS:
         warning_key = f"{file_path}-binary_file"
-        if warning_key not in shown:
+        if warning_key not in state:
             shown.add(warning_key)
             warnings.append(f"- Binary file ({ext}): Consider using Git LFS for large binary files, or storing them externally (S3, CDN).")
 
-    if warnings:
-        save_state(session_id, shown)
-        message = "Claudia noticed a git hygiene concern:\n" + "\n".join(warnings)
-        output = json.dumps({"systemMessage": f"\033[38;5;160m{message}\033[0m"})
-        print(output)
+    return advisory("Claudia noticed a git hygiene concern:", warnings, shown)
 
-    sys.exit(0)
+
+def main():
+    run(check, STATE_NAME)
 
 
 if __name__ == "__main__":
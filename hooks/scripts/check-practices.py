@@ -4,13 +4,21 @@ Claudia: check-practices.py
 PreToolUse hook that warns on common anti-patterns.
 Advisory only (exit 0 with systemMessage), never blocks.
 Session-aware dedup to avoid repeating warnings.
+In languages claudia_lex can lex, each rule only looks at the code,
+comments or strings it's about: a TODO in a string or an eval( in a
+comment isn't flagged (up to LEX_MAX_CHARS; bigger files are scanned whole).
 """
 
-import json
 import os
-import re
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from claudia_checks import EDIT_TOOLS, NO_FINDINGS, advisory, file_view, run
+from claudia_lex import CODE, COMMENT, LEX_MAX_CHARS, STRING, language_for
+from claudia_scan import RuleSet, ScanResult
+
+STATE_NAME = "practices"
+
 # Anti-patterns to detect
 # Each: (pattern_regex, description, advice, pattern_id)
 ANTI_PATTERNS = [
@@ -76,93 +84,81 @@ ANTI_PATTERNS = [
     ),
 ]
 
+PRACTICE_RULES = RuleSet([(pattern_id, pattern) for pattern, _, _, pattern_id in ANTI_PATTERNS])
+
+# Span kinds each rule looks at, where the file's language can be lexed
+PRACTICE_TARGETS = {
+    "eval": {CODE},
+    "console_log": {CODE},
+    "empty_catch": {CODE},
+    "http_url": {CODE, STRING},
+    "sql_injection": {CODE, STRING},  # starts at the query string's quote
+    "document_write": {CODE},
+    "innerhtml": {CODE},
+    "todo_marker": {COMMENT},
+    "chmod_777": {CODE, STRING},
+    "ssl_disabled": {CODE, STRING},
+}
+
+# Rule ids grouped by the span kinds they look at: one masked scan per group
+TARGET_GROUPS = {}
+for _rule_id in PRACTICE_RULES.ids:
+    TARGET_GROUPS.setdefault(frozenset(PRACTICE_TARGETS[_rule_id]), []).append(_rule_id)
+
+# Rules skipped in test/fixture files
+TEST_FILE_SKIPS = {"console_log", "todo_marker"}
+
 # File extensions where console.log is expected/normal
 CONSOLE_LOG_EXPECTED = {'.test.js', '.test.ts', '.spec.js', '.spec.ts', '.test.jsx', '.test.tsx'}
 
 
-def get_state_file(session_id):
-    return os.path.expanduser(f"~/.claude/claudia_practices_state_{session_id}.json")
-
-
-def load_state(session_id):
-    state_file = get_state_file(session_id)
-    if os.path.exists(state_file):
-        try:
-            with open(state_file) as f:
-                return set(json.load(f))
-        except (json.JSONDecodeError, IOError):
-            return set()
-    return set()
-
-
-def save_state(session_id, shown):
-    state_file = get_state_file(session_id)
-    try:
-        os.makedirs(os.path.dirname(state_file), exist_ok=True)
-        with open(state_file, "w") as f:
-            json.dump(list(shown), f)
-    except IOError:
-        pass
-
-
-def extract_content(tool_name, tool_input):
-    if tool_name == "Write":
-        return tool_input.get("content", "")
-    elif tool_name == "Edit":
-        return tool_input.get("new_string", "")
-    elif tool_name == "MultiEdit":
-        edits = tool_input.get("edits", [])
-        return " ".join(e.get("new_string", "") for e in edits)
-    return ""
-
-
-def main():
-    try:
-        input_data = json.loads(sys.stdin.read())
-    except json.JSONDecodeError:
-        sys.exit(0)
-
-    session_id = input_data.get("session_id", "default")
-    tool_name = input_data.get("tool_name", "")
-    tool_input = input_data.get("tool_input", {})
+def check(payload, state):
+    """Return advisory Findings for anti-patterns in an Edit/Write/MultiEdit payload."""
+    tool_name = payload.get("tool_name", "")
+    tool_input = payload.get("tool_input", {})
     file_path = tool_input.get("file_path", "")
 
-    if tool_name not in ("Edit", "Write", "MultiEdit"):
-        sys.exit(0)
+    if tool_name not in EDIT_TOOLS:
+        return NO_FINDINGS
 
-    content = extract_content(tool_name, tool_input)
-    if not content:
-        sys.exit(0)
+    view = file_view(payload)
+    if not view:
+        return NO_FINDINGS
 
     # Skip test/fixture files for most checks
     is_test_file = any(ext in file_path for ext in ['.test.', '.spec.', 'fixture', 'mock', '__test__'])
 
-    shown = load_state(session_id)
+    shown = set()
     warnings = []
 
-    for pattern, description, advice, pattern_id in ANTI_PATTERNS:
-        # Skip console.log warning in test files
-        if pattern_id == "console_log" and is_test_file:
-            continue
-
-        # Skip TODO warnings in test files
-        if pattern_id == "todo_marker" and is_test_file:
-            continue
-
-        if re.search(pattern, content):
+    # Skip console.log and TODO warnings in test files
+    rule_ids = [r for r in PRACTICE_RULES.ids if r not in TEST_FILE_SKIPS] if is_test_file else None
+    # Changes to an existing file are only checked where they change it
+    language = language_for(file_path)
+    size = len(view.text) + sum(len(segment) for segment in view.segments or ())
+    if language is None or size > LEX_MAX_CHARS:
+        hits = view.scan(PRACTICE_RULES, rule_ids)
+    else:
+        hits = ScanResult()
+        for kinds, group in TARGET_GROUPS.items():
+            group = [r for r in group if rule_ids is None or r in rule_ids]
+            if group:
+                found = view.masked(language, kinds).scan(PRACTICE_RULES, group)
+                hits.update(found)
+                hits.skipped |= found.skipped
+
+    for _, description, advice, pattern_id in ANTI_PATTERNS:
+        if pattern_id in hits:
             warning_key = f"{file_path}-{pattern_id}"
-            if warning_key not in shown:
+            if warning_key not in state and warning_key not in shown:
                 shown.add(warning_key)
                 warnings.append(f"- {description}: {advice}")
 
-    if warnings:
-        save_state(session_id, shown)
-        # Advisory output via JSON on stdout (systemMessage)
-        message = "Claudia noticed some patterns worth reviewing:\n" + "\n".join(warnings)
-        output = json.dumps({"systemMessage": f"\033[38;5;160m{message}\033[0m"})
-        print(output)
+    return advisory("Claudia noticed some patterns worth reviewing:", warnings, shown, hits.skipped)
 
-    sys.exit(0)
+
+def main():
+    run(check, STATE_NAME)
 
 
 if __name__ == "__main__":
@@ -4,18 +4,27 @@ Claudia: check-secrets.py
 PreToolUse hook that blocks hardcoded secrets in Edit/Write/MultiEdit operations.
 Exit 2 = block, Exit 0 = allow.
 Session-aware dedup to avoid re-blocking the same file+secret type.
+Tokens no rule knows but whose Shannon entropy says random (claudia_entropy)
+get an advisory warning instead: entropy alone can't tell a key from a
+random id, so it never blocks.
 """
 
-import json
 import os
 import re
 import sys
+from bisect import bisect_left
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from claudia_checks import COLOR, EDIT_TOOLS, NO_FINDINGS, RESET, Findings, advisory, file_view, run
+from claudia_scan import RANGE_CONTEXT_CHARS, RuleSet
+
+STATE_NAME = "secrets"
 
 # Secret patterns to detect
-# Each: (pattern_regex, description, secret_type)
+# Each: (pattern_regex, description, secret_type); None = find_aws_secret()
 SECRET_PATTERNS = [
     (r'AKIA[0-9A-Z]{16}', "AWS Access Key ID detected", "aws_key"),
-    (r'[0-9a-zA-Z/+]{40}(?=.*AWS)', "AWS Secret Access Key detected", "aws_secret"),
+    (None, "AWS Secret Access Key detected", "aws_secret"),
     (r'sk-[a-zA-Z0-9]{20,}', "OpenAI/Stripe-style secret key detected", "sk_key"),
     (r'ghp_[a-zA-Z0-9]{36}', "GitHub personal access token detected", "github_pat"),
     (r'gho_[a-zA-Z0-9]{36}', "GitHub OAuth token detected", "github_oauth"),
@@ -30,99 +39,166 @@ SECRET_PATTERNS = [
     (r'mysql://[^/\s]+:[^@\s]+@', "MySQL connection string with credentials", "mysql_uri"),
 ]
 
+# Unbudgeted: the patterns are linear, and a rule skipped for time under load
+# would let a secret through
+SECRET_RULES = RuleSet(
+    [(secret_type, pattern) for pattern, _, secret_type in SECRET_PATTERNS if pattern], budgeted=False,
+)
+
+# AWS secret access keys are 40 base64 characters with nothing to anchor a
+# regex on, so they count only near an "AWS" marker: one pass finds the
+# candidate runs, str.find() the markers, and the two are paired by distance.
+# (The old `[0-9a-zA-Z/+]{40}(?=.*AWS)` rescanned the rest of the line from
+# every 40-character run: quadratic on minified bundles and data URIs.)
+AWS_SECRET_CANDIDATE = r'(?<![0-9a-zA-Z/+])[0-9a-zA-Z/+]{40}(?![0-9a-zA-Z/+])'
+AWS_MARKER = "AWS"
+# Most characters between a candidate and its marker, either side
+AWS_CONTEXT_CHARS = 200
+
 # File patterns to skip (test/example/fixture files)
 SKIP_PATTERNS = ['test', 'spec', 'fixture', 'mock', '.example', '.sample', '.md']
 
-
-def get_state_file(session_id):
-    return os.path.expanduser(f"~/.claude/claudia_secrets_state_{session_id}.json")
-
-
-def load_state(session_id):
-    state_file = get_state_file(session_id)
-    if os.path.exists(state_file):
-        try:
-            with open(state_file) as f:
-                return set(json.load(f))
-        except (json.JSONDecodeError, IOError):
-            return set()
-    return set()
-
-
-def save_state(session_id, shown):
-    state_file = get_state_file(session_id)
-    try:
-        os.makedirs(os.path.dirname(state_file), exist_ok=True)
-        with open(state_file, "w") as f:
-            json.dump(list(shown), f)
-    except IOError:
-        pass
-
-
-def extract_content(tool_name, tool_input):
-    if tool_name == "Write":
-        return tool_input.get("content", "")
-    elif tool_name == "Edit":
-        return tool_input.get("new_string", "")
-    elif tool_name == "MultiEdit":
-        edits = tool_input.get("edits", [])
-        return " ".join(e.get("new_string", "") for e in edits)
-    return ""
-
-
-def main():
-    try:
-        input_data = json.loads(sys.stdin.read())
-    except json.JSONDecodeError:
-        sys.exit(0)
-
-    tool_name = input_data.get("tool_name", "")
-    session_id = input_data.get("session_id", "default")
-    tool_input = input_data.get("tool_input", {})
+# Files made of digests (lockfiles, source maps): no entropy warnings
+ENTROPY_SKIP_SUFFIXES = (
+    'package-lock.json', 'yarn.lock', 'pnpm-lock.yaml', 'Cargo.lock', 'poetry.lock',
+    'Pipfile.lock', 'uv.lock', 'composer.lock', 'Gemfile.lock', 'go.sum', '.map',
+)
+ENTROPY_DESCRIPTIONS = {
+    "hex": "High-entropy hex string next to a key/token name",
+    "base64": "High-entropy base64 string",
+    "alnum": "High-entropy random-looking string",
+}
+
+
+def find_aws_secret(content, context_chars=AWS_CONTEXT_CHARS, ranges=None):
+    """Offset of the first likely AWS secret access key in content, or None.
+
+    A candidate is a run of exactly 40 base64 characters; it counts when an
+    "AWS" marker lies within context_chars of it, before or after.
+
+    Args:
+        ranges: (start, end) offsets candidates must start in (markers may
+            be anywhere), or None for all of content.
+    """
+    markers = []
+    pos = content.find(AWS_MARKER)
+    while pos != -1:
+        markers.append(pos)
+        pos = content.find(AWS_MARKER, pos + 1)
+    if not markers:
+        return None
+    for m in _aws_candidates(content, ranges):
+        start, end = m.span()
+        # Markers from start - context - len(marker) on, up to end + context
+        i = bisect_left(markers, start - context_chars - len(AWS_MARKER))
+        while i < len(markers) and markers[i] <= end + context_chars:
+            if not start <= markers[i] < end:  # a marker inside the key proves nothing
+                return start
+            i += 1
+    return None
+
+
+def _aws_candidates(content, ranges):
+    if ranges is None:
+        yield from re.finditer(AWS_SECRET_CANDIDATE, content)
+        return
+    candidate = re.compile(AWS_SECRET_CANDIDATE)
+    for start, end in ranges:
+        for m in candidate.finditer(content, start, min(end + RANGE_CONTEXT_CHARS, len(content))):
+            if m.start() >= end:
+                break
+            yield m
+
+
+def check(payload, state, tiers=None):
+    """Return Findings for secrets in an Edit/Write/MultiEdit payload.
+
+    Known secret patterns block; high-entropy tokens only warn.
+
+    Args:
+        payload: PreToolUse hook input.
+        state: set of dedup keys already shown this session (not modified).
+        tiers: rule tiers to run (see claudia_routing); without "advise" the
+            entropy warning is skipped. None runs everything.
+    """
+    tool_name = payload.get("tool_name", "")
+    tool_input = payload.get("tool_input", {})
     file_path = tool_input.get("file_path", "")
 
-    if tool_name not in ("Edit", "Write", "MultiEdit"):
-        sys.exit(0)
+    if tool_name not in EDIT_TOOLS:
+        return NO_FINDINGS
 
-    content = extract_content(tool_name, tool_input)
-    if not content:
-        sys.exit(0)
+    view = file_view(payload)
+    if not view:
+        return NO_FINDINGS
 
     # Skip test files and example/fixture files
     if any(skip in file_path for skip in SKIP_PATTERNS):
-        sys.exit(0)
+        return NO_FINDINGS
 
-    shown = load_state(session_id)
+    shown = set()
     found = []
 
-    for pattern, description, secret_type in SECRET_PATTERNS:
-        if re.search(pattern, content):
+    # Changes to an existing file are only checked where they change it
+    hits = view.scan(SECRET_RULES)
+    for base, text, ranges in view.parts():
+        aws_secret = find_aws_secret(text, ranges=ranges)
+        if aws_secret is not None:
+            hits["aws_secret"] = base + aws_secret
+            break
+    for _, description, secret_type in SECRET_PATTERNS:
+        if secret_type in hits:
             warning_key = f"{file_path}-{secret_type}"
-            if warning_key not in shown:
+            if warning_key not in state and warning_key not in shown:
                 shown.add(warning_key)
-                found.append(description)
-
-    if found:
-        save_state(session_id, shown)
-
-        C = "\033[38;5;160m"
-        R = "\033[0m"
-        if len(found) == 1:
-            print(f"{C}Claudia: {found[0]} in {file_path}.{R}", file=sys.stderr)
-        else:
-            print(f"{C}Claudia: Multiple secrets detected in {file_path}:{R}", file=sys.stderr)
-            for desc in found:
-                print(f"{C}  - {desc}{R}", file=sys.stderr)
-        print("", file=sys.stderr)
-        print(f"{C}Secrets should never be hardcoded in source files. Use:", file=sys.stderr)
-        print("  - Environment variables (.env file, gitignored)", file=sys.stderr)
-        print("  - A secret manager (AWS SSM, Vault, Doppler)", file=sys.stderr)
-        print(f"  - CI/CD secrets for pipelines{R}", file=sys.stderr)
-        print("", file=sys.stderr)
-        print(f"{C}If this is intentionally a test fixture or example, rename the file to include 'test', 'example', or 'fixture'.{R}", file=sys.stderr)
-        sys.exit(2)
-
-    sys.exit(0)
+                found.append((description, hits[secret_type]))
+
+    if not found:
+        if hits or (tiers is not None and "advise" not in tiers):
+            return Findings(skipped=hits.skipped)
+        return check_entropy(view, file_path, state, hits.skipped)
+
+    C = COLOR
+    R = RESET
+    lines = []
+    if len(found) == 1:
+        desc, offset = found[0]
+        lines.append(f"{C}Claudia: {desc} in {file_path} ({view.where(offset)}).{R}")
+    else:
+        lines.append(f"{C}Claudia: Multiple secrets detected in {file_path}:{R}")
+        for desc, offset in found:
+            lines.append(f"{C}  - {desc} ({view.where(offset)}){R}")
+    lines.append("")
+    lines.append(f"{C}Secrets should never be hardcoded in source files. Use:")
+    lines.append("  - Environment variables (.env file, gitignored)")
+    lines.append("  - A secret manager (AWS SSM, Vault, Doppler)")
+    lines.append(f"  - CI/CD secrets for pipelines{R}")
+    lines.append("")
+    lines.append(f"{C}If this is intentionally a test fixture or example, rename the file to include 'test', 'example', or 'fixture'.{R}")
+    return Findings(block="\n".join(lines), shown=shown, skipped=hits.skipped)
+
+
+def check_entropy(view, file_path, state, skipped=()):
+    """Advisory Findings for the first high-entropy token in the view."""
+    from claudia_entropy import find_high_entropy
+
+    warning_key = f"{file_path}-high_entropy"
+    if warning_key in state or file_path.endswith(ENTROPY_SKIP_SUFFIXES):
+        return Findings(skipped=skipped)
+    for base, text, ranges in view.parts():
+        hit = find_high_entropy(text, ranges)
+        if hit is not None:
+            offset, kind = hit
+            warning = (
+                f"- {ENTROPY_DESCRIPTIONS[kind]} in {file_path} ({view.where(base + offset)}): if it's a credential, "
+                "load it from an environment variable or a secret manager instead."
+            )
+            return advisory("Claudia noticed a possible secret:", [warning], {warning_key}, skipped)
+    return Findings(skipped=skipped)
+
+
+def main():
+    run(check, STATE_NAME)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Claudia: claudia-hook.py
+Launcher invoked from hooks.json as `claudia-hook.py <hook-name>`.
+When the opt-in daemon is enabled ("daemon": true in ~/.claude/claudia.json),
+forwards stdin to it over a Unix socket and relays its exit code, stdout,
+and stderr. Falls back to running the hook in-process whenever the daemon is
+missing, stale, or slow, so a dead daemon never blocks an edit.
+hooks.json launches it as `python3 -I -S`: hooks import nothing outside the
+standard library and this directory, so site-packages is never scanned.
+Hooks run from cached bytecode, or from the precompiled bundle when
+postinstall built one (see claudia_bundle).
+"""
+
+import io
+import json
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+import claudia_bundle
+
+claudia_bundle.use_cache_prefix(SCRIPTS_DIR)
+claudia_bundle.install(SCRIPTS_DIR)
+
+from claudia_config import DAEMON_HOOKS, daemon_socket_path, load_daemon_config  # noqa: E402
+
+# Seconds to wait for a daemon response before running the hook ourselves
+RESPONSE_TIMEOUT = 5
+
+
+def forward(name, raw_input):
+    """Send a hook request to the daemon.
+
+    Returns:
+        (exit_code, stdout, stderr), or None if the daemon can't serve it.
+    """
+    import socket
+
+    path = daemon_socket_path(SCRIPTS_DIR)
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return None
+
+    request = json.dumps({"hook": name, "cwd": os.getcwd(), "input": raw_input})
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(RESPONSE_TIMEOUT)
+    try:
+        sock.connect(path)
+        sock.sendall(request.encode())
+        sock.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        response = json.loads(b"".join(chunks))
+        return int(response["code"]), response.get("stdout", ""), response.get("stderr", "")
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    finally:
+        sock.close()
+
+
+def spawn_daemon():
+    """Start the daemon in the background. The current request doesn't wait for it."""
+    try:
+        import fcntl  # noqa: F401 -- POSIX only; the daemon needs flock
+        import subprocess
+        subprocess.Popen(
+            [sys.executable, os.path.join(SCRIPTS_DIR, "claudia_daemon.py"), "serve"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            start_new_session=True,
+        )
+    except (ImportError, OSError):
+        pass
+
+
+def run_inprocess(name, script_path, raw_input):
+    """Run a hook script as __main__ in this process. Exits with the hook's code.
+
+    Equivalent to runpy.run_path() for a plain file, without importing runpy
+    (which pulls in pkgutil and typing, ~5ms of a cold start), and using
+    cached bytecode instead of compiling the script on every run.
+    """
+    sys.argv = [script_path]
+    sys.stdin = io.StringIO(raw_input)
+    code = claudia_bundle.code_for(name, script_path)
+    exec(code, {"__name__": "__main__", "__file__": script_path, "__builtins__": __builtins__})
+    sys.exit(0)
+
+
+def main():
+    name = sys.argv[1] if len(sys.argv) > 1 else ""
+    script_path = os.path.join(SCRIPTS_DIR, f"{name}.py")
+    if not name or os.sep in name or not os.path.isfile(script_path):
+        sys.exit(0)
+
+    raw_input = sys.stdin.read()
+
+    config = load_daemon_config()
+    if config["enabled"]:
+        if name in DAEMON_HOOKS:
+            result = forward(name, raw_input)
+            if result is not None:
+                code, out, err = result
+                sys.stdout.write(out)
+                sys.stderr.write(err)
+                sys.exit(code)
+            spawn_daemon()
+        elif not os.path.exists(daemon_socket_path(SCRIPTS_DIR)):
+            # Warm the daemon up for the hooks that follow
+            spawn_daemon()
+
+    run_inprocess(name, script_path, raw_input)
+
+
+if __name__ == "__main__":
+    main()
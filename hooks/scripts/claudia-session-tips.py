@@ -4,14 +4,12 @@ Claudia: claudia-session-tips.py
 SessionStart hook that fires on session startup, resume, clear, or compact.
 Delivers contextual tips based on how the session started.
 Advisory only (exit 0 with additionalContext), never blocks.
+Also starts the background session warm-up (claudia_warm.py).
 """
 
 import json
 import os
-import random
-import subprocess
 import sys
-from datetime import date
 
 # Pool of startup tips for beginners
 STARTUP_TIPS = [
@@ -37,6 +35,8 @@ COMPACT_TIP = (
 
 def gather_project_context():
     """Read project context, milestones, and git state to rebuild context after compaction."""
+    import subprocess
+
     parts = []
 
     # Stack and decisions from project-scoped context (falls back to global)
@@ -156,6 +156,7 @@ def save_state(session_id, state):
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from claudia_config import load_user_config, load_project_context, load_suppress_hooks
+from claudia_warm import spawn as spawn_warmup
 
 
 def load_config():
@@ -170,6 +171,9 @@ def check_for_update():
 
     Returns a hint string if outdated, None otherwise.
     """
+    import subprocess
+    from datetime import date
+
     today = date.today().isoformat()
 
     # Read cached state
@@ -228,6 +232,9 @@ def main():
     session_id = input_data.get("session_id", "default")
     source = input_data.get("source", "")
 
+    # Warm up what the session's first edit needs, in the background
+    spawn_warmup(os.getcwd())
+
     proactivity, experience = load_config()
     is_beginner = experience == "beginner"
 
@@ -256,6 +263,7 @@ def main():
             if not available:
                 available = STARTUP_TIPS
 
+            import random
             tip_text = random.choice(available)
             state["shown_startup_tip"] = True
             state.setdefault("shown_tips_history", []).append(tip_text)
@@ -13,13 +13,7 @@ import time
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from claudia_config import load_user_config, load_suppress_topics, load_suppress_hooks
-
-# Import check() from each Stop hook module
-import importlib
-
-def _import_hook(name):
-    """Import a hook module by filename (without .py)."""
-    return importlib.import_module(name.replace("-", "_").replace(".py", ""))
+from claudia_registry import REGISTRY
 
 # Hook execution order (matches original hooks.json order)
 HOOK_MODULES = [
@@ -72,17 +66,21 @@ def main():
         hook_name = MODULE_TO_HOOK.get(module_name, module_name)
         if hook_name in suppress_hooks:
             continue
+        mod = REGISTRY.load(module_name)
+        if mod is None:
+            continue
         try:
-            mod = _import_hook(module_name)
             result = mod.check(input_data, proactivity, experience)
-            if result:
-                if stop_lock_acquire(session_id):
-                    print(json.dumps(result))
-                sys.exit(0)
-        except Exception:
+        except Exception as e:
             # Don't let one broken hook kill the others
+            REGISTRY.report(module_name, f"check() raised {type(e).__name__}: {e}")
             continue
+        if result:
+            if stop_lock_acquire(session_id):
+                print(json.dumps(result))
+            break
 
+    REGISTRY.emit_diagnostics()
     sys.exit(0)
 
 
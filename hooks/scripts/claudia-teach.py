@@ -238,6 +238,30 @@ def save_state(session_id, state):
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from claudia_config import load_user_config, dismiss_hint, load_profile, update_profile
+from claudia_scan import KeywordMatcher
+
+# (category, keyword, description) in priority order: categories as listed,
+# then keywords within each
+KEYWORD_ENTRIES = [
+    (category, keyword, description)
+    for category, keywords in KEYWORDS.items()
+    for keyword, description in keywords.items()
+]
+
+_keyword_matcher = None
+
+
+def keyword_matcher():
+    """The automaton over KEYWORD_ENTRIES, built on first use."""
+    global _keyword_matcher
+    if _keyword_matcher is None:
+        _keyword_matcher = KeywordMatcher(keyword for _, keyword, _ in KEYWORD_ENTRIES)
+    return _keyword_matcher
+
+
+def find_keywords(message):
+    """(category, keyword, description) for every keyword in message, in priority order."""
+    return [KEYWORD_ENTRIES[i] for i in keyword_matcher().find(message)]
 
 
 def load_config():
@@ -276,37 +300,32 @@ def check(input_data, proactivity, experience):
     dismissed_cmds = {c.lower() for c in profile.get("dismissed_commands", [])}
     history_updated = False
 
-    # Scan for technology keywords
-    for category, keywords in KEYWORDS.items():
+    # Scan for technology keywords (one pass), first new one wins
+    for category, keyword, description in find_keywords(message):
         if category.lower() in suppressed or category.lower() in dismissed:
             continue
-        for keyword, description in keywords.items():
-            kw_lower = keyword.lower()
-            if kw_lower in suppressed or kw_lower in dismissed:
-                continue
-            # Auto-cooldown: skip after 3 cross-session shows
-            kw_history = history.get(kw_lower, {})
-            if kw_history.get("shown", 0) >= 3:
-                continue
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            if re.search(pattern, message, re.IGNORECASE):
-                if kw_lower not in shown_keywords:
-                    shown_keywords.add(kw_lower)
-                    tips.append(
-                        f"I noticed we're talking about {keyword} ({description}). "
-                        f"Want me to explain more? Just say `/claudia:explain {kw_lower}`\n"
-                        f"(Say \"stop tips about {keyword}\" to silence this)\n"
-                        f"(say 'I know' to stop tips about this topic)"
-                    )
-                    # Update cross-session topic history
-                    from datetime import date
-                    entry = history.get(kw_lower, {"shown": 0})
-                    entry["shown"] = entry.get("shown", 0) + 1
-                    entry["last"] = str(date.today())
-                    history[kw_lower] = entry
-                    history_updated = True
-                    break
-        if tips:
+        kw_lower = keyword.lower()
+        if kw_lower in suppressed or kw_lower in dismissed:
+            continue
+        # Auto-cooldown: skip after 3 cross-session shows
+        kw_history = history.get(kw_lower, {})
+        if kw_history.get("shown", 0) >= 3:
+            continue
+        if kw_lower not in shown_keywords:
+            shown_keywords.add(kw_lower)
+            tips.append(
+                f"I noticed we're talking about {keyword} ({description}). "
+                f"Want me to explain more? Just say `/claudia:explain {kw_lower}`\n"
+                f"(Say \"stop tips about {keyword}\" to silence this)\n"
+                f"(say 'I know' to stop tips about this topic)"
+            )
+            # Update cross-session topic history
+            from datetime import date
+            entry = history.get(kw_lower, {"shown": 0})
+            entry["shown"] = entry.get("shown", 0) + 1
+            entry["last"] = str(date.today())
+            history[kw_lower] = entry
+            history_updated = True
             break
 
     # Scan for error patterns (only for beginners)
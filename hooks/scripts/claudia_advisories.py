@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Claudia: claudia_advisories.py
+Offline vulnerability advisories for npm packages: which known advisories
+affect name@version, answered from a local index without the network.
+
+The index is a claudia_index file with one line per package,
+"npm:name<TAB>[[range, id, summary], ...]", the advisories sorted by the
+lowest version their range admits. A lookup binary-searches the file for
+the package, then its advisories' intervals (claudia_semver), kept sorted by
+lower bound with the running maximum of their upper bounds: bisect to the
+last interval starting at or below the version (or a range's top), then
+walk back only while an earlier interval still reaches it (or the range's
+bottom). Each package is decoded once per
+process, so auditing a lockfile costs a binary search per distinct package
+and a bisect per version; the decoded packages are dropped whenever either
+index file changes (see claudia_index.open_index()).
+
+Two indexes are consulted, first match wins:
+- ~/.claude/claudia-advisories.tsv, imported from a full advisory dump;
+- hooks/data/advisories.tsv, shipped with the plugin: a handful of
+  well-known advisories (malware releases, prototype pollution in widely
+  used packages).
+
+Import an index from a local dump (no network involved):
+    python3 claudia_advisories.py build OUT SOURCE [SOURCE ...]
+A SOURCE is an OSV record (.json), a directory or .zip of them (OSV's
+npm/all.zip, a checkout of github/advisory-database), or the JSON list the
+GitHub /advisories API returns. Withdrawn advisories and other ecosystems
+are skipped. Then:
+    python3 claudia_advisories.py check NAME VERSION
+"""
+
+import bisect
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+import claudia_index
+from claudia_semver import MIN_KEY, contains, overlaps, parse_range, version_key
+
+SHIPPED_INDEX = os.path.join(os.path.dirname(SCRIPTS_DIR), "data", "advisories.tsv")
+MAX_SUMMARY_CHARS = 160
+
+# name -> _PackageAdvisories, or None for a package no index lists
+_packages = {}
+# The (user, shipped) SortedIndex objects _packages was decoded from
+_sources = None
+
+
+def user_index():
+    return os.path.expanduser("~/.claude/claudia-advisories.tsv")
+
+
+class _PackageAdvisories:
+    """One package's advisory intervals, sorted for lookup by version."""
+
+    def __init__(self, entries):
+        intervals = []
+        for spec, advisory_id, summary in entries:
+            for interval in parse_range(spec) or ():
+                intervals.append((interval, advisory_id, summary))
+        intervals.sort(key=lambda item: (item[0][0], not item[0][1]))
+        self.intervals = intervals
+        self.lows = [interval[0] for interval, _, _ in intervals]
+        # reach[i]: the highest upper bound among intervals[:i + 1]
+        self.reach = []
+        highest = MIN_KEY
+        for interval, _, _ in intervals:
+            highest = max(highest, interval[2])
+            self.reach.append(highest)
+
+    def affecting(self, key):
+        """(id, summary) of each advisory whose range holds version key."""
+        found = {}
+        i = bisect.bisect_right(self.lows, key)
+        while i > 0 and self.reach[i - 1] >= key:
+            i -= 1
+            interval, advisory_id, summary = self.intervals[i]
+            if contains(interval, key):
+                found.setdefault(advisory_id, summary)
+        return sorted(found.items())
+
+    def overlapping(self, ranges):
+        """(id, summary) of each advisory whose range shares a version with
+        one of the intervals ranges."""
+        found = {}
+        for span in ranges:
+            i = bisect.bisect_right(self.lows, span[2])
+            while i > 0 and self.reach[i - 1] >= span[0]:
+                i -= 1
+                interval, advisory_id, summary = self.intervals[i]
+                if overlaps(interval, span):
+                    found.setdefault(advisory_id, summary)
+        return sorted(found.items())
+
+
+def _package(name):
+    import json
+
+    global _sources
+    indexes = tuple(claudia_index.open_index(path) for path in (user_index(), SHIPPED_INDEX))
+    if indexes != _sources:
+        # An index was rebuilt (or the user one appeared): decode afresh
+        _packages.clear()
+        _sources = indexes
+    if name in _packages:
+        return _packages[name]
+    advisories = None
+    for index in indexes:
+        value = index.get(f"npm:{name}")
+        if value is not None:
+            try:
+                advisories = _PackageAdvisories(json.loads(value))
+            except (ValueError, TypeError):
+                advisories = None
+            break
+    _packages[name] = advisories
+    return advisories
+
+
+def vulnerabilities(name, version):
+    """(id, summary) of each known advisory affecting npm package
+    name@version, in id order; empty for unknown packages and versions
+    that aren't semver."""
+    if not isinstance(name, str):
+        return []
+    key = version_key(version)
+    advisories = _package(name) if key is not None else None
+    if advisories is None:
+        return []
+    return advisories.affecting(key)
+
+
+def range_vulnerabilities(name, spec):
+    """(id, summary) of each known advisory affecting some version the npm
+    range spec admits, in id order; empty for unknown packages and specs
+    that aren't ranges."""
+    if not isinstance(name, str) or not isinstance(spec, str):
+        return []
+    ranges = parse_range(spec)
+    advisories = _package(name) if ranges else None
+    if advisories is None:
+        return []
+    return advisories.overlapping(ranges)
+
+
+def _events_range(events):
+    """A range spec from OSV "introduced"/"fixed"/"last_affected" events,
+    or None if one of their versions isn't semver."""
+    bounds = []
+    for event in events:
+        for kind in ("introduced", "fixed", "last_affected"):
+            version = event.get(kind)
+            if isinstance(version, str):
+                key = MIN_KEY if version == "0" else version_key(version)
+                if key is None:
+                    return None
+                bounds.append((key, kind, version))
+    bounds.sort(key=lambda bound: (bound[0], bound[1] != "introduced"))
+    parts = []
+    start = None
+    for _, kind, version in bounds:
+        if kind == "introduced":
+            if start is None:
+                start = "" if version == "0" else f">={version}"
+        elif start is not None:
+            end = f"<{version}" if kind == "fixed" else f"<={version}"
+            parts.append(f"{start} {end}".strip())
+            start = None
+    if start is not None:
+        parts.append(start or "*")
+    return " || ".join(parts)
+
+
+def _summary(text):
+    text = " ".join(str(text or "").split())
+    return text if len(text) <= MAX_SUMMARY_CHARS else text[:MAX_SUMMARY_CHARS - 3].rstrip() + "..."
+
+
+def advisory_entries(advisory):
+    """Yield (name, [range, id, summary]) for each npm package an OSV or
+    GitHub REST API advisory record affects."""
+    if not isinstance(advisory, dict) or advisory.get("withdrawn") or advisory.get("withdrawn_at"):
+        return
+    if "affected" in advisory:  # OSV
+        advisory_id = advisory.get("id")
+        summary = _summary(advisory.get("summary") or advisory.get("details"))
+        for affected in advisory.get("affected") or ():
+            package = affected.get("package") or {}
+            if package.get("ecosystem") != "npm" or not package.get("name"):
+                continue
+            specs = [
+                _events_range(r.get("events") or ())
+                for r in affected.get("ranges") or ()
+                if r.get("type") in ("SEMVER", "ECOSYSTEM")
+            ]
+            specs = [spec for spec in specs if spec]
+            if not specs and affected.get("versions"):
+                specs = [" || ".join(f"={v}" for v in affected["versions"] if version_key(v))]
+            for spec in specs:
+                if spec and parse_range(spec):
+                    yield package["name"], [spec, advisory_id, summary]
+    elif "vulnerabilities" in advisory:  # GitHub REST API
+        advisory_id = advisory.get("ghsa_id")
+        summary = _summary(advisory.get("summary"))
+        for vulnerability in advisory.get("vulnerabilities") or ():
+            package = vulnerability.get("package") or {}
+            spec = vulnerability.get("vulnerable_version_range")
+            if str(package.get("ecosystem")).lower() == "npm" and package.get("name") and spec and parse_range(spec):
+                yield package["name"], [spec, advisory_id, summary]
+
+
+def read_advisories(path):
+    """Yield the advisory records in a build SOURCE (see module docstring)."""
+    import json
+
+    if os.path.isdir(path):
+        for dir_path, dir_names, file_names in os.walk(path):
+            dir_names[:] = sorted(d for d in dir_names if not d.startswith("."))
+            for file_name in sorted(file_names):
+                if file_name.endswith(".json"):
+                    with open(os.path.join(dir_path, file_name), encoding="utf-8") as f:
+                        yield from _records(json.load(f))
+    elif path.endswith(".zip"):
+        import zipfile
+
+        with zipfile.ZipFile(path) as archive:
+            for member in archive.namelist():
+                if member.endswith(".json"):
+                    yield from _records(json.loads(archive.read(member)))
+    else:
+        with open(path, encoding="utf-8") as f:
+            yield from _records(json.load(f))
+
+
+def _records(data):
+    yield from data if isinstance(data, list) else [data]
+
+
+def index_lines(advisories):
+    """(key, value) index entries for advisory records."""
+    import json
+
+    by_package = {}
+    for advisory in advisories:
+        for name, entry in advisory_entries(advisory):
+            by_package.setdefault(name, []).append(entry)
+    for name, entries in by_package.items():
+        entries.sort(key=lambda entry: (min(parse_range(entry[0])), entry[1] or ""))
+        yield f"npm:{name}", json.dumps(entries, separators=(",", ":"), ensure_ascii=False)
+
+
+def write_index(advisories, path):
+    """Write an advisory index for advisory records at path."""
+    return claudia_index.write_index(index_lines(advisories), path, "advisories")
+
+
+def main():
+    args = sys.argv[1:]
+    command = args[0] if args else ""
+    if command == "check" and len(args) == 3:
+        found = vulnerabilities(args[1], args[2])
+        for advisory_id, summary in found:
+            print(f"{advisory_id}: {summary}")
+        sys.exit(1 if found else 0)
+    if command == "build" and len(args) >= 3:
+        def records():
+            for source in args[2:]:
+                try:
+                    yield from read_advisories(source)
+                except (OSError, ValueError) as e:
+                    print(f"Claudia: skipped {source}: {e}", file=sys.stderr)
+
+        count = write_index(records(), args[1])
+        print(f"Claudia: wrote advisories for {count} packages to {args[1]}")
+        sys.exit(0)
+    print("usage: claudia_advisories.py build OUT SOURCE [SOURCE ...]\n"
+          "       claudia_advisories.py check NAME VERSION", file=sys.stderr)
+    sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
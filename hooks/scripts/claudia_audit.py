@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Claudia: claudia_audit.py
+Batch audit of a project's lockfiles: every locked package, transitive ones
+included, looked up in what check-deps knows about problematic packages, in
+the advisory index (claudia_advisories) for known vulnerabilities of its
+version, and in the license index (claudia_licenses) for copyleft licenses.
+The lockfiles are streamed (claudia_lockfiles), so monorepo-sized ones are
+read in constant memory.
+
+    python3 claudia_audit.py [PATH ...]
+
+A PATH is a lockfile or a directory searched for them (node_modules and
+hidden directories are skipped); the default is the current directory.
+Exits 1 when anything is reported, 0 otherwise.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from claudia_advisories import vulnerabilities
+from claudia_licenses import is_copyleft, lookup
+from claudia_lockfiles import lockfile_kind, read_lockfile
+
+SKIP_DIRS = {"node_modules"}
+
+
+def find_lockfiles(path):
+    """Lockfile paths at or under path, in a stable order."""
+    if os.path.isfile(path):
+        return [path] if lockfile_kind(path) else []
+    found = []
+    for dir_path, dir_names, file_names in os.walk(path):
+        dir_names[:] = sorted(d for d in dir_names if d not in SKIP_DIRS and not d.startswith("."))
+        found.extend(os.path.join(dir_path, name) for name in sorted(file_names) if lockfile_kind(name))
+    return found
+
+
+def _problematic_packages():
+    from claudia_registry import REGISTRY
+
+    deps = REGISTRY.load("check-deps")
+    if deps is None:
+        return {}
+    return {entry[0]: entry for entry in deps.PROBLEMATIC_PACKAGES}
+
+
+def audit_lockfile(path, problematic=None):
+    """Audit one lockfile.
+
+    Args:
+        problematic: package name -> check-deps PROBLEMATIC_PACKAGES entry
+            (loaded from check-deps when None).
+
+    Returns:
+        (number of packages read, [(name, version, note), ...]) with each
+        (name, version) reported once.
+
+    Raises:
+        OSError, ValueError: as read_lockfile().
+    """
+    if problematic is None:
+        problematic = _problematic_packages()
+    count = 0
+    seen = set()
+    found = []
+    # name -> copyleft license, or None; a name recurs once per locked version
+    copyleft = {}
+    for name, version, _, _ in read_lockfile(path):
+        count += 1
+        if (name, version) in seen:
+            continue
+        seen.add((name, version))
+        notes = []
+        entry = problematic.get(name)
+        if entry is not None:
+            _, reason, alternative, _ = entry
+            notes.append(f"{reason}. {alternative}")
+        notes.extend(f"{advisory_id}: {summary}" for advisory_id, summary in vulnerabilities(name, version))
+        if name not in copyleft:
+            license_type = lookup(name)
+            copyleft[name] = license_type if license_type and is_copyleft(license_type) else None
+        if copyleft[name]:
+            notes.append(f"{copyleft[name]} license (copyleft)")
+        if notes:
+            found.append((name, version, "; ".join(notes)))
+    return count, found
+
+
+def main():
+    paths = sys.argv[1:] or ["."]
+    if any(p in ("-h", "--help") for p in paths):
+        print("usage: claudia_audit.py [LOCKFILE_OR_DIR ...]", file=sys.stderr)
+        sys.exit(0)
+    lockfiles = [f for p in paths for f in find_lockfiles(p)]
+    if not lockfiles:
+        print("Claudia: no lockfiles found", file=sys.stderr)
+        sys.exit(0)
+    problematic = _problematic_packages()
+    reported = False
+    for lockfile in lockfiles:
+        try:
+            count, found = audit_lockfile(lockfile, problematic)
+        except (OSError, ValueError) as e:
+            print(f"{lockfile}: can't read: {e}", file=sys.stderr)
+            continue
+        print(f"{lockfile}: {count} packages, {len(found)} to review")
+        for name, version, note in found:
+            print(f"  {name}@{version}: {note}")
+        reported = reported or bool(found)
+    sys.exit(1 if reported else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Claudia: claudia_build.py
+Install-time build for the hooks, run by scripts/postinstall.js:
+- precompiles every hook module with compileall, in place when the plugin
+  directory is writable, otherwise under ~/.claude/claudia-pycache (the same
+  fallback claudia_bundle applies at runtime);
+- with --bundle, also writes claudia.<cache_tag>.pyz, a zip of all the
+  compiled modules plus a manifest of the sources they were built from.
+
+Usage:
+    python3 claudia_build.py [--bundle] [--quiet]
+Safe to rerun; a hook never depends on this having run.
+"""
+
+import compileall
+import importlib.util
+import json
+import os
+import sys
+import zipfile
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+from claudia_bundle import MANIFEST, bundle_path, use_cache_prefix
+
+
+def module_names(scripts_dir):
+    return sorted(f[:-3] for f in os.listdir(scripts_dir) if f.endswith(".py"))
+
+
+def compile_hooks(scripts_dir=SCRIPTS_DIR):
+    """Precompile every module in scripts_dir.
+
+    Returns:
+        (ok, cache location description)
+    """
+    use_cache_prefix(scripts_dir)
+    ok = compileall.compile_dir(scripts_dir, maxlevels=0, quiet=2)
+    return bool(ok), sys.pycache_prefix or os.path.join(scripts_dir, "__pycache__")
+
+
+def build_bundle(scripts_dir=SCRIPTS_DIR):
+    """Zip the compiled modules into the bundle. Call after compile_hooks().
+
+    Returns:
+        the bundle path.
+    """
+    path = bundle_path(scripts_dir)
+    sources = {}
+    tmp_path = path + ".tmp"
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_STORED) as zf:
+        for name in module_names(scripts_dir):
+            source = os.path.join(scripts_dir, f"{name}.py")
+            cached = importlib.util.cache_from_source(source)
+            if not os.path.isfile(cached):
+                continue
+            st = os.stat(source)
+            with open(cached, "rb") as f:
+                zf.writestr(f"{name}.pyc", f.read())
+            sources[name] = [st.st_mtime_ns, st.st_size]
+        zf.writestr(MANIFEST, json.dumps({"cache_tag": sys.implementation.cache_tag, "sources": sources}))
+    # Atomic swap, so a hook never sees a half-written bundle
+    os.replace(tmp_path, path)
+    return path
+
+
+def main():
+    quiet = "--quiet" in sys.argv
+    ok, location = compile_hooks()
+    if not quiet:
+        print(f"Claudia: compiled hooks into {location}")
+    if not ok:
+        print("Claudia: some hook modules failed to compile", file=sys.stderr)
+        sys.exit(1)
+    if "--bundle" in sys.argv:
+        path = build_bundle()
+        if not quiet:
+            print(f"Claudia: wrote {path}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
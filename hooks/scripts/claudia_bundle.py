@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Claudia: claudia_bundle.py
+Runtime side of the precompiled hook bundle (built by claudia_build.py).
+- Bytecode location: hooks cache bytecode in __pycache__ as usual; when the
+  plugin directory is read-only and nothing was precompiled there (e.g. a
+  global npm install), caches go under ~/.claude/claudia-pycache instead,
+  so hooks don't recompile on every run.
+- Bundle: claudia.<cache_tag>.pyz, a zip of every module's bytecode next to
+  the .pyc files. When present, a meta path finder serves modules from it,
+  with __file__ still pointing at the real .py, and skips any module whose
+  source changed since the bundle was built.
+The launcher imports this before anything else, so it sticks to cheap imports.
+"""
+
+import json
+import os
+import sys
+import zipimport
+from importlib.machinery import ModuleSpec, SourceFileLoader
+
+CACHE_PREFIX = os.path.expanduser("~/.claude/claudia-pycache")
+MANIFEST = "MANIFEST.json"
+
+
+def use_cache_prefix(scripts_dir):
+    """Redirect bytecode caches to CACHE_PREFIX if scripts_dir can't hold them.
+
+    Returns:
+        True if sys.pycache_prefix was set.
+    """
+    if sys.pycache_prefix is not None:
+        return False
+    if os.access(scripts_dir, os.W_OK) or os.path.isdir(os.path.join(scripts_dir, "__pycache__")):
+        return False
+    sys.pycache_prefix = CACHE_PREFIX
+    return True
+
+
+def cache_dir(scripts_dir):
+    """Directory holding scripts_dir's bytecode (mirrors importlib's layout)."""
+    if sys.pycache_prefix:
+        return os.path.join(sys.pycache_prefix, os.path.abspath(scripts_dir).lstrip(os.sep))
+    return os.path.join(scripts_dir, "__pycache__")
+
+
+def bundle_path(scripts_dir):
+    return os.path.join(cache_dir(scripts_dir), f"claudia.{sys.implementation.cache_tag}.pyz")
+
+
+class BundleFinder:
+    """Meta path finder and loader for modules in a hook bundle.
+
+    Attributes:
+        sources: module name -> [mtime_ns, size] of the .py it was built from.
+    """
+
+    def __init__(self, path, scripts_dir, sources):
+        self.path = path
+        self.scripts_dir = scripts_dir
+        self.sources = sources
+        self._zip = zipimport.zipimporter(path)
+
+    def fresh(self, name):
+        """Whether the bundled bytecode for name matches its source on disk."""
+        built = self.sources.get(name)
+        if built is None:
+            return False
+        try:
+            st = os.stat(os.path.join(self.scripts_dir, f"{name}.py"))
+        except OSError:
+            return False
+        return [st.st_mtime_ns, st.st_size] == built
+
+    def spec(self, name, module_name=None):
+        """Spec for a bundled module, or None if it isn't bundled or is stale."""
+        if not self.fresh(name):
+            return None
+        spec = ModuleSpec(module_name or name, self, origin=os.path.join(self.scripts_dir, f"{name}.py"))
+        spec.has_location = True
+        spec.loader_state = name
+        return spec
+
+    def get_code(self, name):
+        return self._zip.get_code(name)
+
+    # importlib finder/loader protocol
+
+    def find_spec(self, fullname, path=None, target=None):
+        if path is not None:
+            return None
+        return self.spec(fullname)
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        exec(self.get_code(module.__spec__.loader_state), module.__dict__)
+
+
+_active = None
+
+
+def install(scripts_dir):
+    """Serve scripts_dir's modules from its bundle, if one was built for this Python.
+
+    Returns:
+        the installed BundleFinder, or None.
+    """
+    global _active
+    if _active is not None:
+        return _active
+    path = bundle_path(scripts_dir)
+    if not os.path.isfile(path):
+        return None
+    try:
+        manifest = json.loads(zipimport.zipimporter(path).get_data(MANIFEST))
+        if manifest.get("cache_tag") != sys.implementation.cache_tag:
+            return None
+        finder = BundleFinder(path, scripts_dir, manifest.get("sources", {}))
+    except (OSError, ValueError, zipimport.ZipImportError):
+        return None
+    sys.meta_path.insert(0, finder)
+    _active = finder
+    return finder
+
+
+def active():
+    """The installed BundleFinder, or None."""
+    return _active
+
+
+def code_for(name, path):
+    """Code object for running a hook as __main__, from the bundle or cached bytecode.
+
+    Running a file directly never caches its bytecode; this does.
+    """
+    if _active is not None and _active.fresh(name):
+        try:
+            return _active.get_code(name)
+        except zipimport.ZipImportError:
+            pass
+    return SourceFileLoader(name, path).get_code(name)
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Claudia: claudia_checks.py
+Shared plumbing for the PreToolUse file checks.
+Every check-*.py exposes a pure check(payload, state) -> Findings. This module
+holds the Findings type, content extraction, the FileView checks scan (the
+file as the tool will leave it, plus the ranges the tool changes), and the
+session dedup state I/O that check() leaves to its caller (the script's own
+main() or check-dispatch).
+"""
+
+import json
+import os
+import sys
+
+EDIT_TOOLS = ("Edit", "Write", "MultiEdit")
+
+# On-disk files larger than this aren't read; a tool call on one is scanned
+# as if the file were new
+MAX_FILE_BYTES = 8 * 1024 * 1024
+# Files read_file() keeps in memory (one process, or the daemon, reuses them)
+FILE_CACHE_ENTRIES = 16
+
+# Vermillion, used for all Claudia output
+COLOR = "\033[38;5;160m"
+RESET = "\033[0m"
+
+
+class Findings:
+    """Result of one check() call.
+
+    Attributes:
+        block: stderr text that blocks the write (exit 2), or "" to allow it.
+        message: advisory systemMessage text (uncolored), or "".
+        shown: dedup keys the caller should add to the session state.
+        skipped: rule ids left unchecked because they ran out of time budget
+            (see claudia_scan); reported as diagnostics, never to Claude.
+    """
+
+    __slots__ = ("block", "message", "shown", "skipped")
+
+    def __init__(self, block="", message="", shown=(), skipped=()):
+        self.block = block
+        self.message = message
+        self.shown = set(shown)
+        self.skipped = set(skipped)
+
+    def __bool__(self):
+        return bool(self.block or self.message)
+
+    def __repr__(self):
+        return (
+            f"Findings(block={self.block!r}, message={self.message!r}, "
+            f"shown={self.shown!r}, skipped={self.skipped!r})"
+        )
+
+
+NO_FINDINGS = Findings()
+
+
+def advisory(header, warnings, shown, skipped=()):
+    """Findings for a list of advisory warning lines (empty list -> no findings)."""
+    if not warnings:
+        return Findings(shown=shown, skipped=skipped)
+    return Findings(message=header + "\n" + "\n".join(warnings), shown=shown, skipped=skipped)
+
+
+def skipped_note(skipped):
+    """Diagnostic text for rules a time budget cut short."""
+    return f"skipped rules over their time budget: {', '.join(sorted(skipped))}"
+
+
+def colored(message):
+    return f"{COLOR}{message}{RESET}"
+
+
+def extract_content(tool_name, tool_input):
+    if tool_name == "Write":
+        return tool_input.get("content", "")
+    elif tool_name == "Edit":
+        return tool_input.get("new_string", "")
+    elif tool_name == "MultiEdit":
+        edits = tool_input.get("edits", [])
+        return " ".join(e.get("new_string", "") for e in edits)
+    return ""
+
+
+# --- File View ---
+
+# path -> ((mtime_ns, size), text or None), oldest first
+_file_cache = {}
+# (tool_input, view) of the last file_view() call: every check in a dispatch
+# asks about the same payload
+_last_view = (None, None)
+
+
+def read_file(path):
+    """Text of the file at path, or None if it isn't a readable UTF-8 file
+    of at most MAX_FILE_BYTES.
+
+    Cached by path, mtime and size, so checks sharing a process read a file
+    once and see it again as soon as it changes.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _file_cache.pop(path, None)
+    if cached is not None and cached[0] == key:
+        _file_cache[path] = cached
+        return cached[1]
+
+    text = None
+    if st.st_size <= MAX_FILE_BYTES:
+        try:
+            # newline="" keeps \r\n as written, so offsets line up with tool input
+            with open(path, encoding="utf-8", newline="") as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError):
+            pass
+    _file_cache[path] = (key, text)
+    while len(_file_cache) > FILE_CACHE_ENTRIES:
+        del _file_cache[next(iter(_file_cache))]
+    return text
+
+
+def apply_edits(text, edits, spans=None):
+    """text after each Edit-style {old_string, new_string, replace_all} in turn.
+
+    Args:
+        spans: a list to fill with (start, end, edit index): where each
+            edit's new_string ended up in the result. When a later edit
+            rewrites part of an earlier one's text, what survives of it on
+            either side is kept.
+
+    Returns:
+        the edited text, or None if an old_string isn't in the text (the
+        tool call will fail anyway).
+    """
+    from bisect import bisect_right
+
+    for index, edit in enumerate(edits):
+        old = edit.get("old_string", "")
+        if not old or old not in text:
+            return None
+        new = edit.get("new_string", "")
+        replace_all = edit.get("replace_all")
+        if spans is not None:
+            # Where str.replace() will put new: non-overlapping, left to right
+            positions = [text.find(old)]
+            while replace_all and positions[-1] != -1:
+                positions.append(text.find(old, positions[-1] + len(old)))
+            if positions[-1] == -1:
+                positions.pop()
+            ends = [p + len(old) for p in positions]
+            delta = len(new) - len(old)
+            kept = []
+            for start, end, i in spans:
+                before = bisect_right(ends, start)
+                k = before
+                pieces = []
+                cursor = start
+                while k < len(positions) and positions[k] < end:
+                    # This edit rewrote part of that one: keep the rest
+                    if cursor < positions[k]:
+                        pieces.append((cursor, positions[k]))
+                    cursor = max(cursor, ends[k])
+                    k += 1
+                if k == before:
+                    pieces.append((start, end))
+                elif cursor < end:
+                    pieces.append((cursor, end))
+                for piece_start, piece_end in pieces:
+                    shift = bisect_right(ends, piece_start) * delta
+                    kept.append((piece_start + shift, piece_end + shift, i))
+            kept.extend((p + k * delta, p + k * delta + len(new), index) for k, p in enumerate(positions))
+            spans[:] = sorted(kept)
+        text = text.replace(old, new) if replace_all else text.replace(old, new, 1)
+    return text
+
+
+class FileView:
+    """What an Edit/Write/MultiEdit payload's checks scan (see file_view()).
+
+    Attributes:
+        text: the file as the tool will leave it or, when that can't be
+            worked out, the tool's own content; "" when there are segments.
+        ranges: (start, end) offsets in text of the lines the tool adds or
+            changes, or None when all of text is new.
+        segments: a MultiEdit's new_strings when there's no file to apply
+            them to, or None. They're scanned one at a time, never joined;
+            view offsets run on from one segment into the next.
+        whole_file: whether text is the entire file (any Write, or edits
+            applied to the file on disk).
+    """
+
+    def __init__(self, text, ranges=None, segments=None, whole_file=False, edit_ranges=()):
+        self.text = text
+        self.ranges = ranges
+        self.segments = segments
+        self.whole_file = whole_file
+        # (start, end, edit index) of the lines each MultiEdit step changed
+        self._edit_ranges = edit_ranges
+        self._line_indexes = {}
+        # language -> lexed spans of text (or of each segment)
+        self._lexed = {}
+
+    def __bool__(self):
+        return bool(self.text) or any(self.segments or ())
+
+    def __repr__(self):
+        return f"FileView(text={self.text!r}, ranges={self.ranges!r}, segments={self.segments!r})"
+
+    def parts(self):
+        """(base offset, text, ranges) for each piece of the view."""
+        if self.segments is None:
+            return [(0, self.text, self.ranges)]
+        parts = []
+        base = 0
+        for segment in self.segments:
+            parts.append((base, segment, None))
+            base += len(segment)
+        return parts
+
+    def scan(self, rules, rule_ids=None):
+        """rules.scan() over the view; offsets are view offsets (see where())."""
+        if self.segments is None:
+            return rules.scan(self.text, rule_ids, self.ranges)
+        return rules.scan_segments(self.segments, rule_ids)
+
+    def masked(self, language, kinds):
+        """The same view with all but the span kinds listed blanked out.
+
+        Offsets, lines and ranges are unchanged (see claudia_lex.mask());
+        each text is lexed once per view however many masks are taken.
+        """
+        from claudia_lex import lex, mask
+
+        lexed = self._lexed.get(language)
+        if self.segments is None:
+            if lexed is None:
+                lexed = self._lexed[language] = lex(self.text, language)
+            return FileView(mask(self.text, lexed, kinds), self.ranges,
+                            whole_file=self.whole_file, edit_ranges=self._edit_ranges)
+        if lexed is None:
+            lexed = self._lexed[language] = [lex(segment, language) for segment in self.segments]
+        segments = [mask(segment, spans, kinds) for segment, spans in zip(self.segments, lexed)]
+        return FileView("", segments=segments, whole_file=self.whole_file)
+
+    def search(self, pattern, flags=0):
+        """Whether pattern matches anywhere in the view (in any one segment)."""
+        import re
+
+        return any(re.search(pattern, text, flags) for _, text, _ in self.parts())
+
+    def locate(self, offset):
+        """(edit index or None, 1-based line) for a view offset.
+
+        The line is the file's line when the view is the whole file, else
+        the line within the edit's new_string. The edit index is given for
+        MultiEdit payloads only.
+        """
+        from claudia_scan import LineIndex
+
+        edit = None
+        base, text = 0, self.text
+        if self.segments is not None:
+            for edit, (base, text, _) in enumerate(self.parts()):
+                if offset < base + len(text):
+                    break
+        else:
+            edit = next((i for start, end, i in self._edit_ranges if start <= offset < end), None)
+        index = self._line_indexes.get(base)
+        if index is None:
+            index = self._line_indexes[base] = LineIndex(text)
+        return edit, index.line(offset - base)
+
+    def where(self, offset):
+        """Human-readable location of a view offset: "line 3" or "edit 2, line 3"."""
+        edit, line = self.locate(offset)
+        return f"line {line}" if edit is None else f"edit {edit + 1}, line {line}"
+
+
+def file_view(payload):
+    """What an Edit/Write/MultiEdit payload's checks should scan.
+
+    Returns:
+        FileView. Its text is the whole file as the tool will leave it, and
+        its ranges the lines the tool adds or changes (a Write is diffed
+        against the file on disk; edits are applied to it and their
+        new_strings tracked). When the file isn't on disk (or can't be read,
+        or an edit doesn't apply), the view is the tool's own content and all
+        of it is new: a Write's or Edit's text, or a MultiEdit's new_strings
+        as separate segments.
+    """
+    global _last_view
+    tool_input = payload.get("tool_input", {})
+    if _last_view[0] is tool_input:
+        return _last_view[1]
+    view = _file_view(payload.get("tool_name", ""), tool_input, payload.get("cwd", ""))
+    _last_view = (tool_input, view)
+    return view
+
+
+def _file_view(tool_name, tool_input, cwd):
+    file_path = tool_input.get("file_path", "")
+    if tool_name == "MultiEdit":
+        edits = tool_input.get("edits", [])
+        fallback = FileView("", segments=[e.get("new_string", "") for e in edits])
+    else:
+        edits = [tool_input]
+        fallback = FileView(extract_content(tool_name, tool_input), whole_file=tool_name == "Write")
+    if tool_name not in EDIT_TOOLS or not file_path:
+        return fallback
+    old = read_file(os.path.join(cwd, file_path))
+    if old is None:
+        return fallback
+    if tool_name == "Write":
+        from claudia_scan import diff_ranges
+
+        return FileView(fallback.text, diff_ranges(old, fallback.text), whole_file=True)
+
+    spans = []
+    text = apply_edits(old, edits, spans)
+    if text is None:
+        return fallback
+    # Each edit's new text, widened to whole lines
+    edit_ranges = []
+    for start, end, index in spans:
+        line_start = text.rfind("\n", 0, start) + 1
+        line_end = text.find("\n", max(end - 1, start))
+        edit_ranges.append((line_start, len(text) if line_end == -1 else line_end + 1, index))
+    ranges = []
+    for start, end, _ in edit_ranges:
+        if ranges and start <= ranges[-1][1]:
+            ranges[-1] = (ranges[-1][0], max(end, ranges[-1][1]))
+        else:
+            ranges.append((start, end))
+    return FileView(
+        text, ranges, whole_file=True,
+        edit_ranges=edit_ranges if tool_name == "MultiEdit" else (),
+    )
+
+
+# --- Session Dedup State ---
+
+def get_state_file(state_name, session_id):
+    return os.path.expanduser(f"~/.claude/claudia_{state_name}_state_{session_id}.json")
+
+
+def load_state(state_name, session_id):
+    """Load the set of dedup keys already shown this session."""
+    state_file = get_state_file(state_name, session_id)
+    if os.path.exists(state_file):
+        try:
+            with open(state_file) as f:
+                return set(json.load(f))
+        except (json.JSONDecodeError, IOError, TypeError):
+            return set()
+    return set()
+
+
+def save_state(state_name, session_id, shown):
+    state_file = get_state_file(state_name, session_id)
+    try:
+        os.makedirs(os.path.dirname(state_file), exist_ok=True)
+        with open(state_file, "w") as f:
+            json.dump(list(shown), f)
+    except IOError:
+        pass
+
+
+# --- Standalone Script Entry Point ---
+
+def use_verdict_cache():
+    """Let large scans in this process reuse verdicts from earlier hook runs."""
+    import claudia_scan
+    from claudia_verdicts import VerdictCache
+
+    claudia_scan.verdict_cache = VerdictCache()
+
+
+def emit(findings):
+    """Print findings the way Claude Code expects and exit (2 = block)."""
+    if findings.block:
+        print(findings.block, file=sys.stderr)
+        sys.exit(2)
+    if findings.message:
+        print(json.dumps({"systemMessage": colored(findings.message)}))
+    if findings.skipped:
+        print(f"Claudia: {skipped_note(findings.skipped)}", file=sys.stderr)
+    sys.exit(0)
+
+
+def run(check, state_name):
+    """main() for a check script: read stdin, run check() with state, emit."""
+    try:
+        payload = json.loads(sys.stdin.read())
+    except json.JSONDecodeError:
+        sys.exit(0)
+
+    session_id = payload.get("session_id", "default")
+    shown = load_state(state_name, session_id)
+    use_verdict_cache()
+    findings = check(payload, shown)
+    if findings.shown - shown:
+        save_state(state_name, session_id, shown | findings.shown)
+    emit(findings)
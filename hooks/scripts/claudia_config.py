@@ -5,64 +5,139 @@ Shared configuration module for all Claudia hooks.
 Handles project resolution, user config, and project-scoped context.
 """
 
-import hashlib
+import copy
 import json
 import os
-from datetime import datetime, timezone
+
+# hashlib and datetime are imported lazily: hashlib pulls in OpenSSL, and
+# neither is needed on the common early-exit path of a hook.
+
+
+def _md5_key(text):
+    """First 8 hex chars of md5(text), the key format for projects and sockets."""
+    try:
+        # The builtin md5 skips loading OpenSSL, which dominates hashlib's import
+        from _md5 import md5
+    except ImportError:
+        from hashlib import md5
+    return md5(text.encode()).hexdigest()[:8]
+
+
+# --- Cached JSON Reads ---
+
+# path -> ((mtime_ns, size), parsed data)
+_json_cache = {}
+
+
+def read_json(path, default=None):
+    """Read a JSON file, reusing the parsed result while the file is unchanged.
+
+    Long-lived processes (the hook daemon) call the loaders below on every
+    request; the cache turns those repeat reads into a single stat().
+
+    Returns:
+        a private copy of the parsed data, or default if missing or corrupt.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        _json_cache.pop(path, None)
+        return default
+    signature = (st.st_mtime_ns, st.st_size)
+    cached = _json_cache.get(path)
+    if cached is None or cached[0] != signature:
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return default
+        cached = (signature, data)
+        _json_cache[path] = cached
+    return copy.deepcopy(cached[1])
+
+
+def _write_json(path, data):
+    """Write JSON to path, dropping any cached copy. Silently ignores IO errors."""
+    _json_cache.pop(path, None)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+    except IOError:
+        pass
+
 
 # --- Project Resolution ---
 
 def resolve_project():
     """Walk up from cwd looking for .git to find the project root.
 
+    Uses the SessionStart snapshot for cwd when it is still valid.
+
     Returns:
         (key, path) where key is md5[:8] of the resolved path,
         or (None, None) if cwd is ~ or no .git found.
     """
-    home = os.path.expanduser("~")
-    cwd = os.getcwd()
+    snapshot = load_snapshot()
+    if snapshot is not None:
+        key, path = snapshot["project"]
+        return (key, path)
+    return _walk_project(os.getcwd())
+
+
+def _walk_project(cwd):
+    path = _project_root(cwd)
+    return (_md5_key(path), path) if path else (None, None)
+
+
+def _project_root(cwd):
+    """The nearest directory from cwd up that holds .git, else cwd itself;
+    None at the home directory."""
+    home = os.path.realpath(os.path.expanduser("~"))
 
     # At home directory: no project
-    if os.path.realpath(cwd) == os.path.realpath(home):
-        return (None, None)
+    if os.path.realpath(cwd) == home:
+        return None
 
     # Walk up looking for .git
     current = cwd
     while True:
         if os.path.isdir(os.path.join(current, ".git")):
-            key = hashlib.md5(current.encode()).hexdigest()[:8]
-            return (key, current)
+            return current
         parent = os.path.dirname(current)
         if parent == current:
             break
         # Don't go above home
-        if os.path.realpath(parent) == os.path.realpath(home):
+        if os.path.realpath(parent) == home:
             break
         current = parent
 
     # No .git found: use cwd as root (but not home)
-    key = hashlib.md5(cwd.encode()).hexdigest()[:8]
-    return (key, cwd)
+    return cwd
 
 
 # --- User Config ---
 
+def _user_config_path():
+    return os.path.expanduser("~/.claude/claudia.json")
+
+
+def _user_config():
+    """Parsed ~/.claude/claudia.json, or {} if missing, corrupt, or not an object."""
+    data = read_json(_user_config_path(), {})
+    return data if isinstance(data, dict) else {}
+
+
 def load_suppress_topics():
     """Load suppress_topics list from ~/.claude/claudia.json.
 
     Returns:
         list of topic strings to suppress (empty if not set or file missing).
     """
-    config_path = os.path.expanduser("~/.claude/claudia.json")
-    if os.path.exists(config_path):
-        try:
-            with open(config_path) as f:
-                data = json.load(f)
-                topics = data.get("suppress_topics", [])
-                if isinstance(topics, list):
-                    return topics
-        except (json.JSONDecodeError, IOError):
-            pass
+    data = _user_config()
+    topics = data.get("suppress_topics", [])
+    if isinstance(topics, list):
+        return topics
     return []
 
 
@@ -72,16 +147,10 @@ def load_suppress_hooks():
     Returns:
         set of lowercase hook name strings to suppress (empty if not set or file missing).
     """
-    config_path = os.path.expanduser("~/.claude/claudia.json")
-    if os.path.exists(config_path):
-        try:
-            with open(config_path) as f:
-                data = json.load(f)
-                hooks = data.get("suppress_hooks", [])
-                if isinstance(hooks, list):
-                    return {h.lower() for h in hooks if isinstance(h, str)}
-        except (json.JSONDecodeError, IOError):
-            pass
+    data = _user_config()
+    hooks = data.get("suppress_hooks", [])
+    if isinstance(hooks, list):
+        return {h.lower() for h in hooks if isinstance(h, str)}
     return set()
 
 
@@ -103,30 +172,80 @@ def load_user_config():
         (proactivity, experience) tuple with string values.
         Defaults: ("moderate", "intermediate")
     """
+    snapshot = load_snapshot()
+    if snapshot is not None:
+        proactivity, experience = snapshot["user_config"]
+        return proactivity, experience
+    return _merge_user_config()
+
+
+def _merge_user_config(key=None):
     proactivity = "moderate"
     experience = "intermediate"
 
-    config_path = os.path.expanduser("~/.claude/claudia.json")
-    experience_set = False
-    if os.path.exists(config_path):
-        try:
-            with open(config_path) as f:
-                data = json.load(f)
-                proactivity = data.get("proactivity", proactivity)
-                if "experience" in data:
-                    experience = data["experience"]
-                    experience_set = True
-        except (json.JSONDecodeError, IOError):
-            pass
+    data = _user_config()
+    proactivity = data.get("proactivity", proactivity)
+    experience_set = "experience" in data
+    if experience_set:
+        experience = data["experience"]
 
     # Experience falls back to project context if not set in claudia.json
     if not experience_set:
-        ctx = load_project_context()
+        ctx = load_project_context(key)
         experience = ctx.get("experience", experience)
 
     return proactivity, experience
 
 
+DAEMON_DEFAULTS = {"enabled": False, "mode": "resident", "idle_minutes": 10}
+
+# Hooks the daemon serves: the launcher forwards these, the daemon refuses
+# anything else
+DAEMON_HOOKS = frozenset({
+    "check-dispatch",
+    "claudia-stop-dispatch",
+    "claudia-prompt-coach",
+    "claudia-compact-tip",
+})
+
+
+def load_daemon_config():
+    """Load the opt-in hook daemon settings from ~/.claude/claudia.json.
+
+    Accepts either `"daemon": true` or an object such as
+    `"daemon": {"enabled": true, "idle_minutes": 10}`.
+
+    Returns:
+        dict with "enabled", "mode", and "idle_minutes" keys.
+    """
+    config = dict(DAEMON_DEFAULTS)
+    value = _user_config().get("daemon")
+    if isinstance(value, bool):
+        config["enabled"] = value
+    elif isinstance(value, dict):
+        config["enabled"] = bool(value.get("enabled", True))
+        if value.get("mode") in ("resident", "fork"):
+            config["mode"] = value["mode"]
+        idle = value.get("idle_minutes")
+        if isinstance(idle, (int, float)) and idle > 0:
+            config["idle_minutes"] = idle
+    return config
+
+
+def daemon_socket_path(scripts_dir):
+    """Unix socket path for the hook daemon serving scripts_dir.
+
+    Lives under ~/.claude, unless that would exceed the AF_UNIX path limit.
+    """
+    home = os.path.expanduser("~")
+    key = _md5_key(f"{home}:{scripts_dir}")
+    path = os.path.join(home, ".claude", f"claudia-daemon-{key}.sock")
+    if len(path) > 100:
+        import tempfile
+        path = os.path.join(tempfile.gettempdir(), f"claudia-{os.getuid()}-{key}.sock")
+    return path
+
+
 # --- Project Context ---
 
 def _projects_dir():
@@ -159,22 +278,14 @@ def load_project_context(key=None):
 
     # Try project-specific file first
     if key:
-        pfile = _project_file(key)
-        if os.path.exists(pfile):
-            try:
-                with open(pfile) as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                pass
+        data = read_json(_project_file(key))
+        if data is not None:
+            return data
 
     # Fall back to global context
-    global_path = _global_context_path()
-    if os.path.exists(global_path):
-        try:
-            with open(global_path) as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            pass
+    data = read_json(_global_context_path())
+    if data is not None:
+        return data
 
     return {}
 
@@ -195,31 +306,14 @@ def save_project_context(data, key=None, path=None):
     if not key:
         # No project resolved (at home dir) -- write to global
         global_path = _global_context_path()
-        existing = {}
-        if os.path.exists(global_path):
-            try:
-                with open(global_path) as f:
-                    existing = json.load(f)
-            except (json.JSONDecodeError, IOError):
-                pass
+        existing = read_json(global_path, {})
         existing.update(data)
-        try:
-            os.makedirs(os.path.dirname(global_path), exist_ok=True)
-            with open(global_path, "w") as f:
-                json.dump(existing, f, indent=2)
-        except IOError:
-            pass
+        _write_json(global_path, existing)
         return
 
     # Write project-specific file
     pfile = _project_file(key)
-    existing = {}
-    if os.path.exists(pfile):
-        try:
-            with open(pfile) as f:
-                existing = json.load(f)
-        except (json.JSONDecodeError, IOError):
-            pass
+    existing = read_json(pfile, {})
 
     existing.update(data)
     existing["project_key"] = key
@@ -228,12 +322,7 @@ def save_project_context(data, key=None, path=None):
     if "name" not in existing and path:
         existing["name"] = os.path.basename(path)
 
-    try:
-        os.makedirs(os.path.dirname(pfile), exist_ok=True)
-        with open(pfile, "w") as f:
-            json.dump(existing, f, indent=2)
-    except IOError:
-        pass
+    _write_json(pfile, existing)
 
     # Update registry
     _update_registry(key, existing.get("name", os.path.basename(path or "")), path)
@@ -241,6 +330,8 @@ def save_project_context(data, key=None, path=None):
 
 def _update_registry(key, name, path):
     """Update the project registry with this project's info."""
+    from datetime import datetime, timezone
+
     registry = load_registry()
     now = datetime.now(timezone.utc).isoformat()
 
@@ -258,13 +349,7 @@ def _update_registry(key, name, path):
             "created": now,
         }
 
-    try:
-        rpath = _registry_path()
-        os.makedirs(os.path.dirname(rpath), exist_ok=True)
-        with open(rpath, "w") as f:
-            json.dump(registry, f, indent=2)
-    except IOError:
-        pass
+    _write_json(_registry_path(), registry)
 
 
 def load_registry():
@@ -273,18 +358,75 @@ def load_registry():
     Returns:
         dict with "version" and "projects" keys.
     """
-    rpath = _registry_path()
-    if os.path.exists(rpath):
-        try:
-            with open(rpath) as f:
-                data = json.load(f)
-                if isinstance(data, dict) and "projects" in data:
-                    return data
-        except (json.JSONDecodeError, IOError):
-            pass
+    data = read_json(_registry_path())
+    if isinstance(data, dict) and "projects" in data:
+        return data
     return {"version": 1, "projects": {}}
 
 
+# --- Warm Snapshot ---
+# Written at SessionStart (claudia_warm.py): the resolved project and merged
+# user config for one working directory, plus the stat signature of every
+# file they came from. Readers only use it while all of those files are
+# unchanged and walking up from cwd still finds the same project root (a
+# .git created nearer to cwd, or removed, moves it), so it never serves
+# stale config.
+
+def _warm_dir():
+    return os.path.expanduser("~/.claude/claudia-warm")
+
+
+def _snapshot_path(cwd):
+    return os.path.join(_warm_dir(), f"project-{_md5_key(cwd)}.json")
+
+
+def _file_signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def save_snapshot(cwd=None):
+    """Resolve the project and merge user config for cwd, and save the result.
+
+    Returns:
+        the snapshot dict.
+    """
+    cwd = cwd or os.getcwd()
+    key, path = _walk_project(cwd)
+    sources = [_user_config_path(), _global_context_path()]
+    if key:
+        sources.append(_project_file(key))
+    # Signature first: a file changing while we read it invalidates the snapshot
+    signature = {p: _file_signature(p) for p in sources}
+    snapshot = {
+        "cwd": cwd,
+        "project": [key, path],
+        "user_config": list(_merge_user_config(key or "")),
+        "sources": signature,
+    }
+    _write_json(_snapshot_path(cwd), snapshot)
+    return snapshot
+
+
+def load_snapshot(cwd=None):
+    """The saved snapshot for cwd, or None if missing or out of date."""
+    cwd = cwd or os.getcwd()
+    snapshot = read_json(_snapshot_path(cwd))
+    if not isinstance(snapshot, dict) or snapshot.get("cwd") != cwd:
+        return None
+    for path, signature in snapshot.get("sources", {}).items():
+        if _file_signature(path) != signature:
+            return None
+    # A few stats, without the key's hashing or any config reads
+    project = snapshot.get("project")
+    if not isinstance(project, list) or len(project) != 2 or _project_root(cwd) != project[1]:
+        return None
+    return snapshot
+
+
 # --- User Proficiency Profile ---
 
 def _profile_path():
@@ -293,18 +435,13 @@ def _profile_path():
 
 def load_profile():
     """Load user proficiency profile. Seeds from claudia-context.json on first load."""
-    path = _profile_path()
-    if os.path.exists(path):
-        try:
-            with open(path) as f:
-                data = json.load(f)
-                data.setdefault("dismissed_topics", [])
-                data.setdefault("dismissed_commands", [])
-                data.setdefault("topic_history", {})
-                data.setdefault("level", "intermediate")
-                return data
-        except (json.JSONDecodeError, IOError):
-            pass
+    data = read_json(_profile_path())
+    if isinstance(data, dict):
+        data.setdefault("dismissed_topics", [])
+        data.setdefault("dismissed_commands", [])
+        data.setdefault("topic_history", {})
+        data.setdefault("level", "intermediate")
+        return data
 
     # Migration: seed from existing experience
     ctx = load_project_context()
@@ -321,11 +458,5 @@ def update_profile(updates):
     """Merge updates into profile and save."""
     profile = load_profile()
     profile.update(updates)
-    path = _profile_path()
-    try:
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "w") as f:
-            json.dump(profile, f, indent=2)
-    except IOError:
-        pass
+    _write_json(_profile_path(), profile)
     return profile
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Claudia: claudia_daemon.py
+Opt-in resident hook server. Keeps hook modules, compiled rule tables, and
+cached config/state reads in memory and serves hook requests over a Unix
+domain socket, so each tool call skips interpreter startup and imports.
+Spawned on demand by claudia-hook.py; exits after idle_minutes without requests.
+
+Both modes preload every hook module and compile its rule tables (one
+pass of claudia_warm.warm_checks()) before binding the socket.
+Two modes ("mode" in the daemon config):
+- resident: one long-lived process runs every request itself (default).
+- fork: a zygote preloads every hook module, then forks a child per request,
+  so each request gets a clean process with warm imports.
+
+Protocol: the client sends one JSON object {"hook", "cwd", "input"} and
+half-closes the socket; the server replies {"code", "stdout", "stderr"}.
+"""
+
+import gc
+import io
+import json
+import os
+import socketserver
+import sys
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+from claudia_config import DAEMON_HOOKS, daemon_socket_path, load_daemon_config
+from claudia_registry import REGISTRY
+from claudia_warm import warm_checks
+
+# Modules that are never preloaded (the launcher, the daemon itself, and the
+# install-time builder)
+NO_PRELOAD = {"claudia-hook", "claudia_daemon", "claudia_build"}
+
+# Upper bound on a single request's size
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+# Seconds a client may take to send its request or read the response. The
+# server handles one request at a time, so a client that stalls must not
+# hold up the ones behind it (the launcher sends its whole request at once)
+REQUEST_TIMEOUT = 2
+
+
+def _scripts_signature():
+    """mtimes of every hook module, used to notice an in-place plugin upgrade."""
+    signature = []
+    for name in sorted(os.listdir(SCRIPTS_DIR)):
+        if name.endswith(".py"):
+            try:
+                signature.append((name, os.stat(os.path.join(SCRIPTS_DIR, name)).st_mtime_ns))
+            except OSError:
+                pass
+    return signature
+
+
+# --- In-process Hook Execution ---
+
+def preload_hooks():
+    """Import every hook module up front. Returns the names that loaded."""
+    loaded = []
+    for filename in sorted(os.listdir(SCRIPTS_DIR)):
+        name, ext = os.path.splitext(filename)
+        if ext != ".py" or name in NO_PRELOAD:
+            continue
+        if REGISTRY.load(name) is not None:
+            loaded.append(name)
+    REGISTRY.diagnostics = []
+    return loaded
+
+
+def run_hook(name, raw_input, cwd=None):
+    """Run a hook's main() in-process with raw_input on stdin.
+
+    Returns:
+        (exit_code, stdout, stderr) exactly as a subprocess would report them.
+    """
+    saved_cwd = os.getcwd()
+    saved = sys.stdin, sys.stdout, sys.stderr
+    out, err = io.StringIO(), io.StringIO()
+    code = 0
+    try:
+        if cwd:
+            os.chdir(cwd)
+        mod = REGISTRY.load(name)
+        if mod is None:
+            REGISTRY.diagnostics = []
+            return 0, "", ""
+        sys.stdin, sys.stdout, sys.stderr = io.StringIO(raw_input), out, err
+        mod.main()
+    except SystemExit as e:
+        if isinstance(e.code, int):
+            code = e.code
+        elif e.code is not None:
+            code = 1
+    except Exception:
+        # A crashing hook must never block the user's edit
+        code = 0
+    finally:
+        sys.stdin, sys.stdout, sys.stderr = saved
+        try:
+            os.chdir(saved_cwd)
+        except OSError:
+            pass
+    return code, out.getvalue(), err.getvalue()
+
+
+# --- Server ---
+
+class HookRequestHandler(socketserver.StreamRequestHandler):
+
+    # Applied to the connection by StreamRequestHandler.setup()
+    timeout = REQUEST_TIMEOUT
+
+    def handle(self):
+        self.server.last_active = time.time()
+        try:
+            raw = self.rfile.read(MAX_REQUEST_BYTES)
+            request = json.loads(raw)
+            name = request["hook"]
+        except (OSError, ValueError, KeyError, TypeError):
+            # Includes a client that stalled past REQUEST_TIMEOUT
+            return
+        if name not in DAEMON_HOOKS:
+            response = {"code": 0, "stdout": "", "stderr": f"claudia-daemon: unknown hook {name}\n"}
+        else:
+            code, out, err = run_hook(name, request.get("input", ""), request.get("cwd"))
+            response = {"code": code, "stdout": out, "stderr": err}
+        try:
+            self.wfile.write(json.dumps(response).encode())
+        except OSError:
+            pass  # the client gave up; it runs the hook itself
+        self.server.last_active = time.time()
+
+
+class HookServer(socketserver.UnixStreamServer):
+    """Serial server: hooks redirect sys.stdout and chdir, so one request at a time."""
+
+    def __init__(self, path, idle_seconds):
+        self.idle_seconds = idle_seconds
+        self.last_active = time.time()
+        self.signature = _scripts_signature()
+        super().__init__(path, HookRequestHandler)
+        self.timeout = min(idle_seconds, 60)
+
+    def process_request(self, request, client_address):
+        # Forked children can't update the parent's clock, so record activity here
+        self.last_active = time.time()
+        super().process_request(request, client_address)
+
+    def should_exit(self):
+        if time.time() - self.last_active >= self.idle_seconds:
+            return True
+        # Plugin files changed under us: exit and let the next call respawn
+        return _scripts_signature() != self.signature
+
+
+class ForkingHookServer(socketserver.ForkingMixIn, HookServer):
+    """Fork server: each request runs in a child forked from the preloaded zygote."""
+
+    def should_exit(self):
+        # handle_request() doesn't reap children the way serve_forever() does
+        self.collect_children()
+        return super().should_exit()
+
+
+def serve(path=None, idle_seconds=None, mode=None):
+    """Bind the socket and serve until idle. Returns when the daemon should exit."""
+    import fcntl
+
+    config = load_daemon_config()
+    path = path or daemon_socket_path(SCRIPTS_DIR)
+    if idle_seconds is None:
+        idle_seconds = config["idle_minutes"] * 60
+    mode = mode or config["mode"]
+    server_class = HookServer
+    if mode == "fork" and hasattr(os, "fork"):
+        server_class = ForkingHookServer
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Only one daemon per socket: hold an exclusive lock for our lifetime
+    lock = open(path + ".lock", "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return
+
+    try:
+        if os.path.exists(path):
+            os.unlink(path)  # stale socket from a dead daemon
+        # Bind only once warm: until then clients run hooks in-process
+        preload_hooks()
+        warm_checks()
+        if server_class is ForkingHookServer:
+            # Keep preloaded objects out of GC passes so children share their pages
+            gc.freeze()
+        old_umask = os.umask(0o077)
+        try:
+            server = server_class(path, idle_seconds)
+        finally:
+            os.umask(old_umask)
+        try:
+            while not server.should_exit():
+                server.handle_request()
+        finally:
+            server.server_close()
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+    finally:
+        lock.close()
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        serve()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Claudia: claudia_entropy.py
+Shannon-entropy detection of generic secrets: the random-looking tokens
+that check-secrets' prefix and keyword rules don't know about.
+
+One regex pass collects candidate tokens (a quoted string, or the value
+after "=" or ":", made only of base64/base64url characters, 20 to
+MAX_TOKEN_CHARS long). Each is classed by charset (hex, base64 or alnum)
+and cheap tests drop most of them before any entropy is computed: too
+short for its class, too few distinct characters to reach its threshold
+(a token of k distinct characters has at most log2(k) bits per character),
+a hash-algorithm prefix, for alnum not mixing digits with upper and lower
+case (identifiers and constants don't), for hex no word like "key" or
+"token" earlier on its line (hex is mostly digests and ids), for base64 a
+path shape (a leading "/", or "/"-separated words like "api/v2/Users").
+
+The survivors' entropies are computed in batches, each repeated token
+once, with str.count per distinct character.
+"""
+
+import re
+
+# charset -> (minimum length, minimum bits per character). Random hex tops
+# out at 4 bits, base64 at 6, and a string of n characters at log2(n); at
+# these lengths a random key usually clears the bar and identifiers, paths
+# and words don't.
+THRESHOLDS = {
+    "hex": (32, 3.0),
+    "base64": (20, 4.0),
+    "alnum": (24, 4.0),
+}
+MAX_TOKEN_CHARS = 256
+
+_TOKEN_CHARS = r"A-Za-z0-9+/=_\-"
+TOKEN_PATTERN = (
+    rf"(?:[\"'`]|[=:][ \t]*)([{_TOKEN_CHARS}]{{20,{MAX_TOKEN_CHARS}}})(?![{_TOKEN_CHARS}])"
+)
+# Subresource-integrity and lockfile hashes: high entropy, not secret
+HASH_PREFIXES = ("sha1-", "sha256-", "sha384-", "sha512-")
+# Random hex is as often a digest or an id as a key, so a hex token counts
+# only when its line names what it is
+HEX_CONTEXT = r"(?i)key|secret|token|passw|auth|credential|private"
+# URL and file paths: "/" makes them base64 by charset, their camel-case
+# words give them the entropy of one. A path starts with "/" or is words
+# (letters, maybe a version number after) joined by "/"; a key's "/"-parts
+# mix digits into their letters.
+PATH_PATTERN = r"/|(?:[A-Za-z][A-Za-z_-]*\d{0,3}/)+[A-Za-z][A-Za-z_-]*\d{0,3}/?$"
+
+# find_high_entropy() measures candidates in batches of this many, doubling
+FIRST_BATCH_TOKENS = 256
+
+_HEX = frozenset("0123456789abcdefABCDEF")
+_BASE64_MARKS = frozenset("+/=")
+_DIGITS = frozenset("0123456789")
+_UPPER = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+_LOWER = frozenset("abcdefghijklmnopqrstuvwxyz")
+_compiled = None
+_path = None
+
+
+def _charset(chars):
+    if chars <= _HEX:
+        return "hex"
+    if chars & _BASE64_MARKS:
+        return "base64"
+    return "alnum"
+
+
+def charset(token):
+    """"hex", "base64" or "alnum" for a candidate token."""
+    return _charset(set(token))
+
+
+def candidates(content, ranges=None):
+    """(offset, token, charset) of each token worth an entropy check.
+
+    Args:
+        ranges: (start, end) offsets tokens must start in, or None for all
+            of content.
+    """
+    global _compiled, _path
+    if _compiled is None:
+        _compiled = re.compile(TOKEN_PATTERN)
+        _path = re.compile(PATH_PATTERN)
+    if ranges is None:
+        matches = _compiled.finditer(content)
+    else:
+        matches = _in_ranges(content, ranges)
+    found = []
+    hex_context = None
+    for m in matches:
+        token = m.group(1)
+        chars = set(token)
+        kind = _charset(chars)
+        min_length, min_bits = THRESHOLDS[kind]
+        # log2(distinct) < min_bits  <=>  distinct < 2 ** min_bits
+        if len(token) < min_length or len(chars) < 2 ** min_bits:
+            continue
+        if kind == "alnum" and not (chars & _DIGITS and chars & _UPPER and chars & _LOWER):
+            continue
+        if kind == "hex":
+            if hex_context is None:
+                hex_context = re.compile(HEX_CONTEXT)
+            start = m.start(1)
+            if not hex_context.search(content, content.rfind("\n", 0, start) + 1, start):
+                continue
+        elif token.startswith(HASH_PREFIXES):
+            continue
+        elif kind == "base64" and "/" in chars and _path.match(token):
+            continue
+        found.append((m.start(1), token, kind))
+    return found
+
+
+def _in_ranges(content, ranges):
+    from claudia_scan import RANGE_CONTEXT_CHARS
+
+    for start, end in ranges:
+        # A candidate's opening quote or "=" may sit just before the range
+        start = max(start - 1, 0)
+        for m in _compiled.finditer(content, start, min(end + RANGE_CONTEXT_CHARS, len(content))):
+            if m.start(1) >= end:
+                break
+            yield m
+
+
+def entropies(tokens):
+    """Shannon entropy, in bits per character, of each ASCII token."""
+    return [_entropy(token) for token in tokens]
+
+
+def _entropy(token):
+    import math
+
+    n = len(token)
+    bits = 0.0
+    for c in set(token):
+        p = token.count(c) / n
+        bits -= p * math.log2(p)
+    return bits
+
+
+def find_high_entropy(content, ranges=None):
+    """(offset, charset) of the first likely secret token in content, or None.
+
+    Args:
+        ranges: as for candidates().
+    """
+    found = candidates(content, ranges)
+    bits = {}
+    # Batches double from FIRST_BATCH_TOKENS: a hit near the top stops the
+    # search early, a clean file still ends up in a few big batches
+    start = 0
+    size = FIRST_BATCH_TOKENS
+    while start < len(found):
+        batch = found[start:start + size]
+        # Repeated tokens (a key pasted twice, a common hash) are measured once
+        unique = [token for token in dict.fromkeys(token for _, token, _ in batch) if token not in bits]
+        bits.update(zip(unique, entropies(unique)))
+        for offset, token, kind in batch:
+            if bits[token] >= THRESHOLDS[kind][1]:
+                return offset, kind
+        start += size
+        size *= 2
+    return None
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Claudia: claudia_index.py
+Sorted key/value index files, the on-disk format of the offline data the
+checks look things up in (claudia_licenses, claudia_advisories).
+
+An index is a UTF-8 text file of "key<TAB>value" lines sorted by their
+bytes, after one "#claudia-<kind><TAB><format version>" header line (which
+sorts first: keys start with a lowercase ecosystem name). SortedIndex
+memory-maps it and binary-searches the lines in place, so a lookup costs
+O(log n) page touches whatever the index size, and an index nobody queries
+is never read. open_index() shares one SortedIndex per path within a
+process and replaces it when the file's mtime or size changes, so a
+long-lived process (the daemon) sees a rebuilt index on its next lookup.
+"""
+
+import os
+
+
+class SortedIndex:
+    """A sorted index file, memory-mapped on first lookup."""
+
+    def __init__(self, path):
+        self.path = path
+        self._map = None
+        self._file = None
+
+    def _open(self):
+        import mmap
+
+        try:
+            self._file = open(self.path, "rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):  # missing, unreadable or empty
+            self._map = b""
+        return self._map
+
+    def close(self):
+        if self._map:
+            self._map.close()
+        if self._file is not None:
+            self._file.close()
+        self._map = self._file = None
+
+    def get(self, key):
+        """The value stored under key, or None."""
+        data = self._map if self._map is not None else self._open()
+        target = key.encode("utf-8")
+        lo, hi = 0, len(data)
+        # The line holding key, if any, starts in [lo, hi)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = data.rfind(b"\n", 0, mid) + 1
+            end = data.find(b"\n", start)
+            if end == -1:
+                end = len(data)
+            line_key, _, value = data[start:end].partition(b"\t")
+            if line_key == target:
+                return value.decode("utf-8")
+            if line_key < target:
+                lo = end + 1
+            else:
+                hi = start
+        return None
+
+
+# path -> ((mtime, size) or None if missing, SortedIndex)
+_indexes = {}
+
+
+def open_index(path):
+    """The SortedIndex for path, shared within the process until the file
+    changes."""
+    try:
+        st = os.stat(path)
+        signature = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        signature = None
+    cached = _indexes.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    if cached is not None:
+        cached[1].close()
+    index = SortedIndex(path)
+    _indexes[path] = (signature, index)
+    return index
+
+
+def write_index(entries, path, kind):
+    """Write (key, value) pairs as a sorted index of kind at path,
+    atomically. A key given twice keeps its last value.
+
+    Returns:
+        The number of entries written.
+    """
+    lines = sorted(
+        f"{key}\t{value}\n".encode("utf-8")
+        for key, value in dict(entries).items()
+        if "\t" not in key + value and "\n" not in key + value
+    )
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(tmp_path, "wb") as f:
+        f.write(f"#claudia-{kind}\t1\n".encode("utf-8"))
+        f.writelines(lines)
+    os.replace(tmp_path, path)
+    return len(lines)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Claudia: claudia_lex.py
+Just enough lexing for the file checks to tell code from comments and
+string literals. One regex pass per text finds every comment and string
+(whichever starts first wins, so a "#" inside a string is string, a quote
+inside a comment is comment); everything between them is code.
+
+mask() then blanks the span kinds a rule doesn't look at, keeping offsets
+and newlines, so a RuleSet scans the masked text exactly as it would the
+original: hits land at the same offsets and lines, and a rule that targets
+code never sees a TODO in a docstring or an eval( in a string.
+
+Deliberately approximate: JS regex literals and template-literal ${...}
+are not parsed (a template literal is all string), nor are shell heredocs.
+Quoted strings in JS and Python end at an unescaped newline, so a stray
+quote can't swallow the rest of the file. Callers leave texts over
+LEX_MAX_CHARS unlexed.
+"""
+
+import os
+import re
+
+CODE = "code"
+COMMENT = "comment"
+STRING = "string"
+ALL_KINDS = frozenset({CODE, COMMENT, STRING})
+
+# Lexing and masking cost about ten times a RuleSet scan; texts larger than
+# this (almost always bundles or generated code) are scanned unmasked
+LEX_MAX_CHARS = 1024 * 1024
+
+# Token patterns per language: a "comment" or "string" group per token
+_JS = (
+    r'(?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))'
+    r'|(?P<string>"[^"\\\n]*(?:\\[\s\S][^"\\\n]*)*"?'
+    r"|'[^'\\\n]*(?:\\[\s\S][^'\\\n]*)*'?"
+    r'|`[^`\\]*(?:\\[\s\S][^`\\]*)*`?)'
+)
+_PYTHON = (
+    r'(?P<comment>#[^\n]*)'
+    r'|(?P<string>"""[^"\\]*(?:(?:\\[\s\S]|"(?!""))[^"\\]*)*(?:"""|\Z)'
+    r"|'''[^'\\]*(?:(?:\\[\s\S]|'(?!''))[^'\\]*)*(?:'''|\Z)"
+    r'|"[^"\\\n]*(?:\\[\s\S][^"\\\n]*)*"?'
+    r"|'[^'\\\n]*(?:\\[\s\S][^'\\\n]*)*'?)"
+)
+# A shell "#" starts a comment only at the start of a word
+_SHELL = (
+    r'(?P<comment>(?<![^\s;&|()])#[^\n]*)'
+    r'|(?P<string>"[^"\\]*(?:\\[\s\S][^"\\]*)*"?'
+    r"|'[^']*'?)"
+)
+
+LANGUAGES = {
+    "js": _JS,
+    "python": _PYTHON,
+    "shell": _SHELL,
+}
+
+EXTENSIONS = {
+    ".js": "js", ".jsx": "js", ".mjs": "js", ".cjs": "js",
+    ".ts": "js", ".tsx": "js", ".mts": "js", ".cts": "js",
+    ".py": "python", ".pyi": "python",
+    ".sh": "shell", ".bash": "shell", ".zsh": "shell",
+}
+
+_compiled = {}
+
+
+def language_for(file_path):
+    """Lexer language for file_path, or None if there's none for it."""
+    return EXTENSIONS.get(os.path.splitext(file_path)[1].lower())
+
+
+def lex(text, language):
+    """(start, end, kind) of every comment and string in text, in order."""
+    pattern = _compiled.get(language)
+    if pattern is None:
+        pattern = _compiled[language] = re.compile(LANGUAGES[language])
+    return [(m.start(), m.end(), m.lastgroup) for m in pattern.finditer(text) if m.end() > m.start()]
+
+
+def _blank(text):
+    """text with every character but newlines turned into a space."""
+    if "\n" not in text:
+        return " " * len(text)
+    return "\n".join(" " * len(line) for line in text.split("\n"))
+
+
+def mask(text, spans, kinds):
+    """text with everything outside the span kinds listed blanked out.
+
+    Args:
+        spans: lex(text, ...) output.
+        kinds: the kinds to keep, from CODE, COMMENT and STRING.
+    """
+    if kinds >= ALL_KINDS:
+        return text
+    # Blanking the whole text once and slicing it is far cheaper than
+    # blanking thousands of small pieces one by one
+    blank = _blank(text)
+    code = text if CODE in kinds else blank
+    pieces = []
+    pos = 0
+    for start, end, kind in spans:
+        if start > pos:
+            pieces.append(code[pos:start])
+        pieces.append(text[start:end] if kind in kinds else blank[start:end])
+        pos = end
+    pieces.append(code[pos:])
+    return "".join(pieces)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Claudia: claudia_licenses.py
+Offline license index: package name -> SPDX license expression for npm and
+PyPI packages, looked up without the network and without loading the data.
+
+An index is a claudia_index file of "ecosystem:name<TAB>license" lines
+(names normalized: npm names lowercased, PyPI names per PEP 503), so a
+query costs O(log n) page touches whatever the index size, and an index
+nobody queries is never read.
+
+Two indexes are consulted, first match wins:
+- ~/.claude/claudia-licenses.tsv, built locally (see below), so a team can
+  cover its whole dependency tree;
+- hooks/data/licenses.tsv, shipped with the plugin: a seed of widely used
+  packages, the copyleft ones among them.
+
+Build an index from local data (no network involved):
+    python3 claudia_licenses.py build OUT SOURCE [SOURCE ...]
+A SOURCE is a JSON file mapping names (or "name@version") to licenses, as
+`license-checker --json` writes it; a TSV of name<TAB>license lines; or a
+directory, whose node_modules/*/package.json and *.dist-info/METADATA files
+are harvested. --pypi marks JSON and TSV sources as PyPI names. Then:
+    python3 claudia_licenses.py lookup NAME [--pypi]
+"""
+
+import os
+import re
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+import claudia_index
+
+SHIPPED_INDEX = os.path.join(os.path.dirname(SCRIPTS_DIR), "data", "licenses.tsv")
+
+# License ids that oblige sharing source: strong and weak copyleft, and
+# SSPL's service-wide variant
+COPYLEFT_IDS = ("AGPL", "GPL", "LGPL", "SSPL", "EUPL", "OSL", "CC-BY-SA")
+
+
+def user_index():
+    return os.path.expanduser("~/.claude/claudia-licenses.tsv")
+
+
+def index_key(name, ecosystem="npm"):
+    """The key name has in an index."""
+    if ecosystem == "pypi":
+        name = re.sub(r"[-_.]+", "-", name)
+    return f"{ecosystem}:{name.lower()}"
+
+
+def lookup(name, ecosystem="npm"):
+    """SPDX license expression of a package, or None if no index has it."""
+    key = index_key(name, ecosystem)
+    for path in (user_index(), SHIPPED_INDEX):
+        license_type = claudia_index.open_index(path).get(key)
+        if license_type is not None:
+            return license_type
+    return None
+
+
+def is_copyleft(expression):
+    """Whether a license expression binds you to a copyleft license.
+
+    "A OR B" lets you pick, so it only does when every choice does;
+    "A AND B" (and "A WITH exception") does when any part does.
+    """
+    choices = re.split(r"\s+OR\s+", expression.replace("(", " ").replace(")", " "), flags=re.IGNORECASE)
+    return all(
+        any(part.strip().upper().startswith(COPYLEFT_IDS) for part in re.split(r"\s+AND\s+", choice, flags=re.IGNORECASE))
+        for choice in choices
+    )
+
+
+def write_index(entries, path):
+    """Write (key, license) pairs as a sorted license index at path."""
+    return claudia_index.write_index(entries, path, "licenses")
+
+
+def _license_text(value):
+    """An SPDX expression from a package.json "license"/"licenses" value."""
+    if isinstance(value, dict):
+        value = value.get("type")
+    elif isinstance(value, list):
+        parts = [_license_text(v) for v in value]
+        value = " OR ".join(p for p in parts if p)
+    return value.strip() if isinstance(value, str) and value.strip() else None
+
+
+def read_source(path, ecosystem="npm"):
+    """Yield (key, license) pairs from a build SOURCE (see module docstring)."""
+    import json
+
+    if os.path.isdir(path):
+        yield from _harvest(path)
+        return
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        for name, value in data.items():
+            if isinstance(value, dict) and "licenses" in value:  # license-checker
+                value = value["licenses"]
+            license_type = _license_text(value)
+            at = name.find("@", 1)
+            if license_type:
+                yield index_key(name if at == -1 else name[:at], ecosystem), license_type
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            name, _, license_type = line.rstrip("\n").partition("\t")
+            if name and license_type and not name.startswith("#"):
+                yield index_key(name, ecosystem), license_type
+
+
+def _harvest(root):
+    """(key, license) from installed packages under root."""
+    import json
+
+    for dir_path, dir_names, file_names in os.walk(root):
+        dir_names[:] = [d for d in dir_names if not d.startswith(".") or d.endswith(".dist-info")]
+        if "package.json" in file_names and "node_modules" in dir_path.split(os.sep):
+            try:
+                with open(os.path.join(dir_path, "package.json"), encoding="utf-8") as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if isinstance(manifest, dict) and isinstance(manifest.get("name"), str):
+                license_type = _license_text(manifest.get("license") or manifest.get("licenses"))
+                if license_type:
+                    yield index_key(manifest["name"]), license_type
+        elif dir_path.endswith(".dist-info") and "METADATA" in file_names:
+            name = license_type = None
+            try:
+                with open(os.path.join(dir_path, "METADATA"), encoding="utf-8") as f:
+                    for line in f:
+                        if not line.strip():
+                            break  # headers end at the first blank line
+                        field, _, value = line.partition(":")
+                        if field == "Name":
+                            name = value.strip()
+                        elif field == "License-Expression" or (field == "License" and not license_type):
+                            license_type = value.strip()
+            except (OSError, UnicodeDecodeError):
+                continue
+            if name and license_type and len(license_type) < 100:
+                yield index_key(name, "pypi"), license_type
+
+
+def main():
+    args = [a for a in sys.argv[1:] if a != "--pypi"]
+    ecosystem = "pypi" if "--pypi" in sys.argv[1:] else "npm"
+    command = args[0] if args else ""
+    if command == "lookup" and len(args) == 2:
+        license_type = lookup(args[1], ecosystem)
+        print(license_type or "unknown")
+        sys.exit(0 if license_type else 1)
+    if command == "build" and len(args) >= 3:
+        entries = []
+        for source in args[2:]:
+            try:
+                entries.extend(read_source(source, ecosystem))
+            except (OSError, ValueError, AttributeError) as e:
+                print(f"Claudia: skipped {source}: {e}", file=sys.stderr)
+        count = write_index(entries, args[1])
+        print(f"Claudia: wrote {count} licenses to {args[1]}")
+        sys.exit(0)
+    print("usage: claudia_licenses.py build OUT SOURCE [SOURCE ...] [--pypi]\n"
+          "       claudia_licenses.py lookup NAME [--pypi]", file=sys.stderr)
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
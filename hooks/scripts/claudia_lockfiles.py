@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Claudia: claudia_lockfiles.py
+Streaming parsers for npm, yarn and pnpm lockfiles. Each takes an iterable
+of text pieces (chunks of any size for package-lock.json, whole lines for
+the others; a text file object iterates by line) and yields one (name,
+version, resolved, integrity) record per locked package, so a 60 MB
+monorepo lockfile never becomes a 60 MB string, let alone a dict tree
+several times that size. Fields a lockfile doesn't record are None.
+
+package-lock.json / npm-shrinkwrap.json (v2, v3): a small incremental JSON
+reader walks the top-level object, decoding only the entries of the
+"packages" map one at a time with json.JSONDecoder.raw_decode() and
+skipping every other value by bracket counting. It stops once "packages"
+is read, so a v2 file's legacy "dependencies" copy is never looked at.
+v1 files (npm 6) have only that nested "dependencies" tree, which is
+walked instead, one top-level entry at a time. The root project, workspace
+folders and workspace links are not packages and yield nothing.
+
+yarn.lock (classic v1 and berry) and pnpm-lock.yaml (v5 to v9) are parsed
+line by line: each entry's header names the package, its indented fields
+give the rest. These are not general YAML parsers; they read what the
+package managers write.
+
+read_lockfile(path) picks the parser by file name and feeds it the file;
+claudia_audit runs it over a whole project. parse_lockfile_text() does the
+same for text already in memory (check-deps, over a lockfile write),
+slicing it a piece at a time rather than copying it whole.
+"""
+
+import json
+import os
+import re
+
+# Characters per piece fed to the JSON reader
+CHUNK_CHARS = 1024 * 1024
+
+LOCKFILE_KINDS = {
+    "package-lock.json": "npm",
+    "npm-shrinkwrap.json": "npm",
+    "yarn.lock": "yarn",
+    "pnpm-lock.yaml": "pnpm",
+}
+
+_NON_SPACE = re.compile(r"\S")
+# An object member up to its value, and what follows the value
+_MEMBER = re.compile(r'\s*"((?:[^"\\]|\\.)*)"\s*:\s*')
+_SEPARATOR = re.compile(r"\s*([,}])")
+# A whole string, a string the buffer cuts off (just its quote), or a bracket
+_STRUCTURE = re.compile(r'"(?:[^"\\]|\\.)*"|"|[{}\[\]]')
+_DECODER = json.JSONDecoder()
+
+
+def lockfile_kind(path):
+    """"npm", "yarn" or "pnpm" for a lockfile path, or None."""
+    return LOCKFILE_KINDS.get(os.path.basename(path))
+
+
+def read_lockfile(path, kind=None):
+    """Yield (name, version, resolved, integrity) for each package locked
+    in the file at path (see module docstring).
+
+    Raises:
+        OSError: the file can't be read.
+        ValueError: it isn't a lockfile of its kind.
+    """
+    kind = kind or lockfile_kind(path)
+    if kind not in PARSERS:
+        raise ValueError(f"not a known lockfile: {path}")
+    with open(path, encoding="utf-8") as f:
+        pieces = iter(lambda: f.read(CHUNK_CHARS), "") if kind == "npm" else f
+        yield from PARSERS[kind](pieces)
+
+
+def parse_lockfile_text(text, kind):
+    """Yield the records of a lockfile of kind ("npm", "yarn" or "pnpm")
+    given as a string (see module docstring).
+
+    Raises:
+        ValueError: it isn't a lockfile of its kind.
+    """
+    if kind not in PARSERS:
+        raise ValueError(f"not a known lockfile kind: {kind}")
+    yield from PARSERS[kind](text_chunks(text) if kind == "npm" else text_lines(text))
+
+
+def text_chunks(text, size=None):
+    """Slices of text of size characters (default CHUNK_CHARS), one at a time."""
+    size = size or CHUNK_CHARS
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+
+def text_lines(text):
+    """The lines of text, ends kept, one at a time (as a file iterates)."""
+    start = 0
+    while start < len(text):
+        end = text.find("\n", start) + 1 or len(text)
+        yield text[start:end]
+        start = end
+
+
+class _JsonStream:
+    """Incremental reader over JSON text arriving in pieces."""
+
+    def __init__(self, pieces):
+        self.pieces = iter(pieces)
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        """Append a piece to the buffer, dropping what's consumed."""
+        if self.eof:
+            return False
+        for data in self.pieces:
+            if data:  # an empty piece isn't the end
+                self.buf = self.buf[self.pos:] + data
+                self.pos = 0
+                return True
+        self.eof = True
+        return False
+
+    def peek(self):
+        """The next non-whitespace character, or "" at the end."""
+        while True:
+            m = _NON_SPACE.search(self.buf, self.pos)
+            if m:
+                self.pos = m.start()
+                return self.buf[self.pos]
+            self.pos = len(self.buf)
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} in JSON lockfile")
+        self.pos += 1
+
+    def decode(self):
+        """The next value, decoded (it must fit in memory)."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except ValueError:
+                if not self._fill():
+                    raise
+                continue
+            # A number ending the buffer may go on in the next chunk
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def skip(self):
+        """Move past the next value without building it."""
+        if self.peek() not in ("{", "["):
+            self.decode()
+            return
+        depth = 0
+        while True:
+            for m in _STRUCTURE.finditer(self.buf, self.pos):
+                token = m.group()
+                if token == '"':  # the rest of this string isn't read yet
+                    self.pos = m.start()
+                    break
+                if token == "{" or token == "[":
+                    depth += 1
+                elif token == "}" or token == "]":
+                    depth -= 1
+                    if depth == 0:
+                        self.pos = m.end()
+                        return
+            else:
+                self.pos = len(self.buf)
+            if not self._fill():
+                raise ValueError("JSON lockfile ends inside a value")
+
+    def members(self):
+        """Yield the keys of the object that comes next; the caller must
+        decode() or skip() each key's value before asking for the next."""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.decode()
+            self.expect(":")
+            yield key
+            separator = self.peek()
+            self.pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError("expected ',' or '}' in JSON lockfile")
+
+    def items(self):
+        """Yield (key, value) for each member of the object that comes next,
+        decoding one value at a time.
+
+        The fast path for big maps: one match for the key, one raw_decode()
+        for the value, one match for the separator. A member the buffer cuts
+        off is retried from its start once more is read.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            try:
+                m = _MEMBER.match(self.buf, self.pos)
+                if m is None:
+                    raise ValueError("expected a member in JSON lockfile")
+                value, end = _DECODER.raw_decode(self.buf, m.end())
+                separator = _SEPARATOR.match(self.buf, end)
+                if separator is None:
+                    raise ValueError("expected ',' or '}' in JSON lockfile")
+            except ValueError:
+                if self._fill():
+                    continue
+                raise
+            key = m.group(1)
+            if "\\" in key:
+                key = json.loads(f'"{key}"')
+            self.pos = separator.end()
+            yield key, value
+            if separator.group(1) == "}":
+                return
+
+
+def parse_package_lock(pieces):
+    """Records from the text of a package-lock.json or npm-shrinkwrap.json,
+    in pieces of any size."""
+    stream = _JsonStream(pieces)
+    lockfile_version = None
+    for key in stream.members():
+        if key == "lockfileVersion":
+            lockfile_version = stream.decode()
+        elif key == "packages":
+            for path, entry in stream.items():
+                record = _package_record(path, entry)
+                if record is not None:
+                    yield record
+            return
+        elif key == "dependencies" and lockfile_version == 1:
+            for name, entry in stream.items():
+                yield from _v1_records(name, entry)
+            return
+        else:
+            stream.skip()
+
+
+def _package_record(path, entry):
+    if not isinstance(entry, dict) or entry.get("link"):
+        return None
+    i = path.rfind("node_modules/")
+    if i == -1:  # the root project or a workspace folder
+        return None
+    name = entry.get("name") or path[i + len("node_modules/"):]
+    return (name, entry.get("version"), entry.get("resolved"), entry.get("integrity"))
+
+
+def _v1_records(name, entry):
+    pending = [(name, entry)]
+    while pending:
+        name, entry = pending.pop()
+        if not isinstance(entry, dict):
+            continue
+        yield (name, entry.get("version"), entry.get("resolved"), entry.get("integrity"))
+        nested = entry.get("dependencies")
+        if isinstance(nested, dict):
+            pending.extend(reversed(list(nested.items())))
+
+
+def parse_yarn_lock(lines):
+    """Records from the lines of a yarn.lock (classic or berry)."""
+    name = None
+    fields = {}
+    for line in lines:
+        if not line.strip() or line.startswith("#"):
+            continue
+        if not line[0].isspace():
+            record = _yarn_record(name, fields)
+            if record is not None:
+                yield record
+            name = _yarn_name(line)
+            fields = {}
+        elif name is not None and line.startswith("  ") and not line.startswith("   "):
+            # classic: `  version "1.2.3"`, berry: `  version: 1.2.3`
+            key, _, value = line.strip().partition(" ")
+            fields[key.rstrip(":")] = value.strip().strip('"')
+    record = _yarn_record(name, fields)
+    if record is not None:
+        yield record
+
+
+def _yarn_name(header):
+    """Package name from an entry header (None for berry's __metadata)."""
+    descriptor = header.rstrip().rstrip(":").split(",")[0].strip().strip('"')
+    if descriptor == "__metadata":
+        return None
+    at = descriptor.find("@", 1)
+    return descriptor if at == -1 else descriptor[:at]
+
+
+def _yarn_record(name, fields):
+    resolved = fields.get("resolved") or fields.get("resolution")
+    if name is None or (resolved and "@workspace:" in resolved):
+        return None
+    return (name, fields.get("version"), resolved, fields.get("integrity") or fields.get("checksum"))
+
+
+def parse_pnpm_lock(lines):
+    """Records from the lines of a pnpm-lock.yaml (lockfile v5 to v9)."""
+    major = 6
+    in_packages = False
+    key = None
+    fields = {}
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        indent = len(line) - len(line.lstrip(" "))
+        if indent == 0:
+            if key is not None:
+                yield _pnpm_record(key, fields, major)
+                key = None
+            if stripped.startswith("lockfileVersion:"):
+                version = stripped.partition(":")[2].strip().strip("'\"")
+                major = int(version.split(".")[0]) if version.split(".")[0].isdigit() else major
+            in_packages = stripped == "packages:"
+        elif not in_packages:
+            continue
+        elif indent == 2 and stripped.endswith(":"):
+            if key is not None:
+                yield _pnpm_record(key, fields, major)
+            key = stripped[:-1].strip("'\"")
+            fields = {}
+        elif indent == 4 and key is not None:
+            field, _, value = stripped.partition(":")
+            if field == "resolution":
+                # {integrity: sha512-...} or {tarball: https://..., integrity: ...}
+                fields.update(re.findall(r"(\w+):\s*([^,}]+)", value))
+            elif field == "version":
+                fields["version"] = value.strip().strip("'\"")
+    if key is not None:
+        yield _pnpm_record(key, fields, major)
+
+
+def _pnpm_record(key, fields, major):
+    # /name@1.0.0(peer@2.0.0) from v6 on, /name/1.0.0_peer@2.0.0 before;
+    # v9 drops the leading slash
+    key = key.lstrip("/").split("(")[0]
+    if major < 6:
+        parts = key.split("/")
+        scoped = key.startswith("@")
+        name = "/".join(parts[:2]) if scoped else parts[0]
+        version = (parts[2] if scoped else parts[1]) if len(parts) > 1 + scoped else None
+        version = version.split("_")[0] if version else None
+    else:
+        at = key.rfind("@")
+        name, version = (key[:at], key[at + 1:]) if at > 0 else (key, None)
+    integrity = fields.get("integrity")
+    return (
+        name,
+        fields.get("version") or version,
+        fields.get("tarball", "").strip() or None,
+        integrity.strip() if integrity else None,
+    )
+
+
+PARSERS = {
+    "npm": parse_package_lock,
+    "yarn": parse_yarn_lock,
+    "pnpm": parse_pnpm_lock,
+}
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Claudia: claudia_packages.py
+package.json dependency extraction for the manifest checks (check-deps,
+check-license): which packages a write actually depends on, as opposed to
+every quoted string that happens to spell a package name ("gulp build" in
+scripts, "moment" in keywords or a description).
+
+A whole package.json is parsed with json.loads() and its dependency fields
+(DEPENDENCY_FIELDS) read off. What json can't parse (an Edit's new_string
+when the file isn't on disk, a file mid-edit with a trailing comma) goes to
+a tolerant scan of its "key": value entries that tracks which object each
+entry sits in: entries under a dependency field count, entries under any
+other key don't, and entries whose enclosing object isn't in the fragment
+count when their value reads as a version spec.
+
+added_dependencies() is what the checks use: the dependencies a payload
+adds, so editing the "version" of a package.json that has long depended on
+moment doesn't warn about moment again; added_dependency_specs() gives the
+version ranges they're added with. added_locked_packages() is the same
+for lockfile writes, through the streaming parsers in claudia_lockfiles.
+"""
+
+import json
+import os
+import re
+
+from claudia_checks import file_view, read_file
+
+DEPENDENCY_FIELDS = ("dependencies", "devDependencies", "peerDependencies", "optionalDependencies")
+
+_STRING = r'"((?:[^"\\\n]|\\.)*)"'
+# An entry ("key": { or "key": "value"), a bare string, or a brace
+_FRAGMENT_TOKEN = re.compile(
+    rf'{_STRING}\s*:\s*(?:(\{{)|{_STRING})|"(?:[^"\\\n]|\\.)*"|([{{}}])'
+)
+# What npm accepts as a dependency's version: ranges, tags, protocols, URLs
+VERSION_SPEC = re.compile(
+    r"\s*(?:[~^<>=v]*\s*\d|[*xX]\s*$|latest$|next$|npm:|file:|link:|workspace:|git[+:]|github:|https?://)"
+)
+
+
+def declarations(text):
+    """Yield (name, dependency field, version spec) for each dependency
+    declared in text.
+
+    Args:
+        text: a package.json, or any part of one (the field is None for
+            entries whose enclosing object the part doesn't show).
+    """
+    try:
+        manifest = json.loads(text)
+    except (ValueError, TypeError):
+        yield from _fragment_declarations(text)
+        return
+    if isinstance(manifest, dict):
+        for field in DEPENDENCY_FIELDS:
+            section = manifest.get(field)
+            if isinstance(section, dict):
+                for name, spec in section.items():
+                    yield name, field, spec if isinstance(spec, str) else None
+
+
+def dependencies(text):
+    """name -> dependency field of every dependency declared in text
+    (see declarations())."""
+    found = {}
+    for name, field, _ in declarations(text):
+        found.setdefault(name, field)
+    return found
+
+
+def fragment_dependencies(text):
+    """dependencies() for text json can't parse (see module docstring)."""
+    found = {}
+    for name, field, _ in _fragment_declarations(text):
+        found.setdefault(name, field)
+    return found
+
+
+def _fragment_declarations(text):
+    # Object names from the outermost one the fragment opens; "" for an
+    # object with no key (the root, an array element)
+    stack = []
+    # The object around the fragment's own start: None while unknown, ""
+    # once a "}" closes one (dependency fields hold no objects, so whatever
+    # encloses a closed object isn't one)
+    outer = None
+    for m in _FRAGMENT_TOKEN.finditer(text):
+        key, opens, value, brace = m.groups()
+        if opens:
+            stack.append(key)
+        elif value is not None:
+            section = stack[-1] if stack else outer
+            if section in DEPENDENCY_FIELDS:
+                yield key, section, value
+            elif section is None and VERSION_SPEC.match(value):
+                yield key, None, value
+        elif brace == "{":
+            stack.append("")
+        elif brace == "}":
+            if stack:
+                stack.pop()
+            else:
+                outer = ""
+
+
+def added_dependencies(payload):
+    """name -> field of the dependencies an Edit/Write/MultiEdit adds to a
+    package.json: all it declares when the file isn't on disk, otherwise
+    those the file doesn't declare yet (whichever field they move to).
+    """
+    return {name: field for name, (field, _) in _added_declarations(payload).items()}
+
+
+def added_dependency_specs(payload):
+    """name -> version spec (None when it isn't a string) of the
+    dependencies added_dependencies() finds."""
+    return {name: spec for name, (_, spec) in _added_declarations(payload).items()}
+
+
+def _added_declarations(payload):
+    view = file_view(payload)
+    found = {}
+    for part in view.segments if view.segments is not None else [view.text]:
+        for name, field, spec in declarations(part):
+            found.setdefault(name, (field, spec))
+    if view.segments is not None or view.ranges is None or not found:
+        return found
+    file_path = payload.get("tool_input", {}).get("file_path", "")
+    old = read_file(os.path.join(payload.get("cwd", ""), file_path))
+    before = dependencies(old) if old else {}
+    return {name: declared for name, declared in found.items() if name not in before}
+
+
+def added_locked_packages(payload):
+    """(name, version) of each package a lockfile Write or Edit locks that
+    the lockfile on disk doesn't; empty when the change can't be seen as a
+    whole lockfile (an Edit of a file too big to apply it to) or doesn't
+    parse.
+    """
+    from claudia_lockfiles import lockfile_kind, parse_lockfile_text, read_lockfile
+
+    file_path = payload.get("tool_input", {}).get("file_path", "")
+    kind = lockfile_kind(file_path)
+    view = file_view(payload)
+    if kind is None or not view.whole_file:
+        return set()
+    try:
+        found = {(name, version) for name, version, _, _ in parse_lockfile_text(view.text, kind)}
+    except ValueError:
+        return set()
+    # Streamed from disk rather than through read_file(): lockfiles can be
+    # far bigger than it reads
+    try:
+        for name, version, _, _ in read_lockfile(os.path.join(payload.get("cwd", ""), file_path), kind):
+            found.discard((name, version))
+    except (OSError, ValueError):
+        pass
+    return found
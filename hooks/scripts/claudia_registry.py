@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Claudia: claudia_registry.py
+Shared loader for hook modules. Hook files are named like claudia-teach.py,
+so they can't be imported by module name; the registry loads them from
+explicit file paths (or the precompiled bundle, if the launcher installed
+one), caches specs and modules, records every load failure as a diagnostic
+instead of skipping silently, and times each load.
+"""
+
+import importlib.util
+import os
+import sys
+import time
+
+import claudia_bundle
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class HookRegistry:
+    """Loads hook modules by name (filename without .py) from scripts_dir."""
+
+    def __init__(self, scripts_dir=SCRIPTS_DIR):
+        self.scripts_dir = scripts_dir
+        self._specs = {}
+        self._modules = {}
+        # (hook name, message) for every load or run failure
+        self.diagnostics = []
+        # hook name -> seconds spent loading the module
+        self.timings = {}
+
+    def path_for(self, name):
+        return os.path.join(self.scripts_dir, f"{name}.py")
+
+    def spec(self, name):
+        """Return the cached module spec for a hook, building it on first use."""
+        spec = self._specs.get(name)
+        if spec is None:
+            path = self.path_for(name)
+            if not os.path.isfile(path):
+                raise ImportError(f"no hook module at {path}")
+            bundle = claudia_bundle.active()
+            if bundle is not None and bundle.scripts_dir == self.scripts_dir:
+                spec = bundle.spec(name, name.replace("-", "_"))
+            if spec is None:
+                spec = importlib.util.spec_from_file_location(name.replace("-", "_"), path)
+            self._specs[name] = spec
+        return spec
+
+    def load(self, name):
+        """Load (once) a hook module.
+
+        Returns:
+            the module, or None if it failed to load (recorded in diagnostics).
+        """
+        mod = self._modules.get(name)
+        if mod is not None:
+            return mod
+        start = time.perf_counter()
+        try:
+            spec = self.spec(name)
+            mod = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(mod)
+        except Exception as e:
+            self.report(name, f"failed to load: {type(e).__name__}: {e}")
+            return None
+        finally:
+            self.timings[name] = time.perf_counter() - start
+        self._modules[name] = mod
+        return mod
+
+    def is_loaded(self, name):
+        return name in self._modules
+
+    def report(self, name, message):
+        """Record a diagnostic for a hook."""
+        self.diagnostics.append((name, message))
+
+    def emit_diagnostics(self, stream=None):
+        """Write pending diagnostics to stderr and clear them.
+
+        Hooks exit 0 here, so stderr only shows in verbose/transcript mode:
+        visible to whoever is debugging, invisible otherwise.
+        With CLAUDIA_DEBUG set, module load times are written too.
+        """
+        stream = stream or sys.stderr
+        for name, message in self.diagnostics:
+            print(f"Claudia: {name} {message}", file=stream)
+        self.diagnostics = []
+        if os.environ.get("CLAUDIA_DEBUG"):
+            for name, seconds in self.timings.items():
+                print(f"Claudia: loaded {name} in {seconds * 1000:.1f}ms", file=stream)
+
+
+# Process-wide registry, shared by the dispatchers and the daemon
+REGISTRY = HookRegistry()
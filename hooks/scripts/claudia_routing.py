@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Claudia: claudia_routing.py
+Declarative routing table for the PreToolUse file checks: which files (and,
+for a few checks, which content) each check can possibly fire on.
+check-dispatch evaluates it once per payload, so a typical source edit only
+loads and runs the 2-3 checks that apply.
+
+Debug from the command line:
+    python3 claudia_routing.py src/app.tsx
+"""
+
+import os
+import re
+import sys
+
+# Route keys (a check runs if any positive key matches and no exclude does):
+#   all:        applies to every file
+#   extensions: lowercase file extensions
+#   basenames:  exact file basenames
+#   prefixes:   basename prefixes
+#   suffixes:   basename suffixes
+#   content_extensions + content: extensions that only apply when the
+#               content matches the regex (e.g. CSS-in-JS in components)
+#   exclude:    path substrings that skip the check entirely
+#   tiers:      rule tiers the check holds: "block" (security rules that stop
+#               the write) and/or "advise" (warnings); the planner in
+#               check-dispatch skips a check with no tier enabled
+#
+# Keep these in sync with the guards inside each check-*.py (the checks still
+# enforce them when run standalone); tests/test_routing.py verifies it.
+ROUTES = {
+    "check-secrets": {
+        "all": True,
+        "exclude": ['test', 'spec', 'fixture', 'mock', '.example', '.sample', '.md'],
+        "tiers": {"block", "advise"},
+    },
+    "check-practices": {
+        "all": True,
+        "tiers": {"advise"},
+    },
+    "check-deps": {
+        "suffixes": ("package.json",),
+        "basenames": {"package-lock.json", "npm-shrinkwrap.json", "yarn.lock", "pnpm-lock.yaml"},
+        "tiers": {"advise"},
+    },
+    "check-dockerfile": {
+        "basenames": {"Dockerfile"},
+        "prefixes": ("Dockerfile.",),
+        "suffixes": (".dockerfile",),
+        "tiers": {"advise"},
+    },
+    "check-git-hygiene": {
+        "all": True,
+        "tiers": {"block", "advise"},
+    },
+    "check-accessibility": {
+        "extensions": {'.html', '.htm', '.jsx', '.tsx', '.vue', '.svelte', '.astro'},
+        "exclude": ['.test.', '.spec.', '/test/', '/tests/', 'fixture', 'mock', '__test__'],
+        "tiers": {"advise"},
+    },
+    "check-license": {
+        "suffixes": ("package.json",),
+        "tiers": {"advise"},
+    },
+    "check-css": {
+        "extensions": {'.css', '.scss', '.sass', '.less', '.styl', '.pcss'},
+        "content_extensions": {'.tsx', '.jsx', '.vue', '.svelte', '.astro'},
+        "content": r'(?:styled|css`|className=|class=|<style)',
+        "tiers": {"advise"},
+    },
+}
+
+# Rule tiers each proactivity level runs. Low keeps only what blocks the
+# write; advisories are proactive mentoring, which low turns off.
+PROACTIVITY_TIERS = {
+    "low": frozenset({"block"}),
+    "moderate": frozenset({"block", "advise"}),
+    "high": frozenset({"block", "advise"}),
+}
+ALL_TIERS = PROACTIVITY_TIERS["high"]
+
+_content_patterns = {}
+
+
+def _content_pattern(route):
+    pattern = _content_patterns.get(route["content"])
+    if pattern is None:
+        pattern = _content_patterns[route["content"]] = re.compile(route["content"])
+    return pattern
+
+
+def route_matches(route, file_path, content=None):
+    """Whether a single route applies to file_path.
+
+    Args:
+        content: the text being written, or None to skip content prefilters
+            (content-dependent routes then count as matching).
+    """
+    if any(x in file_path for x in route.get("exclude", ())):
+        return False
+    if route.get("all"):
+        return True
+
+    basename = os.path.basename(file_path)
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext in route.get("extensions", ()):
+        return True
+    if basename in route.get("basenames", ()):
+        return True
+    if basename.startswith(tuple(route.get("prefixes", ()))):
+        return True
+    if basename.endswith(tuple(route.get("suffixes", ()))):
+        return True
+    if ext in route.get("content_extensions", ()):
+        return content is None or bool(_content_pattern(route).search(content))
+    return False
+
+
+def route(file_path, content=None):
+    """Names of the checks that can fire for file_path, in routing-table order."""
+    return [name for name, r in ROUTES.items() if route_matches(r, file_path, content)]
+
+
+def tiers_for(proactivity):
+    """Rule tiers to run at a proactivity level (unknown levels run everything)."""
+    return PROACTIVITY_TIERS.get(proactivity, ALL_TIERS)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("usage: claudia_routing.py FILE_PATH [FILE_PATH ...]", file=sys.stderr)
+        sys.exit(1)
+    for file_path in sys.argv[1:]:
+        names = route(file_path)
+        print(f"{file_path}:")
+        for name in names:
+            note = ""
+            r = ROUTES[name]
+            ext = os.path.splitext(file_path)[1].lower()
+            if ext in r.get("content_extensions", ()) and ext not in r.get("extensions", ()):
+                note = f"  (only if content matches {r['content']})"
+            print(f"  {name}{note}")
+        skipped = [name for name in ROUTES if name not in names]
+        if skipped:
+            print(f"  skipped: {', '.join(skipped)}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
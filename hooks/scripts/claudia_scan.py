@@ -0,0 +1,566 @@
+#!/usr/bin/env python3
+"""
+Claudia: claudia_scan.py
+Shared scanning engines: RuleSet for the PreToolUse file checks' regex rule
+tables, and KeywordMatcher for plain keyword lists (claudia-teach).
+
+A RuleSet compiles a
+check's rule list into one alternation, each rule's flags scoped to it, so
+the content is walked once per scan instead of once per rule.
+
+scan() reports, for every rule that matches, the offset of its first match:
+exactly what re.search(pattern, content, flags).start() gives for that rule
+alone. At each hit the pending rules are tried there one by one to see which
+matched; those drop out of the alternation and the search resumes at the hit,
+so a rule is never reported twice and rules that match inside an earlier hit
+are still found.
+
+Before the pass over a large text, each rule's required literal (the longest
+run of plain characters every match must contain, found from the parsed
+pattern) is looked up with `in`; rules whose literal is absent can't match
+and are left out of the alternation. Most large writes rule out most rules
+this way. Small texts skip it: parsing the patterns costs more than it saves.
+Case-insensitive literals are looked up in a case-folded copy made one
+window at a time (windows overlap by the longest literal), so a large write
+never gets a second full-size copy.
+
+The alternation is deliberately non-capturing: a capturing group per rule
+would make attribution free, but it stops re from skipping ahead on the
+rules' leading literals and makes the single pass slower than separate ones.
+
+LineIndex maps offsets to line numbers with a bisect over newline offsets,
+for checks that report where a hit is.
+
+Changed ranges: when an Edit or Write changes a file already on disk,
+diff_ranges() gives the (start, end) offsets of the lines it adds or changes
+(claudia_checks.file_view() applies edits to the file first), and
+scan(content, ranges=...) looks for line-scope rules only there: a hit must
+start inside a range, though it may run up to RANGE_CONTEXT_CHARS past its
+end (an empty catch block closing on the next line). Rules named in
+file_rules relate distant parts of the file (a negative pattern, ".*" under
+DOTALL) and still see all of it.
+
+Time budgets: some rules backtrack badly on the wrong input (`.*` under
+DOTALL, stacked lookaheads), and one such file must not use up the whole
+hook timeout. On texts of BUDGET_MIN_CHARS or more, scan() gets `budget`
+seconds in all: the single pass may use half of it; if it runs over, each
+rule still pending is searched alone with at most `rule_budget` seconds of
+what is left, and rules that run out are reported in ScanResult.skipped
+rather than as a hit or a miss. Budgets are enforced with SIGALRM (re checks
+for signals while it matches), so they only apply on the main thread of a
+platform with setitimer; elsewhere scans run unbounded. A RuleSet made with
+budgeted=False is never timed: for linear rules whose hits must block
+(check-secrets), where a skipped rule would let the write through.
+
+Segments: scan_segments() scans several texts (a MultiEdit's new_strings)
+as if laid end to end without joining them, so no copy is made and no match
+spans two of them.
+
+Verdicts: when a hook entry point sets verdict_cache (a
+claudia_verdicts.VerdictCache), scans of large texts are looked up there
+first and stored after, so a payload seen in an earlier hook run isn't
+scanned again.
+
+A KeywordMatcher is an Aho-Corasick automaton over a keyword list: one pass
+over the text finds every keyword at once, so its cost depends on the text,
+not on how many keywords there are. Matches are case-insensitive and
+whole-word, the same as re.search(r'\\b' + re.escape(keyword) + r'\\b', text,
+re.IGNORECASE) for ASCII keywords.
+"""
+
+import re
+import time
+
+try:
+    from re import _parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse as _sre_parse
+
+# Non-ASCII characters that IGNORECASE matches against an ASCII letter but
+# whose lower() isn't that letter (or, for U+0130, is two characters);
+# folded first so fold_case() keeps every offset
+_ASCII_FOLD = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s"})
+
+# Texts shorter than this skip the literal prefilter
+PREFILTER_MIN_CHARS = 16 * 1024
+# Characters case-folded at a time for case-insensitive literal lookups
+FOLD_WINDOW_CHARS = 256 * 1024
+
+# Characters a line-scope match may run past the end of its changed range
+RANGE_CONTEXT_CHARS = 1024
+
+# Seconds one scan() may take in all, and one rule searched alone
+SCAN_BUDGET = 1.5
+RULE_BUDGET = 0.25
+# Texts shorter than this scan without a budget (and without importing signal)
+BUDGET_MIN_CHARS = 2 * 1024
+
+# Verdict cache consulted by RuleSet.scan(), or None (the default: only hook
+# entry points turn it on, so library use and tests never touch the disk)
+verdict_cache = None
+
+# Flags a rule may carry, as the letters of a scoped (?flags:...) group
+_FLAG_LETTERS = (
+    (re.IGNORECASE, "i"),
+    (re.MULTILINE, "m"),
+    (re.DOTALL, "s"),
+    (re.VERBOSE, "x"),
+)
+_SCOPED_FLAGS = re.IGNORECASE | re.MULTILINE | re.DOTALL | re.VERBOSE
+
+
+def _scoped(pattern, flags):
+    if flags & ~_SCOPED_FLAGS:
+        raise ValueError(f"rule flags must be a combination of I, M, S and X: {pattern!r}")
+    letters = "".join(letter for flag, letter in _FLAG_LETTERS if flags & flag)
+    return f"(?{letters}:{pattern})" if letters else f"(?:{pattern})"
+
+
+def _literals(items):
+    """Literals one of which every match of the parsed items contains, or None."""
+    best = ""
+    run = []
+    branches = None
+    for op, av in items:
+        if op is _sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        if len(run) > len(best):
+            best = "".join(run)
+        run = []
+        if op is _sre_parse.BRANCH and branches is None:
+            alternatives = [_literals(branch) for branch in av[1]]
+            if all(alternatives):
+                branches = [lit for alts in alternatives for lit in alts]
+        elif op is _sre_parse.SUBPATTERN and branches is None and not av[1] and not av[2]:
+            branches = _literals(av[-1])
+    if len(run) > len(best):
+        best = "".join(run)
+    # Longer literals rule out more text: a group of alternatives beats a
+    # shorter run (as in `(?:color|border)\s*:`, where the run is ":")
+    if branches and min(map(len, branches)) > len(best):
+        return branches
+    return [best] if best else branches
+
+
+def required_literals(pattern, flags=0):
+    """Strings one of which must appear in any text pattern matches, or None.
+
+    With IGNORECASE the strings are lowercase and match against
+    fold_case(text); non-ASCII literals are not used there.
+    """
+    try:
+        parsed = _sre_parse.parse(pattern, flags)
+    except Exception:
+        return None
+    literals = _literals(parsed)
+    if literals and flags & re.IGNORECASE:
+        if not all(lit.isascii() for lit in literals):
+            return None
+        literals = [lit.lower() for lit in literals]
+    return literals
+
+
+def fold_case(text):
+    """Lowercase text the way IGNORECASE compares ASCII letters, same length."""
+    return text.translate(_ASCII_FOLD).lower()
+
+
+class LineIndex:
+    """Line numbers (1-based) for offsets into text."""
+
+    def __init__(self, text):
+        newlines = []
+        pos = text.find("\n")
+        while pos != -1:
+            newlines.append(pos)
+            pos = text.find("\n", pos + 1)
+        self._newlines = newlines
+
+    def line(self, offset):
+        from bisect import bisect_left
+
+        return bisect_left(self._newlines, offset) + 1
+
+    def line_start(self, line):
+        """Offset of the first character of line."""
+        return 0 if line <= 1 else self._newlines[line - 2] + 1
+
+
+def diff_ranges(old, new):
+    """(start, end) offsets of the lines of new that old doesn't have.
+
+    A line counts as unchanged if old has the same line anywhere, so moved
+    code isn't reported and the diff is one set lookup per line (difflib
+    alone takes longer to import than most scans take to run). Each range
+    covers whole lines, newline included; deleted lines add nothing.
+    """
+    seen = set(old.split("\n"))
+    ranges = []
+    pos = 0
+    for line in new.split("\n"):
+        end = pos + len(line) + 1
+        if line not in seen:
+            if ranges and ranges[-1][1] == pos:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((pos, end))
+        pos = end
+    if ranges and ranges[-1][1] > len(new):
+        ranges[-1] = (ranges[-1][0], len(new))
+    return ranges
+
+
+class ScanTimeout(Exception):
+    """A budgeted search ran out of time."""
+
+
+class _Deadline:
+    """Raise ScanTimeout in the block after `seconds` (no-op where unsupported)."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.active = False
+
+    def _expire(self, signum, frame):
+        if self.active:
+            raise ScanTimeout()
+
+    def __enter__(self):
+        import signal
+
+        if not hasattr(signal, "setitimer"):
+            return self
+        try:
+            self._handler = signal.signal(signal.SIGALRM, self._expire)
+        except ValueError:  # not the main thread
+            return self
+        self._started = time.monotonic()
+        self._outer = signal.setitimer(signal.ITIMER_REAL, self.seconds)[0]
+        self.active = True
+        return self
+
+    def __exit__(self, *exc):
+        if not self.active:
+            return False
+        import signal
+
+        # Disarm before cancelling, so a signal landing in between is ignored
+        self.active = False
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, self._handler)
+        if self._outer:
+            # Someone else's timer was running: give it back what's left
+            left = self._outer - (time.monotonic() - self._started)
+            signal.setitimer(signal.ITIMER_REAL, max(left, 0.001))
+        return False
+
+
+class ScanResult(dict):
+    """scan() hits (rule_id -> first-match offset), plus the rules skipped.
+
+    Attributes:
+        skipped: rule ids that ran out of time budget; neither hit nor miss.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.skipped = set()
+
+
+class RuleSet:
+    """A check's rules, scanned together.
+
+    Args:
+        rules: (rule_id, pattern) or (rule_id, pattern, flags) tuples. Patterns
+            must not use numbered backreferences or global inline flags
+            such as a leading (?i): give the flags in the tuple instead.
+        flags: flags for rules that don't give their own.
+        file_rules: ids of rules that look at the whole file even when
+            scan() is given changed ranges.
+        budgeted: False to ignore scan budgets, so no rule is ever skipped;
+            only for rules that can't backtrack.
+    """
+
+    def __init__(self, rules, flags=0, file_rules=(), budgeted=True):
+        self.ids = []
+        self._rules = []
+        self._alternatives = []
+        self._literals = None
+        for rule in rules:
+            rule_id, pattern = rule[0], rule[1]
+            rule_flags = rule[2] if len(rule) > 2 else flags
+            self.ids.append(rule_id)
+            self._rules.append((pattern, rule_flags))
+            self._alternatives.append(_scoped(pattern, rule_flags))
+        self._index = {rule_id: i for i, rule_id in enumerate(self.ids)}
+        self._file_rules = {self._index[rule_id] for rule_id in file_rules}
+        self.budgeted = budgeted
+        self._fingerprint = None
+        self._compiled = {}
+
+    def _pattern(self, pending):
+        """The alternation of the rules at indices pending (a sorted tuple)."""
+        pattern = self._compiled.get(pending)
+        if pattern is None:
+            pattern = self._compiled[pending] = re.compile("|".join(self._alternatives[i] for i in pending))
+        return pattern
+
+    def _rule(self, i):
+        pattern, flags = self._rules[i]
+        return re.compile(pattern, flags)
+
+    def _possible(self, content, pending):
+        """The rules in pending whose required literal appears in content."""
+        if self._literals is None:
+            self._literals = [
+                (required_literals(pattern, flags), bool(flags & re.IGNORECASE))
+                for pattern, flags in self._rules
+            ]
+        possible = []
+        folded_literals = {}
+        for i in pending:
+            literals, ignorecase = self._literals[i]
+            if literals is None or (not ignorecase and any(lit in content for lit in literals)):
+                possible.append(i)
+            elif ignorecase:
+                folded_literals[i] = literals
+        if folded_literals:
+            # One folded window at a time; each rule's literals looked up in it
+            overlap = max(len(lit) for lits in folded_literals.values() for lit in lits) - 1
+            start = 0
+            while folded_literals and start < len(content):
+                chunk = fold_case(content[start:start + FOLD_WINDOW_CHARS + overlap])
+                for i, literals in list(folded_literals.items()):
+                    if any(lit in chunk for lit in literals):
+                        possible.append(i)
+                        del folded_literals[i]
+                start += FOLD_WINDOW_CHARS
+            possible.sort()
+        return possible
+
+    def scan(self, content, rule_ids=None, ranges=None, budget=SCAN_BUDGET, rule_budget=RULE_BUDGET):
+        """First-match offset of every rule that matches content.
+
+        Args:
+            rule_ids: rules to look for (default: all of them).
+            ranges: (start, end) offsets to look for line-scope rules in, as
+                from diff_ranges(), or None for all of content.
+            budget: seconds the whole scan may take, or None for no limit.
+            rule_budget: seconds one rule may take when searched alone.
+
+        Returns:
+            ScanResult of rule_id -> offset, in the order the hits were found.
+        """
+        if not self.budgeted:
+            budget = None
+        if rule_ids is None:
+            pending = list(range(len(self.ids)))
+        else:
+            pending = sorted(self._index[r] for r in set(rule_ids))
+        key = None
+        cache = verdict_cache
+        if cache is not None:
+            from claudia_verdicts import VERDICT_MIN_CHARS, verdict_key
+
+            if len(content) >= VERDICT_MIN_CHARS:
+                key = verdict_key(self.fingerprint(), [self.ids[i] for i in pending], ranges, content)
+                cached = cache.get(key)
+                if cached is not None:
+                    hits = ScanResult()
+                    hits.update(cached)
+                    return hits
+        hits = self._scan(content, pending, ranges, budget, rule_budget)
+        # A verdict with skipped rules depends on how busy the machine was
+        if key is not None and not hits.skipped:
+            cache.put(key, hits)
+        return hits
+
+    def scan_segments(self, segments, rule_ids=None, budget=SCAN_BUDGET, rule_budget=RULE_BUDGET):
+        """scan() over several texts as if laid end to end, without joining them.
+
+        Offsets count from the start of the first segment: segment i starts at
+        the total length of the segments before it. No match spans two.
+
+        Returns:
+            ScanResult, as from scan().
+        """
+        bases = []
+        total = 0
+        for segment in segments:
+            bases.append(total)
+            total += len(segment)
+
+        hits = ScanResult()
+        pending = list(self.ids) if rule_ids is None else list(rule_ids)
+        started = time.monotonic()
+        for base, segment in zip(bases, segments):
+            if not pending:
+                break
+            # (a zero budget would disarm the timer rather than expire it)
+            left = None if budget is None else max(budget - (time.monotonic() - started), 0.001)
+            found = self.scan(segment, pending, budget=left, rule_budget=rule_budget)
+            for rule_id, offset in found.items():
+                hits[rule_id] = base + offset
+                pending.remove(rule_id)
+            # A rule skipped here may still turn up in a later segment
+            hits.skipped |= found.skipped
+        hits.skipped -= hits.keys()
+        return hits
+
+    def fingerprint(self):
+        """Digest of the rules (ids, patterns, flags, scopes), for cache keys."""
+        if self._fingerprint is None:
+            import hashlib
+
+            rules = [[rule_id, pattern, flags, i in self._file_rules]
+                     for i, (rule_id, (pattern, flags)) in enumerate(zip(self.ids, self._rules))]
+            self._fingerprint = hashlib.sha256(repr(rules).encode()).hexdigest()
+        return self._fingerprint
+
+    def _scan(self, content, pending, ranges, budget, rule_budget):
+        whole = [(0, len(content))]
+        if ranges is None:
+            groups = [(pending, whole)]
+        else:
+            groups = [
+                ([i for i in pending if i in self._file_rules], whole),
+                ([i for i in pending if i not in self._file_rules], ranges),
+            ]
+        # (pending rules, spans to look in) with anything ruled out dropped
+        groups = [
+            (self._possible(content, rules) if _span_chars(spans) >= PREFILTER_MIN_CHARS else rules, spans)
+            for rules, spans in groups
+            if rules and spans
+        ]
+        hits = ScanResult()
+        if budget is None or sum(_span_chars(spans) for _, spans in groups) < BUDGET_MIN_CHARS:
+            for rules, spans in groups:
+                for start, end in spans:
+                    self._scan_pass(content, rules, hits, start, end)
+            return hits
+
+        started = time.monotonic()
+        try:
+            with _Deadline(budget / 2):
+                for rules, spans in groups:
+                    for start, end in spans:
+                        self._scan_pass(content, rules, hits, start, end)
+        except ScanTimeout:
+            # Hits so far stand; each rule left gets its own search and budget
+            for rules, spans in groups:
+                for i in list(rules):
+                    left = budget - (time.monotonic() - started)
+                    try:
+                        if left <= 0:
+                            raise ScanTimeout()
+                        with _Deadline(min(rule_budget, left)):
+                            offset = self._search_alone(content, i, spans)
+                    except ScanTimeout:
+                        hits.skipped.add(self.ids[i])
+                        continue
+                    if offset is not None:
+                        hits[self.ids[i]] = offset
+        return hits
+
+    def _scan_pass(self, content, pending, hits, start, end):
+        """The single pass over one span: add hits starting in [start, end),
+        removing each rule found from pending."""
+        pos = start
+        endpos = min(end + RANGE_CONTEXT_CHARS, len(content))
+        while pending:
+            m = self._pattern(tuple(pending)).search(content, pos, endpos)
+            if m is None or m.start() >= end:
+                break
+            pos = m.start()
+            # No pending rule matches before pos; report every one matching at it
+            matched = [i for i in pending if self._rule(i).match(content, pos, endpos)]
+            for i in matched:
+                hits[self.ids[i]] = pos
+                pending.remove(i)
+
+    def _search_alone(self, content, i, spans):
+        """Offset of rule i's first hit in spans, or None."""
+        rule = self._rule(i)
+        for start, end in spans:
+            m = rule.search(content, start, min(end + RANGE_CONTEXT_CHARS, len(content)))
+            if m and m.start() < end:
+                return m.start()
+        return None
+
+
+def _span_chars(spans):
+    return sum(end - start for start, end in spans)
+
+
+def _is_word(ch):
+    """Whether ch is a word character, as a regex word boundary sees it."""
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    """Case-insensitive whole-word search for many keywords in one pass.
+
+    Args:
+        keywords: keyword strings; find() reports them by index in this list.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = list(keywords)
+        # Trie over the case-folded keywords: per-state transitions, failure
+        # links and the keywords (index, length) that end in each state
+        goto = [{}]
+        out = [[]]
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for ch in fold_case(keyword):
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = goto[state][ch] = len(goto)
+                    goto.append({})
+                    out.append([])
+                state = next_state
+            out[state].append((index, len(keyword)))
+
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for ch, next_state in goto[state].items():
+                queue.append(next_state)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[next_state] = goto[f].get(ch, 0)
+                # A state also ends every keyword its failure state ends
+                out[next_state] = out[next_state] + out[fail[next_state]]
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def find(self, text):
+        """First whole-word occurrence of every keyword found in text.
+
+        Returns:
+            dict of keyword index -> offset, in keyword-list order.
+        """
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        found = {}
+        state = 0
+        for end, ch in enumerate(fold_case(text), 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            for index, length in out[state]:
+                if index in found:
+                    continue
+                start = end - length
+                # \b on both sides: a word/non-word change, judged on text itself
+                before = start > 0 and _is_word(text[start - 1])
+                after = end < len(text) and _is_word(text[end])
+                if before != _is_word(text[start]) and after != _is_word(text[end - 1]):
+                    found[index] = start
+        return dict(sorted(found.items()))
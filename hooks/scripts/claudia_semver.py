@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Claudia: claudia_semver.py
+npm semver: version ordering and range evaluation, for the advisory index
+(claudia_advisories) and the version specs check-deps reads off package.json.
+
+version_key() turns a version into a tuple that sorts the way npm sorts
+versions (a prerelease before its release, numeric identifiers before
+alphanumeric ones, build metadata ignored). parse_range() turns a range into
+intervals of those keys: npm's grammar (||, hyphen ranges, ^, ~, x-ranges,
+comparators) plus the comma-separated comparators GitHub advisories use.
+Both are cached (functools.lru_cache): an audit asks about the same few
+thousand versions and ranges over and over.
+
+Prerelease versions are ordered, not filtered: ">=1.0.0" admits
+"2.0.0-beta" here, where npm would only install it when asked to. For
+deciding whether a version falls in an advisory's range, that's the
+answer wanted.
+"""
+
+import functools
+import re
+
+# Keys below and above every version's
+MIN_KEY = (-1,)
+MAX_KEY = (float("inf"),)
+
+_VERSION = re.compile(
+    r"\s*[v=]*\s*(\d+)\.(\d+)\.(\d+)(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?\s*$"
+)
+# A version any of whose parts may be missing or a wildcard
+_PARTIAL = re.compile(
+    r"[v=]*(\d+|[xX*])?(?:\.(\d+|[xX*]))?(?:\.(\d+|[xX*]))?(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?$"
+)
+_HYPHEN = re.compile(r"\s*(\S+)\s+-\s+(\S+)\s*$")
+_OPERATOR = re.compile(r"(<=|>=|<|>|=|\^|~>?)?(.*)")
+_ALL = (MIN_KEY, True, MAX_KEY, False)
+
+
+def _key(major, minor, patch, pre=None):
+    if pre is None:
+        return (major, minor, patch, 1, ())
+    ids = tuple((0, int(p)) if p.isdigit() else (1, p) for p in pre.split("."))
+    return (major, minor, patch, 0, ids)
+
+
+def _before(major, minor, patch):
+    """Key just below every version of major.minor.patch (its "-0")."""
+    return (major, minor, patch, 0, ())
+
+
+@functools.lru_cache(maxsize=16384)
+def version_key(version):
+    """Sort key of a version, or None if it isn't one."""
+    m = _VERSION.match(version) if isinstance(version, str) else None
+    if m is None:
+        return None
+    major, minor, patch, pre = m.groups()
+    return _key(int(major), int(minor), int(patch), pre)
+
+
+def format_key(key):
+    """The version a key (from version_key() or a range bound) stands for."""
+    text = ".".join(str(part) for part in key[:3])
+    if key[3] == 0 and key[4]:
+        text += "-" + ".".join(str(part) for _, part in key[4])
+    return text
+
+
+def _comparator(text):
+    """(lo, lo_inclusive, hi, hi_inclusive) of one comparator, or None."""
+    operator, version = _OPERATOR.match(text).groups()
+    m = _PARTIAL.match(version)
+    if m is None:
+        return None
+    parts = [None if p is None or not p.isdigit() else int(p) for p in m.groups()[:3]]
+    pre = m.group(4)
+    # Parts after a wildcard are wildcards too (1.x.3 is 1.x)
+    for i in range(1, 3):
+        if parts[i - 1] is None:
+            parts[i] = None
+    major, minor, patch = parts
+    if major is None:
+        # *, x, or a bound on nothing; "<*" and ">*" admit nothing
+        return _ALL if operator in (None, "=", ">=", "<=", "^", "~", "~>") else None
+    floor = _key(major, minor or 0, patch or 0, pre if patch is not None else None)
+    if minor is None:
+        ceiling = _before(major + 1, 0, 0)
+    elif patch is None:
+        ceiling = _before(major, minor + 1, 0)
+    else:
+        ceiling = None  # a full version: bounds are the version itself
+    if operator in (None, "="):
+        return (floor, True, floor, True) if ceiling is None else (floor, True, ceiling, False)
+    if operator == ">=":
+        return (floor, True, MAX_KEY, False)
+    if operator == ">":
+        return (floor, False, MAX_KEY, False) if ceiling is None else (ceiling, True, MAX_KEY, False)
+    if operator == "<":
+        return (MIN_KEY, True, floor if ceiling is None else _before(*floor[:3]), False)
+    if operator == "<=":
+        return (MIN_KEY, True, floor, True) if ceiling is None else (MIN_KEY, True, ceiling, False)
+    if operator == "^":
+        if major > 0 or minor is None:
+            return (floor, True, _before(major + 1, 0, 0), False)
+        if minor > 0 or patch is None:
+            return (floor, True, _before(0, minor + 1, 0), False)
+        return (floor, True, _before(0, 0, patch + 1), False)
+    # ~ and ~>
+    return (floor, True, ceiling or _before(major, minor + 1, 0), False)
+
+
+def _intersect(a, b):
+    lo, lo_inclusive = max((a[0], not a[1]), (b[0], not b[1]))
+    hi, hi_inclusive = min((a[2], a[3]), (b[2], b[3]))
+    interval = (lo, not lo_inclusive, hi, hi_inclusive)
+    if lo > hi or (lo == hi and not (interval[1] and interval[3])):
+        return None
+    return interval
+
+
+def _hyphen(low, high):
+    lo = _comparator(">=" + low)
+    hi = _comparator("<=" + high)
+    return _intersect(lo, hi) if lo and hi else None
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_range(spec):
+    """Intervals (lo, lo_inclusive, hi, hi_inclusive) of version keys that
+    make up a range, in the order its alternatives come; None if it isn't a
+    semver range (a tag, a URL, a path).
+    """
+    intervals = []
+    for alternative in spec.split("||"):
+        m = _HYPHEN.match(alternative)
+        if m:
+            interval = _hyphen(*m.groups())
+            if interval is not None:
+                intervals.append(interval)
+            continue
+        # Operators may be spaced from their version (">= 1.2.3")
+        alternative = re.sub(r"(<=|>=|<|>|=|\^|~>?)\s+", r"\1", alternative)
+        interval = _ALL
+        for text in alternative.replace(",", " ").split():
+            bound = _comparator(text)
+            if bound is None:
+                return None
+            interval = _intersect(interval, bound)
+            if interval is None:
+                break
+        if interval is not None:
+            intervals.append(interval)
+    return tuple(intervals)
+
+
+def contains(interval, key):
+    """Whether an interval from parse_range() holds a version key."""
+    lo, lo_inclusive, hi, hi_inclusive = interval
+    return (lo < key or (lo_inclusive and lo == key)) and (key < hi or (hi_inclusive and key == hi))
+
+
+def overlaps(a, b):
+    """Whether two intervals from parse_range() share a version."""
+    return _intersect(a, b) is not None
+
+
+@functools.lru_cache(maxsize=16384)
+def satisfies(version, spec):
+    """Whether version is in the range spec (False if either is invalid)."""
+    key = version_key(version)
+    intervals = parse_range(spec)
+    if key is None or not intervals:
+        return False
+    return any(contains(interval, key) for interval in intervals)
+
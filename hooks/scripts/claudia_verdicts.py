@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Claudia: claudia_verdicts.py
+Persistent cache of RuleSet scan verdicts, so a payload seen before (Claude
+retrying a blocked Write, parallel tool calls carrying the same snippet)
+skips the scan. claudia_scan consults it for texts of VERDICT_MIN_CHARS or
+more once a hook entry point has switched it on (claudia_checks.run() and
+check-dispatch do); smaller texts scan faster than a cache lookup.
+
+A verdict is a scan's rule_id -> offset hits. It is keyed by a SHA-256 over
+the cache format, the Python version, the plugin version and a digest of the
+scan engine's source (so an upgrade, or an edited claudia_scan, never
+serves verdicts the old code reached), the rule set's patterns and flags,
+the rules asked for (which is where a check's file-path class shows up:
+test files and theme files skip rules) and the changed ranges, and the
+content. Verdicts with rules skipped over their time budget are never
+stored.
+
+Entries are small JSON files under ~/.claude/claudia-verdicts/, one per key,
+written atomically. A hit touches its file, so mtimes order entries by last
+use; eviction drops entries unused for MAX_AGE_DAYS, then the least recently
+used until the directory is under MAX_BYTES. It runs after roughly one store
+in EVICT_EVERY (chosen by key, so no shared counter is needed).
+
+Lookups write nothing but the hit's mtime. Inspect or empty the cache from
+the command line:
+    python3 claudia_verdicts.py stats
+    python3 claudia_verdicts.py clear
+"""
+
+import json
+import os
+import sys
+import time
+
+# Texts shorter than this are scanned without consulting the cache
+VERDICT_MIN_CHARS = 64 * 1024
+# Bump when the entry format or key changes
+CACHE_FORMAT = 1
+MAX_BYTES = 1024 * 1024
+MAX_AGE_DAYS = 7
+# Evict after about one store in this many
+EVICT_EVERY = 16
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PACKAGE_JSON = os.path.join(SCRIPTS_DIR, "..", "..", "package.json")
+
+# Plugin version and scan engine digest, worked out once per process
+_code_version = None
+
+
+def verdict_dir():
+    return os.path.expanduser("~/.claude/claudia-verdicts")
+
+
+def code_version():
+    """The plugin version and a digest of claudia_scan's source: what the
+    verdicts depend on beyond the rules themselves."""
+    global _code_version
+    if _code_version is None:
+        import hashlib
+
+        try:
+            with open(PACKAGE_JSON) as f:
+                version = str(json.load(f).get("version"))
+        except (OSError, ValueError, AttributeError):
+            version = None
+        try:
+            with open(os.path.join(SCRIPTS_DIR, "claudia_scan.py"), "rb") as f:
+                engine = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            engine = None
+        _code_version = [version, engine]
+    return _code_version
+
+
+def verdict_key(fingerprint, rule_ids, ranges, content):
+    """Cache key for scanning content with a rule set (see module docstring)."""
+    import hashlib
+
+    digest = hashlib.sha256()
+    header = [CACHE_FORMAT, sys.version, code_version(), fingerprint, rule_ids, ranges]
+    digest.update(json.dumps(header).encode())
+    digest.update(content.encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+
+class VerdictCache:
+    """Size- and age-bounded LRU of scan verdicts in a directory.
+
+    Args:
+        directory: where entries live (default ~/.claude/claudia-verdicts).
+        max_bytes: total entry size eviction keeps the directory under.
+        max_age: seconds since last use after which an entry is evicted.
+    """
+
+    def __init__(self, directory=None, max_bytes=MAX_BYTES, max_age=MAX_AGE_DAYS * 86400):
+        self.directory = directory or verdict_dir()
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        """The verdict stored under key, or None. A hit is touched, for LRU."""
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                verdict = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            verdict = None
+        return verdict if isinstance(verdict, dict) else None
+
+    def put(self, key, verdict):
+        """Store verdict (a JSON-serializable dict) under key."""
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(verdict, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError):
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return
+        if int(key[:8], 16) % EVICT_EVERY == 0:
+            self.evict()
+
+    def _entries(self):
+        """(mtime, size, path) of every entry, least recently used first."""
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(".json"):
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+        except OSError:
+            pass
+        entries.sort()
+        return entries
+
+    def evict(self):
+        """Drop expired entries, then the least recently used over max_bytes.
+
+        Returns:
+            number of entries removed.
+        """
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        cutoff = time.time() - self.max_age
+        removed = 0
+        for mtime, size, path in entries:
+            if mtime >= cutoff and total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def stats(self):
+        """Entry count and total bytes."""
+        entries = self._entries()
+        return {"entries": len(entries), "bytes": sum(size for _, size, _ in entries)}
+
+    def clear(self):
+        """Remove every entry."""
+        for _, _, path in self._entries():
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    cache = VerdictCache()
+    if command == "stats":
+        stats = cache.stats()
+        print(f"{cache.directory}:")
+        print(f"  entries: {stats['entries']} ({stats['bytes']} of {cache.max_bytes} bytes)")
+    elif command == "clear":
+        cache.clear()
+        print(f"Claudia: cleared {cache.directory}")
+    else:
+        print("usage: claudia_verdicts.py [stats|clear]", file=sys.stderr)
+        sys.exit(1)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Claudia: claudia_warm.py
+Session warm-up, so the first edit of a session hits warm data instead of
+doing setup work inside the PreToolUse budget. claudia-session-tips.py
+starts it in the background at SessionStart (`claudia_warm.py warm <cwd>`):
+- project snapshot: resolved project key and merged user config for cwd
+  (claudia_config.save_snapshot);
+- bytecode: recompiles hook modules whose cache is missing or stale
+  (claudia_build; the bundle is only built at install time, since running
+  hooks may be reading it);
+- rule tables: not here. Compiled patterns only outlive the process that
+  compiles them, so without the daemon each hook run compiles the rules it
+  uses. With the daemon enabled, it runs warm_checks() after preloading
+  hooks and keeps the compiled RuleSets for every request.
+"""
+
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+
+# Representative file-check payloads, one per routed file type
+WARM_FILES = {
+    "src/app.js": "const x = eval(input); console.log(x); try { run() } catch (e) {}\n",
+    "src/App.tsx": '<div className="app" onClick={go}><img src="a.png" /><input type="text" /></div>\n',
+    "index.html": '<button><svg></svg></button><style>.a { color: red !important; }</style>\n',
+    "styles.css": ".a .b .c .d { margin: 13px !important; z-index: 9999; }\n",
+    "package.json": '{"license": "MIT", "dependencies": {"moment": "^2.0.0", "left-pad": "1.0.0"}}\n',
+    "Dockerfile": "FROM node:latest\nENV API_KEY=abc\nRUN npm install\n",
+    "config/settings.py": 'password = "hunter2hunter2"\nDEBUG = True\n',
+}
+
+
+# --- SessionStart Warm-up ---
+
+def warm_checks():
+    """Run every file check over WARM_FILES so their rule tables get compiled
+    in this process (the daemon's; see the module docstring)."""
+    from claudia_checks import extract_content
+    from claudia_registry import REGISTRY
+    from claudia_routing import route
+
+    for file_path, content in WARM_FILES.items():
+        payload = {"session_id": "warm", "tool_name": "Write",
+                   "tool_input": {"file_path": file_path, "content": content}}
+        for name in route(file_path, extract_content("Write", payload["tool_input"])):
+            mod = REGISTRY.load(name)
+            if mod is None:
+                continue
+            try:
+                mod.check(payload, set())
+            except Exception:
+                pass
+
+
+def warm_bytecode():
+    """Recompile hook modules whose bytecode is missing or stale."""
+    import claudia_build
+    claudia_build.compile_hooks(SCRIPTS_DIR)
+
+
+def warm(cwd):
+    """Everything the first edit in cwd will need. Each step is best-effort."""
+    from claudia_config import save_snapshot
+
+    try:
+        os.chdir(cwd)
+        save_snapshot(cwd)
+    except OSError:
+        pass
+    try:
+        warm_bytecode()
+    except Exception:
+        pass
+
+
+def spawn(cwd):
+    """Start warm(cwd) in a detached background process."""
+    try:
+        import subprocess
+        subprocess.Popen(
+            [sys.executable, "-I", "-S", os.path.abspath(__file__), "warm", cwd],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            start_new_session=True,
+        )
+    except OSError:
+        pass
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "warm":
+        warm(sys.argv[2])
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Claudia: hook-importtime.py
+Startup budget report for the hooks. Runs each hook through claudia-hook.py
+with a representative payload, under the default launch (`python3`) and the
+isolated launch hooks.json uses (`python3 -I -S`), and reports:
+
+  import ms   median sum of `-X importtime` self times (stdlib + shared modules)
+  wall ms     median end-to-end run time, including hook modules loaded by
+              file path, which importtime does not list
+  top         the most expensive imports
+
+Usage:
+    python3 scripts/hook-importtime.py                  # report
+    python3 scripts/hook-importtime.py --save before.json
+    python3 scripts/hook-importtime.py --compare before.json
+    python3 scripts/hook-importtime.py --scripts-dir /path/to/hooks/scripts
+
+Runs with a throwaway HOME, so your config, state, and daemon are untouched.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+
+DEFAULT_SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "hooks", "scripts")
+
+LAUNCH_MODES = {
+    "default": [],
+    "isolated": ["-I", "-S"],
+}
+
+# Hook name -> representative payload (the common, non-blocking path)
+HOOKS = {
+    "check-dispatch": {
+        "session_id": "importtime", "tool_name": "Write",
+        "tool_input": {"file_path": "/app/src/App.tsx", "content": "export const App = () => <div />;\n"},
+    },
+    "claudia-stop-dispatch": {
+        "session_id": "importtime", "stop_hook_active": False,
+    },
+    "claudia-prompt-coach": {
+        "session_id": "importtime", "prompt": "add a settings page",
+    },
+    "claudia-compact-tip": {
+        "session_id": "importtime",
+    },
+    "claudia-session-tips": {
+        "session_id": "importtime", "source": "startup",
+    },
+}
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_importtime(stderr):
+    """Return [(module, self_us, depth)] from `-X importtime` output."""
+    rows = []
+    for line in stderr.splitlines():
+        m = IMPORT_LINE.match(line)
+        if m:
+            rows.append((m.group(4), int(m.group(1)), len(m.group(3)) // 2))
+    return rows
+
+
+def run_hook(scripts_dir, hook, flags, env, importtime=False):
+    cmd = [sys.executable] + flags
+    if importtime:
+        cmd += ["-X", "importtime"]
+    cmd += [os.path.join(scripts_dir, "claudia-hook.py"), hook]
+    start = time.perf_counter()
+    result = subprocess.run(
+        cmd, input=json.dumps(HOOKS[hook]), capture_output=True, text=True, env=env, timeout=30,
+    )
+    return time.perf_counter() - start, result.stderr
+
+
+def seed_update_check(home, scripts_dir):
+    """Mark today's npm update check as done, so session-tips timings measure
+    startup rather than `npm view` (up to its 5s timeout when offline)."""
+    try:
+        with open(os.path.join(scripts_dir, "..", "..", "package.json")) as f:
+            installed = json.load(f).get("version", "0.0.0")
+    except (OSError, ValueError):
+        installed = "0.0.0"
+    claude_dir = os.path.join(home, ".claude")
+    os.makedirs(claude_dir, exist_ok=True)
+    with open(os.path.join(claude_dir, "claudia_update_check.json"), "w") as f:
+        json.dump({"last_check_date": date.today().isoformat(), "latest": installed}, f)
+
+
+def measure(scripts_dir, runs, top):
+    """Measure every hook under every launch mode.
+
+    Returns:
+        {mode: {hook: {"import_ms", "wall_ms", "modules", "top"}}}
+    """
+    report = {}
+    with tempfile.TemporaryDirectory() as home:
+        seed_update_check(home, scripts_dir)
+        env = dict(os.environ, HOME=home)
+        env.pop("CLAUDIA_DEBUG", None)
+        for mode, flags in LAUNCH_MODES.items():
+            report[mode] = {}
+            for hook in HOOKS:
+                # Warm-up run so bytecode caches exist and first-run state is written
+                run_hook(scripts_dir, hook, flags, env)
+                samples = [parse_importtime(run_hook(scripts_dir, hook, flags, env, importtime=True)[1])
+                           for _ in range(runs)]
+                totals = [sum(r[1] for r in rows) for rows in samples]
+                # Report the module breakdown of the median run
+                rows = samples[totals.index(sorted(totals)[len(totals) // 2])]
+                walls = [run_hook(scripts_dir, hook, flags, env)[0] for _ in range(runs)]
+                slowest = sorted(rows, key=lambda r: r[1], reverse=True)[:top]
+                report[mode][hook] = {
+                    "import_ms": round(statistics.median(totals) / 1000, 2),
+                    "wall_ms": round(statistics.median(walls) * 1000, 2),
+                    "modules": len(rows),
+                    "top": [[name, round(us / 1000, 2)] for name, us, _ in slowest],
+                }
+    return report
+
+
+def delta(new, old):
+    if old is None:
+        return ""
+    diff = new - old
+    return f" ({'+' if diff >= 0 else ''}{diff:.1f})"
+
+
+def print_report(report, baseline=None):
+    for mode, hooks in report.items():
+        print(f"\n{mode} launch: python3 {' '.join(LAUNCH_MODES.get(mode, []))}".rstrip())
+        print(f"  {'hook':<24} {'modules':>7} {'import ms':>16} {'wall ms':>16}")
+        for hook, stats in hooks.items():
+            old = (baseline or {}).get(mode, {}).get(hook, {})
+            imp = f"{stats['import_ms']:.1f}{delta(stats['import_ms'], old.get('import_ms'))}"
+            wall = f"{stats['wall_ms']:.1f}{delta(stats['wall_ms'], old.get('wall_ms'))}"
+            print(f"  {hook:<24} {stats['modules']:>7} {imp:>16} {wall:>16}")
+            top = ", ".join(f"{name} {ms:.1f}" for name, ms in stats["top"])
+            print(f"    top: {top}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-hook import cost and startup time.")
+    parser.add_argument("--scripts-dir", default=DEFAULT_SCRIPTS_DIR, help="hooks/scripts directory to measure")
+    parser.add_argument("--runs", type=int, default=7, help="timed runs per hook and mode (medians are reported)")
+    parser.add_argument("--top", type=int, default=5, help="slowest imports to list per hook")
+    parser.add_argument("--save", metavar="FILE", help="write the report as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="show deltas against a saved report")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    report = measure(os.path.abspath(args.scripts_dir), args.runs, args.top)
+    print_report(report, baseline)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
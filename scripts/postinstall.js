@@ -114,6 +114,18 @@ try {
   aliasStatus = 'failed';
 }
 
+// ── Precompile hooks: bytecode + bundle, so no hook compiles at startup ──
+
+try {
+  require('child_process').spawnSync(
+    'python3',
+    ['-I', '-S', path.join(pluginDir, 'hooks', 'scripts', 'claudia_build.py'), '--bundle', '--quiet'],
+    { stdio: 'ignore', timeout: 30000 }
+  );
+} catch (e) {
+  // Optional: hooks compile on first run without it
+}
+
 // ── Build output ────────────────────────────────────────────────
 
 const setupMsg = aliasStatus === 'added'
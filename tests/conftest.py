@@ -51,6 +51,14 @@ def _run_hook(script_name, stdin_data, env, timeout=10):
     return result.returncode, result.stdout, result.stderr
 
 
+def load_check(name):
+    """Load a check-*.py module in-process (for its pure check() API)."""
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
+    from claudia_registry import REGISTRY
+    return REGISTRY.load(name)
+
+
 @pytest.fixture
 def run_hook(hook_env):
     """Fixture that returns a callable to run hook scripts."""
@@ -0,0 +1,144 @@
+"""Tests for claudia_advisories.py — offline vulnerability advisory index."""
+
+import json
+import subprocess
+import sys
+import zipfile
+
+import pytest
+
+from conftest import SCRIPTS_DIR
+
+sys.path.insert(0, SCRIPTS_DIR)
+import claudia_advisories
+from claudia_advisories import advisory_entries, range_vulnerabilities, read_advisories, vulnerabilities, write_index
+
+
+def osv(advisory_id, name, events=None, versions=None, ecosystem="npm", **fields):
+    affected = {"package": {"ecosystem": ecosystem, "name": name}}
+    if events is not None:
+        affected["ranges"] = [{"type": "SEMVER", "events": events}]
+    if versions is not None:
+        affected["versions"] = versions
+    return {"id": advisory_id, "summary": f"{advisory_id} summary", "affected": [affected], **fields}
+
+
+RECORDS = [
+    osv("A-1", "pkg", [{"introduced": "0"}, {"fixed": "1.2.0"}]),
+    osv("A-2", "pkg", [{"introduced": "1.0.0"}, {"fixed": "1.1.0"}, {"introduced": "2.0.0"}, {"last_affected": "2.0.5"}]),
+    osv("A-3", "pkg", [{"introduced": "3.0.0"}]),
+    osv("A-4", "bad", versions=["0.1.1"]),
+    osv("A-5", "pkg", [{"introduced": "0"}], withdrawn="2024-01-01T00:00:00Z"),
+    osv("A-6", "pkg", [{"introduced": "0"}], ecosystem="PyPI"),
+    {
+        "ghsa_id": "GHSA-rest", "summary": "From the REST API",
+        "vulnerabilities": [{"package": {"ecosystem": "npm", "name": "rest-pkg"}, "vulnerable_version_range": ">= 1.0.0, < 1.4.2"}],
+    },
+]
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    path = tmp_path / "advisories.tsv"
+    write_index(RECORDS, str(path))
+    monkeypatch.setattr(claudia_advisories, "user_index", lambda: str(path))
+    monkeypatch.setattr(claudia_advisories, "_packages", {})
+    return path
+
+
+class TestImport:
+
+    def test_osv_events(self):
+        assert [entry[0] for _, entry in advisory_entries(RECORDS[1])] == [">=1.0.0 <1.1.0 || >=2.0.0 <=2.0.5"]
+        assert [entry[0] for _, entry in advisory_entries(RECORDS[0])] == ["<1.2.0"]
+        assert [entry[0] for _, entry in advisory_entries(RECORDS[2])] == [">=3.0.0"]
+
+    def test_unsorted_events(self):
+        record = osv("A", "pkg", [{"fixed": "2.0.0"}, {"introduced": "1.5.0"}])
+        assert [entry[0] for _, entry in advisory_entries(record)] == [">=1.5.0 <2.0.0"]
+
+    def test_skipped_records(self):
+        assert list(advisory_entries(RECORDS[4])) == []
+        assert list(advisory_entries(RECORDS[5])) == []
+        assert list(advisory_entries(osv("A", "pkg", [{"introduced": "0"}, {"fixed": "abc123"}]))) == []
+
+    def test_rest_api_record(self):
+        assert list(advisory_entries(RECORDS[6])) == [
+            ("rest-pkg", [">= 1.0.0, < 1.4.2", "GHSA-rest", "From the REST API"]),
+        ]
+
+    def test_sources(self, tmp_path):
+        (tmp_path / "dump" / "a").mkdir(parents=True)
+        (tmp_path / "dump" / "a" / "A-1.json").write_text(json.dumps(RECORDS[0]))
+        (tmp_path / "dump" / "list.json").write_text(json.dumps(RECORDS[1:3]))
+        with zipfile.ZipFile(tmp_path / "all.zip", "w") as archive:
+            archive.writestr("A-4.json", json.dumps(RECORDS[3]))
+        assert sorted(r["id"] for r in read_advisories(str(tmp_path / "dump"))) == ["A-1", "A-2", "A-3"]
+        assert [r["id"] for r in read_advisories(str(tmp_path / "all.zip"))] == ["A-4"]
+
+
+class TestLookup:
+
+    @pytest.mark.parametrize("name,version,expected", [
+        ("pkg", "0.9.0", ["A-1"]),
+        ("pkg", "1.0.0", ["A-1", "A-2"]),
+        ("pkg", "1.1.0", ["A-1"]),
+        ("pkg", "1.2.0", []),
+        ("pkg", "2.0.5", ["A-2"]),
+        ("pkg", "2.0.6", []),
+        ("pkg", "9.0.0", ["A-3"]),
+        ("bad", "0.1.1", ["A-4"]),
+        ("bad", "0.1.2", []),
+        ("rest-pkg", "1.4.1", ["GHSA-rest"]),
+        ("unknown", "1.0.0", []),
+        ("pkg", "not-semver", []),
+    ])
+    def test_vulnerabilities(self, index, name, version, expected):
+        assert [advisory_id for advisory_id, _ in vulnerabilities(name, version)] == expected
+
+    @pytest.mark.parametrize("name,spec,expected", [
+        ("pkg", "^1.0.0", ["A-1", "A-2"]),
+        ("pkg", "^1.2.0", []),
+        ("pkg", "~2.0.5", ["A-2"]),
+        ("pkg", "2.0.6 - 2.9.9", []),
+        ("pkg", ">=2.1.0", ["A-3"]),
+        ("pkg", "^1.1.0 || ^3.0.0", ["A-1", "A-3"]),
+        ("bad", "~0.1.0", ["A-4"]),
+        ("pkg", "latest", []),
+        ("unknown", "^1.0.0", []),
+    ])
+    def test_range_vulnerabilities(self, index, name, spec, expected):
+        assert [advisory_id for advisory_id, _ in range_vulnerabilities(name, spec)] == expected
+
+    def test_shipped_protobufjs(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(claudia_advisories, "user_index", lambda: str(tmp_path / "none.tsv"))
+        monkeypatch.setattr(claudia_advisories, "_packages", {})
+        assert vulnerabilities("protobufjs", "6.11.2")
+        assert vulnerabilities("protobufjs", "7.2.5") == []
+
+    def test_rebuilt_index_seen(self, index):
+        assert vulnerabilities("pkg", "9.0.0")
+        write_index(RECORDS[:2], str(index))
+        assert vulnerabilities("pkg", "9.0.0") == []
+        assert [advisory_id for advisory_id, _ in vulnerabilities("pkg", "1.0.0")] == ["A-1", "A-2"]
+
+    def test_many_overlapping_intervals(self, tmp_path, monkeypatch):
+        # Nested ranges: every one of them holds the version asked about
+        records = [osv(f"N-{i:03}", "nested", [{"introduced": f"{i}.0.0"}, {"fixed": f"{200 - i}.0.0"}]) for i in range(100)]
+        path = tmp_path / "nested.tsv"
+        write_index(records, str(path))
+        monkeypatch.setattr(claudia_advisories, "user_index", lambda: str(path))
+        monkeypatch.setattr(claudia_advisories, "_packages", {})
+        assert len(vulnerabilities("nested", "99.5.0")) == 100
+        assert len(vulnerabilities("nested", "150.0.0")) == 50
+
+    def test_cli(self, tmp_path):
+        source = tmp_path / "dump.json"
+        source.write_text(json.dumps(RECORDS))
+        out = tmp_path / "out.tsv"
+        build = subprocess.run(
+            [sys.executable, "-I", "-S", f"{SCRIPTS_DIR}/claudia_advisories.py", "build", str(out), str(source)],
+            capture_output=True, text=True,
+        )
+        assert build.returncode == 0
+        assert "3 packages" in build.stdout
@@ -0,0 +1,73 @@
+"""Tests for claudia_audit.py — batch lockfile audit."""
+
+import json
+import subprocess
+import sys
+
+from conftest import SCRIPTS_DIR
+
+sys.path.insert(0, SCRIPTS_DIR)
+from claudia_audit import audit_lockfile, find_lockfiles
+
+LOCK = {
+    "lockfileVersion": 3,
+    "packages": {
+        "": {"name": "app"},
+        "node_modules/express": {"version": "4.18.2"},
+        "node_modules/express/node_modules/request": {"version": "2.88.2"},
+        "node_modules/other/node_modules/request": {"version": "2.88.2"},
+    },
+}
+
+
+def write_project(root):
+    (root / "package-lock.json").write_text(json.dumps(LOCK))
+    (root / "web").mkdir()
+    (root / "web" / "yarn.lock").write_text('colors@^1.4.0:\n  version "1.4.0"\n')
+    (root / "node_modules" / "dep").mkdir(parents=True)
+    (root / "node_modules" / "dep" / "package-lock.json").write_text("{}")
+
+
+class TestAudit:
+
+    def test_find_lockfiles_skips_node_modules(self, tmp_path):
+        write_project(tmp_path)
+        assert find_lockfiles(str(tmp_path)) == [
+            str(tmp_path / "package-lock.json"), str(tmp_path / "web" / "yarn.lock"),
+        ]
+
+    def test_transitive_package_reported_once(self, tmp_path):
+        write_project(tmp_path)
+        count, found = audit_lockfile(str(tmp_path / "package-lock.json"))
+        assert count == 3
+        assert [(name, version) for name, version, _ in found] == [("request", "2.88.2")]
+        assert "Deprecated" in found[0][2]
+
+    def test_copyleft_license_reported(self, tmp_path):
+        lock = {"lockfileVersion": 3, "packages": {
+            "node_modules/pm2": {"version": "5.3.0"},
+            "node_modules/react": {"version": "18.2.0"},
+        }}
+        (tmp_path / "package-lock.json").write_text(json.dumps(lock))
+        _, found = audit_lockfile(str(tmp_path / "package-lock.json"), {})
+        assert found == [("pm2", "5.3.0", "AGPL-3.0 license (copyleft)")]
+
+    def test_vulnerable_version_reported(self, tmp_path):
+        lock = {"lockfileVersion": 3, "packages": {
+            "node_modules/lodash": {"version": "4.17.20"},
+            "node_modules/a/node_modules/lodash": {"version": "4.17.21"},
+        }}
+        (tmp_path / "package-lock.json").write_text(json.dumps(lock))
+        _, found = audit_lockfile(str(tmp_path / "package-lock.json"), {})
+        assert [(name, version) for name, version, _ in found] == [("lodash", "4.17.20")]
+        assert "GHSA-35jh-r3h4-6jhm" in found[0][2]
+
+    def test_cli(self, tmp_path):
+        write_project(tmp_path)
+        result = subprocess.run(
+            [sys.executable, "-I", "-S", f"{SCRIPTS_DIR}/claudia_audit.py", str(tmp_path)],
+            capture_output=True, text=True,
+        )
+        assert result.returncode == 1
+        assert "request@2.88.2" in result.stdout
+        assert "colors@1.4.0" in result.stdout
@@ -2,7 +2,9 @@
 
 import json
 
-from conftest import make_pretool_input
+import pytest
+
+from conftest import load_check, make_pretool_input
 
 
 class TestPackageDetection:
@@ -77,6 +79,106 @@ class TestPackageDetection:
         assert "moment" in output["systemMessage"]
 
 
+class TestDependencyEntriesOnly:
+    """Names outside the dependency fields, and dependencies already on disk, don't warn."""
+
+    def test_scripts_and_keywords_ignored(self, run_hook):
+        content = json.dumps({
+            "description": "No moment here",
+            "keywords": ["lodash"],
+            "scripts": {"build": "gulp build", "request": "node req.js"},
+            "dependencies": {"express": "^4.0.0"},
+        })
+        data = make_pretool_input("Write", "/app/package.json", content)
+        code, stdout, _ = run_hook("check-deps.py", data)
+        assert code == 0
+        assert stdout.strip() == ""
+
+    def test_edit_fragment(self, run_hook):
+        data = make_pretool_input("Edit", "/app/package.json", new_string='"moment": "^2.29.0",')
+        _, stdout, _ = run_hook("check-deps.py", data)
+        assert "moment" in json.loads(stdout)["systemMessage"]
+
+    def test_existing_dependency_not_rewarned(self, tmp_path):
+        deps = load_check("check-deps")
+        path = tmp_path / "package.json"
+        path.write_text('{\n  "version": "1.0.0",\n  "dependencies": {"moment": "^2.29.0"}\n}\n')
+        data = make_pretool_input("Edit", str(path))
+        data["tool_input"].update(old_string='"1.0.0"', new_string='"1.1.0"')
+        assert not deps.check(data, set())
+        data = make_pretool_input("Edit", str(path))
+        data["tool_input"].update(old_string='"moment": "^2.29.0"', new_string='"moment": "^2.29.0", "lodash": "4"')
+        assert "lodash" in deps.check(data, set()).message
+
+
+class TestLockfiles:
+    """A lockfile write warns about the packages it newly locks."""
+
+    LOCK = {"lockfileVersion": 3, "packages": {"node_modules/a/node_modules/event-stream": {"version": "3.3.6"}}}
+
+    def test_transitive_package_in_new_lockfile(self, run_hook):
+        data = make_pretool_input("Write", "/app/package-lock.json", json.dumps(self.LOCK))
+        _, stdout, _ = run_hook("check-deps.py", data)
+        assert "event-stream" in json.loads(stdout)["systemMessage"]
+
+    def test_already_locked_not_rewarned(self, tmp_path):
+        deps = load_check("check-deps")
+        path = tmp_path / "yarn.lock"
+        path.write_text('colors@^1.4.0:\n  version "1.4.0"\n')
+        content = path.read_text() + '\nleft-pad@^1.3.0:\n  version "1.3.0"\n'
+        findings = deps.check(make_pretool_input("Write", str(path), content), set())
+        assert "left-pad" in findings.message
+        assert "colors" not in findings.message
+
+
+class TestAdvisories:
+    """Known vulnerabilities are looked up by version (shipped advisory index)."""
+
+    @pytest.mark.parametrize("spec", ["6.11.0", "=6.11.0"])
+    def test_vulnerable_pinned_version(self, run_hook, spec):
+        content = '{"dependencies": {"protobufjs": "%s"}}' % spec
+        data = make_pretool_input("Write", "/app/package.json", content)
+        _, stdout, _ = run_hook("check-deps.py", data)
+        message = json.loads(stdout)["systemMessage"]
+        assert f"**protobufjs@{spec}**" in message
+        assert "GHSA-h755-8qp9-cq85" in message
+
+    def test_range_admitting_affected_versions(self, run_hook):
+        # ^6.10.0 admits affected versions, and 6.11.4, fixed: a note, not an upgrade
+        content = '{"dependencies": {"protobufjs": "^6.10.0"}}'
+        data = make_pretool_input("Write", "/app/package.json", content)
+        _, stdout, _ = run_hook("check-deps.py", data)
+        message = json.loads(stdout)["systemMessage"]
+        assert "**protobufjs@^6.10.0**: the range admits versions affected by" in message
+        assert "GHSA-g954-5hwp-pp24" in message and "GHSA-h755-8qp9-cq85" in message
+        assert "Upgrade to a fixed version" not in message
+
+    def test_range_clear_of_advisories(self, run_hook):
+        # ^6.11.4 starts past both 6.x advisories and stops short of 7.0.0
+        content = '{"dependencies": {"protobufjs": "^6.11.4"}}'
+        data = make_pretool_input("Write", "/app/package.json", content)
+        _, stdout, _ = run_hook("check-deps.py", data)
+        assert stdout.strip() == ""
+
+    @pytest.mark.parametrize("spec", ["7.2.5", "^7.2.5", "latest", "*", "<7", "file:../protobuf"])
+    def test_fixed_or_unknown_version(self, run_hook, spec):
+        content = '{"dependencies": {"protobufjs": "%s"}}' % spec
+        data = make_pretool_input("Write", "/app/package.json", content)
+        _, stdout, _ = run_hook("check-deps.py", data)
+        assert stdout.strip() == ""
+
+    def test_locked_version(self):
+        deps = load_check("check-deps")
+        lock = {"lockfileVersion": 3, "packages": {
+            "node_modules/minimist": {"version": "1.2.5"},
+            "node_modules/a/node_modules/minimist": {"version": "1.2.8"},
+        }}
+        findings = deps.check(make_pretool_input("Write", "/app/package-lock.json", json.dumps(lock)), set())
+        assert "**minimist@1.2.5**" in findings.message
+        assert "1.2.8" not in findings.message
+        assert findings.message.count("GHSA-xvch-5gv4-984h") == 1
+
+
 class TestFileFiltering:
     """Only package.json files should be checked."""
 
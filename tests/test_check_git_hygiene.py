@@ -2,7 +2,7 @@
 
 import json
 
-from conftest import make_pretool_input
+from conftest import load_check, make_pretool_input
 
 
 class TestEnvFileBlocking:
@@ -74,6 +74,13 @@ class TestMergeConflictBlocking:
         code, _, stderr = run_hook("check-git-hygiene.py", data)
         assert code == 2
 
+    def test_marker_opening_a_later_multiedit_blocks(self, run_hook):
+        # Each edit starts a line of its own; joined, this marker wouldn't
+        edits = [{"new_string": "some code"}, {"new_string": "<<<<<<< HEAD\nother code"}]
+        data = make_pretool_input("MultiEdit", "/app/main.js", edits=edits)
+        code, _, _ = run_hook("check-git-hygiene.py", data)
+        assert code == 2
+
     def test_conflict_in_markdown_allowed(self, run_hook):
         """Markdown files can legitimately contain these characters."""
         data = make_pretool_input("Write", "/app/README.md", "<<<<<<< example\n=======\n>>>>>>>")
@@ -108,3 +115,27 @@ class TestBinaryFileAdvisory:
         code, stdout, _ = run_hook("check-git-hygiene.py", data)
         assert code == 0
         assert stdout.strip() == ""
+
+
+class TestNoTimeBudget:
+    """Conflict markers block whatever the load: the rule is never skipped for time."""
+
+    def test_blocks_when_budgets_expire(self, monkeypatch):
+        hygiene = load_check("check-git-hygiene")
+        import claudia_scan
+
+        class Expired:
+            def __init__(self, seconds):
+                pass
+
+            def __enter__(self):
+                raise claudia_scan.ScanTimeout()
+
+            def __exit__(self, *exc):
+                return False
+
+        monkeypatch.setattr(claudia_scan, "_Deadline", Expired)
+        content = "const x = 1;\n" * 1000 + "<<<<<<< HEAD\n"
+        findings = hygiene.check(make_pretool_input("Write", "/app/main.js", content), set())
+        assert "conflict" in findings.block.lower()
+        assert not findings.skipped
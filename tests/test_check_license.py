@@ -1,8 +1,11 @@
 """Tests for check-license.py — copyleft license detection hook."""
 
 import json
+import re
 
-from conftest import make_pretool_input
+import pytest
+
+from conftest import load_check, make_pretool_input
 
 
 class TestCopyleftDetection:
@@ -52,6 +55,55 @@ class TestCopyleftDetection:
             assert "mongoose" not in output.get("systemMessage", "")
 
 
+    def test_name_outside_dependencies_ignored(self, run_hook):
+        content = '{"keywords": ["mongodb"], "dependencies": {"mongoose": "^8.0.0"}}'
+        data = make_pretool_input("Write", "/app/package.json", content)
+        _, stdout, _ = run_hook("check-license.py", data)
+        assert stdout.strip() == ""
+
+
+class TestGplReference:
+    """One whole-content search, equivalent to searching line by line."""
+
+    @pytest.mark.parametrize("content", [
+        '{\n  "license": "GPL-3.0"\n}',
+        '"name": "x",\n"note": "see GPL terms"',
+        '"a\nb" gpl',
+        '"quoted"\nGPL on the next line',
+    ])
+    def test_matches_per_line_search(self, content):
+        license_check = load_check("check-license")
+        per_line = any(
+            re.search(r'["\']([^"\']+)["\'].*(?:GPL|AGPL|SSPL)', line, re.IGNORECASE)
+            for line in content.split("\n")
+        )
+        assert bool(re.search(license_check.GPL_PATTERN, content, re.IGNORECASE)) == per_line
+
+    def test_no_match_across_edits(self, run_hook):
+        data = make_pretool_input("MultiEdit", "/app/package.json", edits=[
+            {"old_string": "a", "new_string": '"description": "build tools"'},
+            {"old_string": "b", "new_string": "GPL"},
+        ])
+        _, stdout, _ = run_hook("check-license.py", data)
+        assert "GPL/AGPL/SSPL reference" not in stdout
+
+    def test_match_within_one_edit(self, run_hook):
+        data = make_pretool_input("MultiEdit", "/app/package.json", edits=[
+            {"old_string": "a", "new_string": '"version": "1.0.0"'},
+            {"old_string": "b", "new_string": '"license": "AGPL-3.0"'},
+        ])
+        _, stdout, _ = run_hook("check-license.py", data)
+        assert "GPL/AGPL/SSPL reference" in stdout
+
+    def test_existing_lines_not_searched(self, run_hook, tmp_path):
+        pkg = tmp_path / "package.json"
+        pkg.write_text('{\n  "license": "GPL-3.0",\n  "version": "1.0.0"\n}\n')
+        data = make_pretool_input("Edit", str(pkg), new_string='"version": "1.0.1"')
+        data["tool_input"]["old_string"] = '"version": "1.0.0"'
+        _, stdout, _ = run_hook("check-license.py", data)
+        assert "GPL/AGPL/SSPL reference" not in stdout
+
+
 class TestFileFiltering:
     def test_non_package_json_ignored(self, run_hook):
         data = make_pretool_input("Write", "/app/config.json", '{"readline": "^1.0"}')
@@ -68,3 +120,29 @@ class TestDedup:
 
         _, stdout2, _ = run_hook("check-license.py", data)
         assert stdout2.strip() == ""
+
+
+class TestLicenseIndex:
+    """Packages COPYLEFT_PACKAGES doesn't list are resolved through the index."""
+
+    def test_indexed_copyleft_package(self, run_hook):
+        content = '{"license": "MIT", "dependencies": {"pm2": "^5.0.0"}}'
+        data = make_pretool_input("Write", "/app/package.json", content)
+        _, stdout, _ = run_hook("check-license.py", data)
+        message = json.loads(stdout)["systemMessage"]
+        assert "**pm2** (AGPL-3.0)" in message
+
+    @pytest.mark.parametrize("name", ["react", "jszip", "mysql", "caniuse-lite", "unknown-pkg-xyz"])
+    def test_permissive_or_unknown_package(self, run_hook, name):
+        content = '{"dependencies": {"%s": "^1.0.0"}}' % name
+        data = make_pretool_input("Write", "/app/package.json", content)
+        _, stdout, _ = run_hook("check-license.py", data)
+        assert stdout.strip() == ""
+
+    def test_user_index(self, run_hook, tmp_path):
+        (tmp_path / ".claude").mkdir(exist_ok=True)
+        (tmp_path / ".claude" / "claudia-licenses.tsv").write_text("npm:internal-lib\tGPL-2.0-only\n")
+        content = '{"dependencies": {"internal-lib": "^1.0.0"}}'
+        data = make_pretool_input("Write", "/app/package.json", content)
+        _, stdout, _ = run_hook("check-license.py", data)
+        assert "**internal-lib** (GPL-2.0-only)" in json.loads(stdout)["systemMessage"]
@@ -85,6 +85,41 @@ class TestAntiPatternDetection:
         assert "SSL" in output["systemMessage"]
 
 
+class TestLexicalTargets:
+    """In lexable languages each rule only sees the code, comments or strings it's about."""
+
+    def test_todo_in_string_ignored(self, run_hook):
+        data = make_pretool_input("Write", "/app/main.js", 'const label = "TODO list";')
+        code, stdout, _ = run_hook("check-practices.py", data)
+        assert code == 0
+        assert stdout.strip() == ""
+
+    def test_eval_in_comment_and_docstring_ignored(self, run_hook):
+        content = 'def run():\n    """Never call eval() here."""\n    # eval(x) was removed\n'
+        data = make_pretool_input("Write", "/app/run.py", content)
+        code, stdout, _ = run_hook("check-practices.py", data)
+        assert code == 0
+        assert stdout.strip() == ""
+
+    def test_http_url_in_comment_ignored_in_string_flagged(self, run_hook):
+        data = make_pretool_input("Write", "/app/api.py", "# see http://example.com\n")
+        _, stdout, _ = run_hook("check-practices.py", data)
+        assert stdout.strip() == ""
+        data = make_pretool_input("Write", "/app/api.py", 'URL = "http://example.com"\n')
+        _, stdout, _ = run_hook("check-practices.py", data)
+        assert "HTTP" in json.loads(stdout)["systemMessage"]
+
+    def test_shell_chmod_flagged(self, run_hook):
+        data = make_pretool_input("Write", "/app/setup.sh", "chmod 777 /srv  # temporary\n")
+        _, stdout, _ = run_hook("check-practices.py", data)
+        assert "chmod 777" in json.loads(stdout)["systemMessage"]
+
+    def test_unlexed_language_scans_raw_text(self, run_hook):
+        data = make_pretool_input("Write", "/app/main.rb", 'label = "TODO list"')
+        _, stdout, _ = run_hook("check-practices.py", data)
+        assert "TODO" in json.loads(stdout)["systemMessage"]
+
+
 class TestTestFileSkipping:
     """Test files should skip console.log and TODO warnings."""
 
@@ -278,3 +278,67 @@ class TestDismissHint:
         assert "silence next-steps" in user_hint
         assert "suppress_hooks" in claude_hint
         assert "claudia.json" in claude_hint
+
+
+class TestWarmSnapshot:
+    """save_snapshot() / load_snapshot() — SessionStart project and config cache."""
+
+    @pytest.fixture
+    def project(self, tmp_path, monkeypatch):
+        project = tmp_path / "myproject"
+        (project / ".git").mkdir(parents=True)
+        subdir = project / "src"
+        subdir.mkdir()
+        monkeypatch.chdir(subdir)
+        monkeypatch.setenv("HOME", str(tmp_path))
+        (tmp_path / ".claude").mkdir()
+        return project
+
+    def test_snapshot_serves_project_and_config(self, project, tmp_path):
+        (tmp_path / ".claude" / "claudia.json").write_text(json.dumps({"experience": "beginner"}))
+        snapshot = claudia_config.save_snapshot()
+        assert snapshot["project"][1] == str(project)
+        assert claudia_config.load_snapshot() is not None
+        assert claudia_config.resolve_project() == claudia_config._walk_project(os.getcwd())
+        assert claudia_config.load_user_config() == ("moderate", "beginner")
+
+    def test_config_change_invalidates(self, project, tmp_path):
+        config = tmp_path / ".claude" / "claudia.json"
+        config.write_text(json.dumps({"proactivity": "high"}))
+        claudia_config.save_snapshot()
+        config.write_text(json.dumps({"proactivity": "low", "experience": "beginner"}))
+        assert claudia_config.load_snapshot() is None
+        assert claudia_config.load_user_config() == ("low", "beginner")
+
+    def test_new_project_context_invalidates(self, project, tmp_path):
+        claudia_config.save_snapshot()
+        key, _ = claudia_config.resolve_project()
+        claudia_config.save_project_context({"experience": "beginner"}, key=key, path=str(project))
+        assert claudia_config.load_snapshot() is None
+        assert claudia_config.load_user_config()[1] == "beginner"
+
+    def test_removed_git_invalidates(self, project):
+        claudia_config.save_snapshot()
+        os.rmdir(project / ".git")
+        assert claudia_config.load_snapshot() is None
+
+    def test_nearer_git_invalidates(self, project):
+        claudia_config.save_snapshot()
+        os.mkdir(os.path.join(os.getcwd(), ".git"))
+        assert claudia_config.load_snapshot() is None
+        assert claudia_config.resolve_project()[1] == os.getcwd()
+
+    def test_git_above_projectless_cwd_invalidates(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("HOME", str(tmp_path))
+        subdir = tmp_path / "work" / "src"
+        subdir.mkdir(parents=True)
+        monkeypatch.chdir(subdir)
+        claudia_config.save_snapshot()
+        assert claudia_config.load_snapshot() is not None
+        (tmp_path / "work" / ".git").mkdir()
+        assert claudia_config.load_snapshot() is None
+
+    def test_other_cwd_not_served(self, project, monkeypatch):
+        claudia_config.save_snapshot()
+        monkeypatch.chdir(project)
+        assert claudia_config.load_snapshot() is None
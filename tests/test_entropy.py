@@ -0,0 +1,79 @@
+"""Tests for claudia_entropy.py — Shannon-entropy secret detection."""
+
+import math
+import sys
+
+import pytest
+
+from conftest import SCRIPTS_DIR
+
+sys.path.insert(0, SCRIPTS_DIR)
+import claudia_entropy
+from claudia_entropy import candidates, charset, entropies, find_high_entropy
+
+BASE64_KEY = "wJalrXUtnFEMI/K7MDENG/bPxRfiCYEXAMPLEKEY"
+ALNUM_KEY = "q8ZkR2vLm4XwT9bN3cYh7JfP1sDg6AeU"
+HEX_KEY = "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b"
+
+
+def reference(token):
+    n = len(token)
+    return -sum(token.count(c) / n * math.log2(token.count(c) / n) for c in set(token))
+
+
+class TestEntropy:
+
+    def test_charset(self):
+        assert charset(HEX_KEY) == "hex"
+        assert charset(BASE64_KEY) == "base64"
+        assert charset(ALNUM_KEY) == "alnum"
+
+    def test_matches_reference(self):
+        tokens = [BASE64_KEY, ALNUM_KEY, HEX_KEY, "aaaa", "ab"]
+        assert entropies(tokens) == pytest.approx([reference(t) for t in tokens])
+
+
+class TestFindHighEntropy:
+
+    @pytest.mark.parametrize("content,kind", [
+        (f'key = "{BASE64_KEY}"', "base64"),
+        (f"TOKEN='{ALNUM_KEY}'", "alnum"),
+        (f"token: {HEX_KEY}", "hex"),
+    ])
+    def test_random_tokens_found(self, content, kind):
+        offset, found = find_high_entropy(content)
+        assert found == kind
+        assert content[offset:].startswith(("wJal", "q8Zk", "9f86"))
+
+    @pytest.mark.parametrize("content", [
+        'name = "getUserAccountSettingsById"',
+        'handler = "ComponentDidUpdate2Handler"',
+        'path = "src/components/Button/index"',
+        'LIMIT = "MAX_CONNECTIONS_PER_HOST_DEFAULT"',
+        f'commit = "{HEX_KEY}"',
+        '"integrity": "sha512-' + BASE64_KEY * 2 + '"',
+        f'short = "{ALNUM_KEY[:20]}"',
+        f'key = "{BASE64_KEY * 7}"',
+        f"words {BASE64_KEY} unquoted",
+        '<img src="/assets/icons/ChevronRightSmall.svg">',
+        'fetch("/api/v2/Organizations/MembersByRole")',
+        'url = "https://example.com/Organizations/MembersByRole"',
+        'route: api/v2/Organizations/MembersByRole/',
+        'import x from "components/UserProfile/AvatarUploadDialog"',
+    ])
+    def test_ordinary_strings_ignored(self, content):
+        assert find_high_entropy(content) is None
+
+    def test_ranges(self):
+        content = f'a = "{ALNUM_KEY}"\nb = 1\n'
+        assert find_high_entropy(content, [(len(content) - 6, len(content))]) is None
+        assert find_high_entropy(content, [(0, 6)]) == (5, "alnum")
+
+    def test_candidates_before_the_first_hit_only(self, monkeypatch):
+        content = "".join(f'k{i} = "{ALNUM_KEY}"\n' for i in range(2000))
+        measured = []
+        real = claudia_entropy.entropies
+        monkeypatch.setattr(claudia_entropy, "entropies", lambda tokens: measured.append(tokens) or real(tokens))
+        assert find_high_entropy(content) == (6, "alnum")
+        assert measured == [[ALNUM_KEY]]
+        assert len(candidates(content)) == 2000
@@ -0,0 +1,71 @@
+"""Tests for claudia_index.py — sorted key/value index files."""
+
+import sys
+
+import pytest
+
+from conftest import SCRIPTS_DIR
+
+sys.path.insert(0, SCRIPTS_DIR)
+from claudia_index import SortedIndex, open_index, write_index
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = tmp_path / "test.tsv"
+    write_index([
+        ("npm:left-pad", "WTFPL"),
+        ("npm:@scope/pkg", "ISC"),
+        ("npm:zzz", "MIT"),
+        ("npm:aaa", "GPL-3.0"),
+        ("pypi:some-pkg", "BSD-3-Clause"),
+    ], str(path), "test")
+    return path
+
+
+class TestSortedIndex:
+
+    def test_file_is_sorted_with_header(self, index):
+        lines = index.read_bytes().splitlines()
+        assert lines[0] == b"#claudia-test\t1"
+        assert lines[1:] == sorted(lines[1:])
+
+    @pytest.mark.parametrize("key,expected", [
+        ("npm:left-pad", "WTFPL"),
+        ("npm:@scope/pkg", "ISC"),
+        ("npm:aaa", "GPL-3.0"),
+        ("npm:zzz", "MIT"),
+        ("pypi:some-pkg", "BSD-3-Clause"),
+        ("npm:left", None),
+        ("npm:left-pad-x", None),
+        ("npm:", None),
+        ("zzz", None),
+    ])
+    def test_get(self, index, key, expected):
+        assert SortedIndex(str(index)).get(key) == expected
+
+    def test_missing_and_empty_files(self, tmp_path):
+        (tmp_path / "empty.tsv").write_text("")
+        assert SortedIndex(str(tmp_path / "empty.tsv")).get("npm:react") is None
+        assert SortedIndex(str(tmp_path / "missing.tsv")).get("npm:react") is None
+
+    def test_last_duplicate_wins(self, tmp_path):
+        path = tmp_path / "dup.tsv"
+        assert write_index([("npm:a", "GPL-3.0"), ("npm:a", "MIT")], str(path), "test") == 1
+        assert SortedIndex(str(path)).get("npm:a") == "MIT"
+
+    def test_open_index_shared(self, index):
+        assert open_index(str(index)) is open_index(str(index))
+
+    def test_rebuilt_index_seen(self, tmp_path):
+        path = tmp_path / "live.tsv"
+        write_index([("npm:a", "MIT")], str(path), "test")
+        assert open_index(str(path)).get("npm:a") == "MIT"
+        write_index([("npm:a", "GPL-3.0-only")], str(path), "test")
+        assert open_index(str(path)).get("npm:a") == "GPL-3.0-only"
+
+    def test_index_appearing_later_seen(self, tmp_path):
+        path = tmp_path / "later.tsv"
+        assert open_index(str(path)).get("npm:a") is None
+        write_index([("npm:a", "MIT")], str(path), "test")
+        assert open_index(str(path)).get("npm:a") == "MIT"
@@ -0,0 +1,71 @@
+"""Tests for claudia_lex.py — code/comment/string spans and masking."""
+
+import sys
+
+import pytest
+
+from conftest import SCRIPTS_DIR
+
+sys.path.insert(0, SCRIPTS_DIR)
+from claudia_lex import ALL_KINDS, CODE, COMMENT, STRING, language_for, lex, mask
+
+
+def kinds(text, language):
+    return [(text[start:end], kind) for start, end, kind in lex(text, language)]
+
+
+class TestLex:
+
+    def test_js(self):
+        text = 'a = "x // y"; // note\n/* b\n c */ s = `t${1}`; q = \'it\\\'s\''
+        assert kinds(text, "js") == [
+            ('"x // y"', STRING), ("// note", COMMENT), ("/* b\n c */", COMMENT),
+            ("`t${1}`", STRING), ("'it\\'s'", STRING),
+        ]
+
+    def test_python(self):
+        text = 'def f():\n    """Doc # not a comment."""\n    return "a#b"  # real\n'
+        assert kinds(text, "python") == [
+            ('"""Doc # not a comment."""', STRING), ('"a#b"', STRING), ("# real", COMMENT),
+        ]
+
+    def test_shell(self):
+        text = 'echo "$# args" # comment\nx=a#b\n'
+        assert kinds(text, "shell") == [('"$# args"', STRING), ("# comment", COMMENT)]
+
+    def test_unterminated_string_ends_at_newline(self):
+        assert kinds('x = "oops\neval(y)', "js") == [('"oops', STRING)]
+
+    def test_unterminated_block_comment_runs_to_end(self):
+        assert kinds("a /* b\nc", "js") == [("/* b\nc", COMMENT)]
+
+    def test_language_for(self):
+        assert language_for("src/App.TSX") == "js"
+        assert language_for("tool.py") == "python"
+        assert language_for("deploy.sh") == "shell"
+        assert language_for("README.md") is None
+
+
+class TestMask:
+
+    TEXT = 'eval(a) // eval(b)\nx = "eval(c)"\n'
+
+    @pytest.mark.parametrize("keep,visible", [
+        ({CODE}, ["eval(a)"]),
+        ({COMMENT}, ["eval(b)"]),
+        ({STRING}, ["eval(c)"]),
+        ({CODE, STRING}, ["eval(a)", "eval(c)"]),
+    ])
+    def test_keeps_only_listed_kinds(self, keep, visible):
+        masked = mask(self.TEXT, lex(self.TEXT, "js"), keep)
+        assert len(masked) == len(self.TEXT)
+        assert masked.count("\n") == 2
+        assert all(v in masked for v in visible)
+        assert masked.count("eval(") == len(visible)
+
+    def test_all_kinds_is_the_text(self):
+        assert mask(self.TEXT, lex(self.TEXT, "js"), ALL_KINDS) is self.TEXT
+
+    def test_keeps_newlines_in_blanked_spans(self):
+        text = "/* a\nb */x"
+        assert mask(text, lex(text, "js"), {CODE}) == "    \n    x"
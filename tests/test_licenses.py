@@ -0,0 +1,116 @@
+"""Tests for claudia_licenses.py — offline license index."""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from conftest import SCRIPTS_DIR
+
+sys.path.insert(0, SCRIPTS_DIR)
+import claudia_licenses
+from claudia_index import SortedIndex
+from claudia_licenses import SHIPPED_INDEX, index_key, is_copyleft, lookup, read_source, write_index
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = tmp_path / "licenses.tsv"
+    write_index([
+        ("npm:left-pad", "WTFPL"),
+        ("npm:@scope/pkg", "ISC"),
+        ("npm:zzz", "MIT"),
+        ("npm:aaa", "GPL-3.0"),
+        ("pypi:some-pkg", "BSD-3-Clause"),
+    ], str(path))
+    return path
+
+
+class TestShippedIndex:
+
+    def test_every_shipped_entry_found(self):
+        shipped = SortedIndex(SHIPPED_INDEX)
+        with open(SHIPPED_INDEX, encoding="utf-8") as f:
+            entries = [line.rstrip("\n").split("\t") for line in f]
+        assert len(entries) > 300
+        for key, license_type in entries:
+            assert shipped.get(key) == license_type
+
+
+class TestLookup:
+
+    def test_shipped(self):
+        assert lookup("react") == "MIT"
+        assert lookup("pm2") == "AGPL-3.0"
+        assert lookup("not-a-real-package-name-xyz") is None
+
+    def test_pypi_names_normalized(self):
+        assert index_key("Foo_Bar.baz", "pypi") == "pypi:foo-bar-baz"
+        assert lookup("PyYAML", "pypi") == lookup("pyyaml", "pypi") == "MIT"
+        assert lookup("psycopg2_binary", "pypi") == "LGPL-3.0-or-later"
+
+    def test_user_index_first(self, tmp_path, monkeypatch, index):
+        monkeypatch.setattr(claudia_licenses, "user_index", lambda: str(index))
+        assert lookup("aaa") == "GPL-3.0"
+        assert lookup("react") == "MIT"
+
+
+class TestCopyleft:
+
+    @pytest.mark.parametrize("expression,expected", [
+        ("GPL-3.0-only", True),
+        ("AGPL-3.0", True),
+        ("LGPL-2.1-or-later", True),
+        ("SSPL-1.0", True),
+        ("CC-BY-SA-4.0", True),
+        ("CC-BY-4.0", False),
+        ("MIT", False),
+        ("MPL-2.0 AND MIT", False),
+        ("MIT OR GPL-3.0-or-later", False),
+        ("(BSD-3-Clause OR GPL-2.0)", False),
+        ("MIT AND GPL-2.0", True),
+        ("GPL-2.0 OR LGPL-3.0", True),
+    ])
+    def test_expressions(self, expression, expected):
+        assert is_copyleft(expression) is expected
+
+
+class TestBuild:
+
+    def test_json_source(self, tmp_path):
+        source = tmp_path / "licenses.json"
+        source.write_text(json.dumps({
+            "React@18.2.0": {"licenses": "MIT"},
+            "@scope/pkg@1.0.0": {"licenses": ["ISC", "GPL-2.0"]},
+            "plain": "Apache-2.0",
+            "none": {"repository": "x"},
+        }))
+        assert sorted(read_source(str(source))) == [
+            ("npm:@scope/pkg", "ISC OR GPL-2.0"), ("npm:plain", "Apache-2.0"), ("npm:react", "MIT"),
+        ]
+
+    def test_harvest_directory(self, tmp_path):
+        pkg = tmp_path / "node_modules" / "@scope" / "pkg"
+        pkg.mkdir(parents=True)
+        (pkg / "package.json").write_text(json.dumps({"name": "@scope/pkg", "license": {"type": "GPL-2.0"}}))
+        (tmp_path / "package.json").write_text(json.dumps({"name": "app", "license": "MIT"}))
+        dist = tmp_path / "lib" / "Some_Pkg-1.0.dist-info"
+        dist.mkdir(parents=True)
+        (dist / "METADATA").write_text(
+            "Metadata-Version: 2.4\nName: Some_Pkg\nLicense-Expression: LGPL-3.0-only\n\nLicense: body\n"
+        )
+        assert sorted(read_source(str(tmp_path))) == [
+            ("npm:@scope/pkg", "GPL-2.0"), ("pypi:some-pkg", "LGPL-3.0-only"),
+        ]
+
+    def test_cli(self, tmp_path):
+        (tmp_path / "src.tsv").write_text("Django\tBSD-3-Clause\n# comment\n")
+        out = tmp_path / "out.tsv"
+        result = subprocess.run(
+            [sys.executable, "-I", "-S", f"{SCRIPTS_DIR}/claudia_licenses.py", "build", str(out),
+             str(tmp_path / "src.tsv"), "--pypi"],
+            capture_output=True, text=True,
+        )
+        assert result.returncode == 0
+        assert SortedIndex(str(out)).get("pypi:django") == "BSD-3-Clause"
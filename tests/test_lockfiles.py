@@ -0,0 +1,242 @@
+"""Tests for claudia_lockfiles.py — streaming lockfile parsers."""
+
+import io
+import json
+import sys
+
+import pytest
+
+from conftest import SCRIPTS_DIR
+
+sys.path.insert(0, SCRIPTS_DIR)
+from claudia_lockfiles import (
+    lockfile_kind, parse_lockfile_text, parse_package_lock, parse_pnpm_lock, parse_yarn_lock, read_lockfile,
+    text_chunks, text_lines,
+)
+
+INTEGRITY = "sha512-" + "q" * 86 + "=="
+
+PACKAGE_LOCK = {
+    "name": "app",
+    "version": "1.0.0",
+    "lockfileVersion": 3,
+    "requires": True,
+    "packages": {
+        "": {"name": "app", "version": "1.0.0", "dependencies": {"lodash": "^4.17.21"}},
+        "node_modules/lodash": {
+            "version": "4.17.21",
+            "resolved": "https://registry.npmjs.org/lodash/-/lodash-4.17.21.tgz",
+            "integrity": INTEGRITY,
+        },
+        "node_modules/@babel/core/node_modules/semver": {"version": "6.3.1", "dev": True},
+        "node_modules/stréam": {"version": "1.0.0", "description": "{[\"}]"},
+        "node_modules/alias": {"name": "real-name", "version": "2.0.0"},
+        "node_modules/ws": {"resolved": "packages/ws", "link": True},
+        "packages/ws": {"name": "ws", "version": "0.1.0"},
+    },
+    "dependencies": {"lodash": {"version": "0.0.1"}},
+}
+
+EXPECTED_NPM = [
+    ("lodash", "4.17.21", "https://registry.npmjs.org/lodash/-/lodash-4.17.21.tgz", INTEGRITY),
+    ("semver", "6.3.1", None, None),
+    ("stréam", "1.0.0", None, None),
+    ("real-name", "2.0.0", None, None),
+]
+
+
+class TestPackageLock:
+
+    def test_packages_map(self):
+        assert list(parse_package_lock(io.StringIO(json.dumps(PACKAGE_LOCK, indent=2)))) == EXPECTED_NPM
+
+    @pytest.mark.parametrize("chunk_chars", [1, 7, 64])
+    def test_any_chunk_boundary(self, chunk_chars):
+        # Values before "packages" are skipped across chunk boundaries too
+        lock = {"meta": {"a": ["}", {"b": "\\\"]"}], "n": 12345}, **PACKAGE_LOCK}
+        assert list(parse_package_lock(text_chunks(json.dumps(lock), chunk_chars))) == EXPECTED_NPM
+
+    def test_empty_pieces_skipped(self):
+        text = json.dumps(PACKAGE_LOCK)
+        assert list(parse_package_lock(["", text[:10], "", text[10:]])) == EXPECTED_NPM
+
+    def test_from_text(self):
+        text = json.dumps(PACKAGE_LOCK, indent=2)
+        assert list(parse_lockfile_text(text, "npm")) == EXPECTED_NPM
+
+    def test_v1_dependencies_tree(self):
+        lock = {"lockfileVersion": 1, "dependencies": {
+            "a": {"version": "1.0.0", "integrity": "sha1-x", "dependencies": {"b": {"version": "2.0.0"}}},
+            "c": {"version": "3.0.0"},
+        }}
+        records = list(parse_package_lock(io.StringIO(json.dumps(lock))))
+        assert [(name, version) for name, version, _, _ in records] == [("a", "1.0.0"), ("b", "2.0.0"), ("c", "3.0.0")]
+
+    def test_stops_after_packages(self):
+        text = json.dumps({"lockfileVersion": 3, "packages": {"node_modules/a": {"version": "1"}}})
+        # Whatever follows the packages map is never read
+        assert list(parse_package_lock(io.StringIO(text[:-1] + ", garbage"))) == [("a", "1", None, None)]
+
+    def test_malformed(self):
+        with pytest.raises(ValueError):
+            list(parse_package_lock(io.StringIO('{"packages": {"node_modules/a": {"version": ')))
+
+
+class TestYarnLock:
+
+    CLASSIC = '''# THIS IS AN AUTOGENERATED FILE. DO NOT EDIT THIS FILE DIRECTLY.
+# yarn lockfile v1
+
+
+"@babel/code-frame@^7.0.0", "@babel/code-frame@^7.10.4":
+  version "7.12.13"
+  resolved "https://registry.yarnpkg.com/@babel/code-frame/-/code-frame-7.12.13.tgz#dcfc826b"
+  integrity sha512-HV1Cm0Q3ZrpCR93tkWOYiuYIgLxZXZFVG2VgK+MBWjUqZTundupbfx2aXarXuw5Ko5aMcjtJgbSs4vUGBS5v6g==
+  dependencies:
+    "@babel/highlight" "^7.12.13"
+
+lodash@^4.17.21:
+  version "4.17.21"
+  resolved "https://registry.yarnpkg.com/lodash/-/lodash-4.17.21.tgz"
+'''
+
+    BERRY = '''__metadata:
+  version: 6
+  cacheKey: 8
+
+"app@workspace:.":
+  version: 0.0.0-use.local
+  resolution: "app@workspace:."
+  languageName: unknown
+  linkType: soft
+
+"lodash@npm:^4.17.21":
+  version: 4.17.21
+  resolution: "lodash@npm:4.17.21"
+  checksum: eb835a2e51d381e561e508ce932ea50a8e5a68f4ebdd771ea240d3048244a8d13658acbd502cd4829768c56f2e16bdd4340b9ea141297d472517b83868e677f7
+  languageName: node
+  linkType: hard
+'''
+
+    def test_classic(self):
+        assert list(parse_yarn_lock(io.StringIO(self.CLASSIC))) == [
+            ("@babel/code-frame", "7.12.13",
+             "https://registry.yarnpkg.com/@babel/code-frame/-/code-frame-7.12.13.tgz#dcfc826b",
+             "sha512-HV1Cm0Q3ZrpCR93tkWOYiuYIgLxZXZFVG2VgK+MBWjUqZTundupbfx2aXarXuw5Ko5aMcjtJgbSs4vUGBS5v6g=="),
+            ("lodash", "4.17.21", "https://registry.yarnpkg.com/lodash/-/lodash-4.17.21.tgz", None),
+        ]
+
+    def test_berry_skips_metadata_and_workspaces(self):
+        records = list(parse_yarn_lock(io.StringIO(self.BERRY)))
+        assert [(name, version, resolved) for name, version, resolved, _ in records] == [
+            ("lodash", "4.17.21", "lodash@npm:4.17.21"),
+        ]
+        assert records[0][3].startswith("eb835a2e")
+
+
+class TestPnpmLock:
+
+    V6 = '''lockfileVersion: '6.0'
+
+dependencies:
+  react:
+    specifier: ^18.2.0
+    version: 18.2.0
+
+packages:
+
+  /@babel/core@7.22.0:
+    resolution: {integrity: sha512-abc==}
+    engines: {node: '>=6.9.0'}
+    dev: true
+
+  /react-dom@18.2.0(react@18.2.0):
+    resolution: {integrity: sha512-def==}
+    peerDependencies:
+      react: ^18.2.0
+
+  /tar-pkg@1.0.0:
+    resolution: {tarball: https://example.com/tar-pkg-1.0.0.tgz}
+    version: 1.0.0
+'''
+
+    V5 = '''lockfileVersion: 5.4
+
+packages:
+
+  /@types/node/18.0.0:
+    resolution: {integrity: sha512-aaa==}
+
+  /react-dom/18.2.0_react@18.2.0:
+    resolution: {integrity: sha512-bbb==}
+'''
+
+    V9 = '''lockfileVersion: '9.0'
+
+packages:
+
+  '@babel/core@7.22.0':
+    resolution: {integrity: sha512-abc==}
+
+snapshots:
+
+  '@babel/core@7.22.0':
+    dependencies:
+      semver: 6.3.1
+'''
+
+    def test_v6(self):
+        assert list(parse_pnpm_lock(io.StringIO(self.V6))) == [
+            ("@babel/core", "7.22.0", None, "sha512-abc=="),
+            ("react-dom", "18.2.0", None, "sha512-def=="),
+            ("tar-pkg", "1.0.0", "https://example.com/tar-pkg-1.0.0.tgz", None),
+        ]
+
+    def test_v5(self):
+        assert list(parse_pnpm_lock(io.StringIO(self.V5))) == [
+            ("@types/node", "18.0.0", None, "sha512-aaa=="),
+            ("react-dom", "18.2.0", None, "sha512-bbb=="),
+        ]
+
+    def test_v9_skips_snapshots(self):
+        assert list(parse_pnpm_lock(io.StringIO(self.V9))) == [("@babel/core", "7.22.0", None, "sha512-abc==")]
+
+
+class TestReadLockfile:
+
+    def test_kind_by_name(self):
+        assert lockfile_kind("/a/package-lock.json") == "npm"
+        assert lockfile_kind("yarn.lock") == "yarn"
+        assert lockfile_kind("pnpm-lock.yaml") == "pnpm"
+        assert lockfile_kind("package.json") is None
+
+    def test_reads_file(self, tmp_path):
+        path = tmp_path / "yarn.lock"
+        path.write_text(TestYarnLock.CLASSIC)
+        assert [r[0] for r in read_lockfile(str(path))] == ["@babel/code-frame", "lodash"]
+        with pytest.raises(ValueError):
+            list(read_lockfile(str(tmp_path / "package.json")))
+
+    def test_reads_npm_file(self, tmp_path):
+        path = tmp_path / "package-lock.json"
+        path.write_text(json.dumps(PACKAGE_LOCK, indent=2))
+        assert list(read_lockfile(str(path))) == EXPECTED_NPM
+
+
+class TestParseText:
+
+    @pytest.mark.parametrize("text", ["", "a", "a\n", "a\nb", "a\r\nb\n\n", "\n\nx"])
+    def test_lines_as_a_file_iterates(self, text):
+        assert list(text_lines(text)) == list(io.StringIO(text))
+
+    def test_chunks(self):
+        assert list(text_chunks("abcdefg", 3)) == ["abc", "def", "g"]
+
+    @pytest.mark.parametrize("kind,text", [("yarn", TestYarnLock.CLASSIC), ("pnpm", TestPnpmLock.V6)])
+    def test_line_parsers(self, kind, text):
+        parser = {"yarn": parse_yarn_lock, "pnpm": parse_pnpm_lock}[kind]
+        assert list(parse_lockfile_text(text, kind)) == list(parser(io.StringIO(text)))
+
+    def test_unknown_kind(self):
+        with pytest.raises(ValueError):
+            list(parse_lockfile_text("{}", "cargo"))
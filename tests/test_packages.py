@@ -0,0 +1,77 @@
+"""Tests for claudia_packages.py — package.json dependency extraction."""
+
+import json
+import sys
+
+import pytest
+
+from conftest import SCRIPTS_DIR, make_pretool_input
+
+sys.path.insert(0, SCRIPTS_DIR)
+from claudia_packages import added_dependencies, added_dependency_specs, dependencies, fragment_dependencies
+
+MANIFEST = {
+    "name": "app",
+    "version": "1.0.0",
+    "description": "Uses moment-like dates",
+    "keywords": ["lodash", "{braces}"],
+    "scripts": {"build": "gulp build", "lodash": "node x.js"},
+    "dependencies": {"react": "^18.2.0"},
+    "devDependencies": {"jest": "29"},
+    "peerDependencies": {"react-dom": ">=18"},
+    "optionalDependencies": {"fsevents": "*"},
+}
+
+
+class TestDependencies:
+
+    def test_json_fields(self):
+        assert dependencies(json.dumps(MANIFEST)) == {
+            "react": "dependencies", "jest": "devDependencies",
+            "react-dom": "peerDependencies", "fsevents": "optionalDependencies",
+        }
+
+    def test_fragment_matches_json(self):
+        # A trailing comma: json.loads fails, the tolerant scan takes over
+        text = json.dumps(MANIFEST, indent=2)[:-2] + ",\n}"
+        assert fragment_dependencies(text) == dependencies(json.dumps(MANIFEST))
+
+    @pytest.mark.parametrize("fragment,expected", [
+        ('"moment": "^2.29.0",\n    "left-pad": "1.3.0"', {"moment": None, "left-pad": None}),
+        ('"dependencies": {\n    "moment": "latest"', {"moment": "dependencies"}),
+        ('"build": "gulp build",\n    "lodash": "node x.js"', {}),
+        ('"scripts": {\n    "moment": "^2.0.0"\n  }', {}),
+        ('"moment": "^2"\n  },\n  "version": "1.0.0"', {"moment": None}),
+        ('"description": "see {docs}", "request": "github:request/request"', {"request": None}),
+    ])
+    def test_fragments(self, fragment, expected):
+        assert dependencies(fragment) == expected
+
+
+class TestAddedDependencies:
+
+    def test_new_file_declares_everything(self, tmp_path):
+        payload = make_pretool_input("Write", str(tmp_path / "package.json"), json.dumps(MANIFEST))
+        assert set(added_dependencies(payload)) == {"react", "jest", "react-dom", "fsevents"}
+
+    def test_only_dependencies_not_on_disk(self, tmp_path):
+        path = tmp_path / "package.json"
+        path.write_text(json.dumps(MANIFEST, indent=2))
+        edit = make_pretool_input("Edit", str(path))
+        edit["tool_input"].update(old_string='"jest": "29"', new_string='"jest": "30",\n    "moment": "^2"')
+        assert added_dependencies(edit) == {"moment": "devDependencies"}
+
+    def test_multiedit_segments(self):
+        payload = make_pretool_input("MultiEdit", "/nowhere/package.json", edits=[
+            {"new_string": '"moment": "^2"'}, {"new_string": '"scripts": {"gulp": "gulp"}'},
+        ])
+        assert added_dependencies(payload) == {"moment": None}
+
+    def test_specs(self, tmp_path):
+        path = tmp_path / "package.json"
+        path.write_text(json.dumps(MANIFEST, indent=2))
+        edit = make_pretool_input("Edit", str(path))
+        edit["tool_input"].update(old_string='"jest": "29"', new_string='"jest": "30",\n    "moment": "^2"')
+        assert added_dependency_specs(edit) == {"moment": "^2"}
+        payload = make_pretool_input("Write", "/nowhere/package.json", '{"dependencies": {"a": "1.0.0", "b": {}}}')
+        assert added_dependency_specs(payload) == {"a": "1.0.0", "b": None}
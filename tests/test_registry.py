@@ -0,0 +1,57 @@
+"""Tests for claudia_registry.py — file-path hook module loader."""
+
+import os
+import sys
+
+from conftest import SCRIPTS_DIR
+
+sys.path.insert(0, SCRIPTS_DIR)
+from claudia_registry import HookRegistry
+
+
+class TestLoad:
+
+    def test_loads_dashed_filename(self):
+        registry = HookRegistry(SCRIPTS_DIR)
+        mod = registry.load("claudia-teach")
+        assert mod is not None
+        assert callable(mod.check)
+        assert registry.diagnostics == []
+
+    def test_module_cached(self):
+        registry = HookRegistry(SCRIPTS_DIR)
+        assert registry.load("check-secrets") is registry.load("check-secrets")
+        assert registry.is_loaded("check-secrets")
+
+    def test_spec_cached(self):
+        registry = HookRegistry(SCRIPTS_DIR)
+        assert registry.spec("check-css") is registry.spec("check-css")
+
+    def test_load_time_recorded(self):
+        registry = HookRegistry(SCRIPTS_DIR)
+        registry.load("claudia-milestones")
+        assert registry.timings["claudia-milestones"] >= 0
+
+
+class TestDiagnostics:
+
+    def test_missing_module_reported(self, tmp_path):
+        registry = HookRegistry(str(tmp_path))
+        assert registry.load("claudia-nope") is None
+        assert registry.diagnostics
+        name, message = registry.diagnostics[0]
+        assert name == "claudia-nope"
+        assert "failed to load" in message
+
+    def test_broken_module_reported(self, tmp_path):
+        (tmp_path / "claudia-broken.py").write_text("raise RuntimeError('boom')\n")
+        registry = HookRegistry(str(tmp_path))
+        assert registry.load("claudia-broken") is None
+        assert "boom" in registry.diagnostics[0][1]
+
+    def test_emit_clears(self, tmp_path, capsys):
+        registry = HookRegistry(str(tmp_path))
+        registry.load("claudia-nope")
+        registry.emit_diagnostics()
+        assert "claudia-nope failed to load" in capsys.readouterr().err
+        assert registry.diagnostics == []
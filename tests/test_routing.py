@@ -0,0 +1,95 @@
+"""Tests for claudia_routing.py — which checks run for which files."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import SCRIPTS_DIR, load_check
+
+sys.path.insert(0, SCRIPTS_DIR)
+import claudia_routing
+from claudia_routing import ROUTES, route
+
+
+class TestRoute:
+
+    def test_plain_source_file(self):
+        assert route("/app/src/server.ts", "const a = 1;") == [
+            "check-secrets", "check-practices", "check-git-hygiene",
+        ]
+
+    def test_package_json(self):
+        names = route("/app/package.json", "{}")
+        assert "check-deps" in names
+        assert "check-license" in names
+        assert "check-css" not in names
+
+    @pytest.mark.parametrize("path", ["/app/Dockerfile", "/app/Dockerfile.prod", "/app/api.dockerfile"])
+    def test_dockerfiles(self, path):
+        assert "check-dockerfile" in route(path, "FROM node:22")
+
+    def test_component_without_styles(self):
+        names = route("/app/src/App.tsx", "export const App = () => <div>hi</div>;")
+        assert "check-accessibility" in names
+        assert "check-css" not in names
+
+    def test_component_with_styles(self):
+        names = route("/app/src/App.tsx", '<div className="box">hi</div>')
+        assert "check-css" in names
+
+    def test_content_unknown_keeps_content_routes(self):
+        assert "check-css" in route("/app/src/App.tsx")
+
+    def test_stylesheet(self):
+        assert "check-css" in route("/app/styles/main.scss", "a { color: red; }")
+
+    def test_secrets_skip_fixtures(self):
+        assert "check-secrets" not in route("/app/fixtures/keys.js", "x")
+        assert "check-secrets" not in route("/app/README.md", "x")
+
+    def test_a11y_skips_tests(self):
+        assert "check-accessibility" not in route("/app/src/App.test.tsx", "<img>")
+
+
+class TestTiers:
+
+    def test_low_runs_only_blocking_rules(self):
+        assert claudia_routing.tiers_for("low") == {"block"}
+
+    def test_unknown_level_runs_everything(self):
+        assert claudia_routing.tiers_for("bogus") == claudia_routing.ALL_TIERS
+
+
+class TestRoutesMatchChecks:
+    """The routing table must agree with the guards inside each check."""
+
+    def test_secrets_skip_patterns(self):
+        assert ROUTES["check-secrets"]["exclude"] == load_check("check-secrets").SKIP_PATTERNS
+
+    def test_a11y_extensions(self):
+        assert ROUTES["check-accessibility"]["extensions"] == load_check("check-accessibility").A11Y_EXTENSIONS
+
+    def test_css_extensions(self):
+        assert ROUTES["check-css"]["extensions"] == load_check("check-css").CSS_EXTENSIONS
+
+    def test_every_route_has_tiers(self):
+        for name, r in ROUTES.items():
+            assert r["tiers"] and r["tiers"] <= claudia_routing.ALL_TIERS, name
+
+    def test_routes_cover_dispatch(self):
+        assert list(ROUTES) == load_check("check-dispatch").CHECK_MODULES
+
+
+class TestCli:
+
+    def test_prints_checks(self):
+        result = subprocess.run(
+            [sys.executable, os.path.join(SCRIPTS_DIR, "claudia_routing.py"), "src/app.tsx"],
+            capture_output=True, text=True, timeout=10,
+        )
+        assert result.returncode == 0
+        assert "check-accessibility" in result.stdout
+        assert "only if content matches" in result.stdout
+        assert "skipped:" in result.stdout
@@ -0,0 +1,84 @@
+"""Tests for claudia_semver.py — npm version ordering and ranges."""
+
+import sys
+
+import pytest
+
+from conftest import SCRIPTS_DIR
+
+sys.path.insert(0, SCRIPTS_DIR)
+from claudia_semver import format_key, overlaps, parse_range, satisfies, version_key
+
+
+class TestVersionKey:
+
+    def test_npm_order(self):
+        ordered = [
+            "0.0.1", "1.0.0-alpha", "1.0.0-alpha.1", "1.0.0-alpha.beta", "1.0.0-beta",
+            "1.0.0-beta.2", "1.0.0-beta.11", "1.0.0-rc.1", "1.0.0", "1.0.1", "1.10.0", "10.0.0",
+        ]
+        assert sorted(ordered, key=version_key) == ordered
+
+    def test_prefix_and_build_metadata(self):
+        assert version_key("v1.2.3") == version_key("=1.2.3") == version_key("1.2.3+build.5")
+
+    @pytest.mark.parametrize("version", ["latest", "1.2", "", "1.2.3.4", None])
+    def test_not_a_version(self, version):
+        assert version_key(version) is None
+
+    def test_format_key(self):
+        assert format_key(version_key("1.2.3-rc.1")) == "1.2.3-rc.1"
+
+
+class TestSatisfies:
+
+    @pytest.mark.parametrize("version,spec,expected", [
+        ("1.9.0", "^1.2.0", True),
+        ("2.0.0", "^1.2.0", False),
+        ("2.0.0-beta", "^1.2.0", False),
+        ("0.2.5", "^0.2.3", True),
+        ("0.3.0", "^0.2.3", False),
+        ("0.0.4", "^0.0.3", False),
+        ("0.9.0", "^0.x", True),
+        ("1.2.9", "~1.2.3", True),
+        ("1.3.0", "~1.2.3", False),
+        ("1.9.0", "~1", True),
+        ("1.5.0", "1.x", True),
+        ("2.0.0", "1.x", False),
+        ("3.0.0", "*", True),
+        ("3.0.0", "", True),
+        ("1.2.3", "1.2.3", True),
+        ("1.2.4", "=1.2.3", False),
+        ("1.2.3", ">1.2.3", False),
+        ("1.3.0", ">1.2", True),
+        ("1.2.9", ">1.2", False),
+        ("1.2.3", "<=1.2.3", True),
+        ("1.9.9", "<2", True),
+        ("2.0.0-rc.1", "<2", False),
+        ("2.3.9", "1.2.3 - 2.3", True),
+        ("2.4.0", "1.2.3 - 2.3", False),
+        ("1.2.4", ">= 1.2.3, < 1.2.4", False),
+        ("6.11.2", ">=6.10.0 <6.10.3 || >=6.11.0 <6.11.3", True),
+        ("6.11.3", ">=6.10.0 <6.10.3 || >=6.11.0 <6.11.3", False),
+        ("1.0.0", ">1.2 <1.0", False),
+        ("1.0.0", "latest", False),
+        ("not-a-version", "*", False),
+    ])
+    def test_ranges(self, version, spec, expected):
+        assert satisfies(version, spec) is expected
+
+    @pytest.mark.parametrize("spec", ["latest", "file:../lib", "npm:other@^1.0.0", "github:user/repo", ">*"])
+    def test_not_a_range(self, spec):
+        assert parse_range(spec) is None
+
+    def test_empty_intersection(self):
+        assert parse_range(">2 <1") == ()
+
+    @pytest.mark.parametrize("a,b,expected", [
+        ("^1.2.0", ">=1.9.0 <3", True),
+        ("^1.2.0", ">=2.0.0", False),
+        ("<1.2.0", ">=1.2.0", False),
+        ("<=1.2.0", ">=1.2.0", True),
+    ])
+    def test_overlaps(self, a, b, expected):
+        assert overlaps(parse_range(a)[0], parse_range(b)[0]) is expected
@@ -196,3 +196,26 @@ class TestSingleOutput:
         if stdout.strip():
             output = json.loads(stdout)  # Should not raise
             assert "additionalContext" in output or "systemMessage" in output
+
+
+class TestHookLoading:
+    """Stop hooks must actually load from their dashed filenames."""
+
+    def test_teach_output_not_empty(self, run_hook, tmp_path):
+        setup_claudia_config(tmp_path, proactivity="high", experience="beginner")
+        claude_dir = tmp_path / ".claude"
+        (claude_dir / "claudia-milestones.json").write_text(
+            json.dumps({"achieved": ["first_file", "first_error_fixed", "first_commit", "first_project_run", "ten_files"], "file_count": 20})
+        )
+        data = make_stop_input("You should consider using Docker for containerization.")
+        code, stdout, stderr = run_hook("claudia-stop-dispatch.py", data)
+        assert code == 0
+        assert "Docker" in json.loads(stdout)["additionalContext"]
+        assert "failed to load" not in stderr
+
+    def test_load_times_with_debug(self, run_hook, tmp_path):
+        setup_claudia_config(tmp_path, proactivity="moderate", experience="intermediate")
+        data = make_stop_input("Here is a plain response with no triggers.")
+        code, _, stderr = run_hook("claudia-stop-dispatch.py", data, {"CLAUDIA_DEBUG": "1"})
+        assert code == 0
+        assert "loaded claudia-teach in" in stderr
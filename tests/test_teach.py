@@ -2,7 +2,7 @@
 
 import json
 
-from conftest import make_stop_input, setup_claudia_config, clear_stop_lock
+from conftest import load_check, make_stop_input, setup_claudia_config, clear_stop_lock
 
 
 class TestKeywordDetection:
@@ -51,6 +51,24 @@ class TestKeywordDetection:
             assert "API" in output.get("additionalContext", "")
 
 
+class TestFindKeywords:
+    """find_keywords() scans once and returns hits in category priority order."""
+
+    def test_priority_order(self):
+        teach = load_check("claudia-teach")
+        found = teach.find_keywords("Use docker, then react, deployed on vercel via the API.")
+        assert [keyword for _, keyword, _ in found] == ["Vercel", "React", "Docker", "API"]
+
+    def test_whole_words_only(self):
+        teach = load_check("claudia-teach")
+        assert teach.find_keywords("Reactive rapid prototyping") == []
+
+    def test_keyword_with_punctuation(self):
+        teach = load_check("claudia-teach")
+        found = teach.find_keywords("Built with next.js and CI/CD.")
+        assert [keyword for _, keyword, _ in found] == ["Next.js", "CI/CD"]
+
+
 class TestProactivityGating:
     """Low proactivity should silence everything."""
 
@@ -0,0 +1,130 @@
+"""Tests for claudia_verdicts.py — the persistent scan verdict cache."""
+
+import json
+import os
+import sys
+import time
+
+import pytest
+
+from conftest import SCRIPTS_DIR, make_pretool_input
+
+sys.path.insert(0, SCRIPTS_DIR)
+import claudia_scan
+import claudia_verdicts
+from claudia_scan import RuleSet
+from claudia_verdicts import VERDICT_MIN_CHARS, VerdictCache, verdict_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return VerdictCache(str(tmp_path / "verdicts"))
+
+
+class TestVerdictCache:
+
+    def test_round_trip(self, cache):
+        assert cache.get("ab") is None
+        cache.put("ab", {"eval": 3})
+        assert cache.get("ab") == {"eval": 3}
+        assert cache.stats()["entries"] == 1
+
+    def test_lookup_writes_nothing(self, cache):
+        cache.put("ab", {})
+        cache.get("ab")
+        cache.get("cd")
+        assert os.listdir(cache.directory) == ["ab.json"]
+
+    def test_evicts_least_recently_used_over_max_bytes(self, cache):
+        now = time.time()
+        for i, key in enumerate(["a1", "b1", "c1"]):
+            cache.put(key, {"rule": i})
+            os.utime(cache._path(key), (now - 100 + i, now - 100 + i))
+        cache.get("a1")  # now the most recently used
+        cache.max_bytes = 2 * os.path.getsize(cache._path("a1"))
+        assert cache.evict() == 1
+        assert cache.get("b1") is None
+        assert cache.get("a1") is not None
+
+    def test_evicts_expired(self, cache):
+        cache.put("a1", {})
+        old = time.time() - cache.max_age - 1
+        os.utime(cache._path("a1"), (old, old))
+        assert cache.evict() == 1
+        assert cache.stats()["entries"] == 0
+
+    def test_clear(self, cache):
+        cache.put("a1", {})
+        cache.get("a1")
+        cache.clear()
+        assert cache.stats() == {"entries": 0, "bytes": 0}
+
+    def test_key_covers_rules_and_ranges(self):
+        base = verdict_key("f", ["a"], None, "text")
+        assert verdict_key("g", ["a"], None, "text") != base
+        assert verdict_key("f", ["b"], None, "text") != base
+        assert verdict_key("f", ["a"], [(0, 1)], "text") != base
+        assert verdict_key("f", ["a"], None, "text!") != base
+
+    def test_key_covers_code_version(self, monkeypatch):
+        base = verdict_key("f", ["a"], None, "text")
+        monkeypatch.setattr(claudia_verdicts, "_code_version", ["0.0.0-other", "engine"])
+        assert verdict_key("f", ["a"], None, "text") != base
+
+    def test_code_version(self):
+        version, engine = claudia_verdicts.code_version()
+        with open(os.path.join(SCRIPTS_DIR, "..", "..", "package.json")) as f:
+            assert version == json.load(f)["version"]
+        assert len(engine) == 64
+
+
+class TestScanCache:
+
+    RULES = RuleSet([("eval", r"eval\("), ("todo", r"TODO")])
+    CONTENT = "x" * VERDICT_MIN_CHARS + "eval(a)"
+
+    def test_second_scan_reuses_verdict(self, cache, monkeypatch):
+        monkeypatch.setattr(claudia_scan, "verdict_cache", cache)
+        assert self.RULES.scan(self.CONTENT) == {"eval": VERDICT_MIN_CHARS}
+
+        def fail(*args):
+            raise AssertionError("scanned again")
+
+        monkeypatch.setattr(self.RULES, "_scan", fail)
+        assert self.RULES.scan(self.CONTENT) == {"eval": VERDICT_MIN_CHARS}
+        # A different rule subset is a different verdict
+        with pytest.raises(AssertionError):
+            self.RULES.scan(self.CONTENT, ["todo"])
+
+    def test_small_text_not_cached(self, cache, monkeypatch):
+        monkeypatch.setattr(claudia_scan, "verdict_cache", cache)
+        self.RULES.scan("eval(a)")
+        assert not os.path.exists(cache.directory)
+
+    def test_skipped_verdict_not_stored(self, cache, monkeypatch):
+        monkeypatch.setattr(claudia_scan, "verdict_cache", cache)
+        content = "x" * VERDICT_MIN_CHARS + "a" * 40 + "!b"
+        hits = RuleSet([("slow", r"(a+)+$")]).scan(content, budget=0.2, rule_budget=0.05)
+        assert hits.skipped == {"slow"}
+        assert cache.stats()["entries"] == 0
+
+    def test_off_by_default(self):
+        assert claudia_scan.verdict_cache is None
+
+
+class TestDispatchCache:
+
+    def test_retry_hits_cache(self, run_hook, tmp_path):
+        content = "const x = 1;\n" * (VERDICT_MIN_CHARS // 10) + "eval(x);\n"
+        directory = tmp_path / ".claude" / "claudia-verdicts"
+        for session in ("first", "second"):
+            data = make_pretool_input("Write", "/app/main.js", content, session_id=session)
+            code, stdout, _ = run_hook("check-dispatch.py", data)
+            assert code == 0
+            assert "eval()" in json.loads(stdout)["systemMessage"]
+            if session == "first":
+                # Age the stored verdicts, so the retry's hit shows as a touch
+                old = time.time() - 3600
+                for entry in directory.iterdir():
+                    os.utime(entry, (old, old))
+        assert any(entry.stat().st_mtime > time.time() - 600 for entry in directory.iterdir())
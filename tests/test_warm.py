@@ -0,0 +1,54 @@
+"""Tests for claudia_warm.py — SessionStart warm-up."""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+from conftest import SCRIPTS_DIR
+
+sys.path.insert(0, SCRIPTS_DIR)
+import claudia_warm
+
+
+class TestWarm:
+
+    def test_warm_builds_snapshot(self, tmp_path, hook_env):
+        project = tmp_path / "proj"
+        (project / ".git").mkdir(parents=True)
+        subprocess.run(
+            [sys.executable, "-I", "-S", os.path.join(SCRIPTS_DIR, "claudia_warm.py"), "warm", str(project)],
+            env=hook_env, timeout=60,
+        )
+        warm_dir = tmp_path / ".claude" / "claudia-warm"
+        assert any(p.name.startswith("project-") for p in warm_dir.iterdir())
+
+    def test_session_start_spawns_warmup(self, tmp_path, hook_env):
+        project = tmp_path / "proj"
+        (project / ".git").mkdir(parents=True)
+        subprocess.run(
+            [sys.executable, os.path.join(SCRIPTS_DIR, "claudia-session-tips.py")],
+            input=json.dumps({"session_id": "s", "source": "clear"}),
+            capture_output=True, text=True, env=hook_env, cwd=str(project), timeout=10,
+        )
+        warm_dir = tmp_path / ".claude" / "claudia-warm"
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            if warm_dir.is_dir() and any(p.name.startswith("project-") for p in warm_dir.iterdir()):
+                break
+            time.sleep(0.1)
+        assert any(p.name.startswith("project-") for p in warm_dir.iterdir())
+
+    def test_warm_files_cover_every_routed_check(self):
+        from claudia_routing import ROUTES, route
+        covered = set()
+        for file_path, content in claudia_warm.WARM_FILES.items():
+            covered.update(route(file_path, content))
+        assert covered == set(ROUTES)
+
+    def test_warm_checks_compile_rule_tables(self, tmp_path, monkeypatch):
+        from claudia_registry import REGISTRY
+        monkeypatch.setenv("HOME", str(tmp_path))
+        claudia_warm.warm_checks()
+        assert REGISTRY.load("check-secrets").SECRET_RULES._compiled